@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# region GPL v3 License Header
+#
+# Clean Architecture - .NET 8
+# Copyright (C) 2025 Cristian Rojas Arredondo
+# 
+# Author / Contact:
+#   Cristian Rojas Arredondo «cristian.rojas.software.engineer@gmail.com»
+# 
+# A full copy of the GNU GPL v3 is provided in the root of this project in the "LICENSE" file.
+# Additionally, you can view the license at <https://www.gnu.org/licenses/gpl-3.0.html>.
+#
+
+# region «English version» GPL v3 License Information 
+#
+# This file is part of Clean Architecture - .NET 8.
+# 
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License or
+# (at your option) any later version.
+# 
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/gpl-3.0.html>.
+# 
+# Note: In the event of any discrepancy between translations, this version (English) shall prevail.
+#
+# endregion
+
+# region «Spanish version» GPL v3 License Information
+#
+# Este archivo es parte de Clean Architecture - .NET 8.
+# 
+# Este programa es software libre: puede redistribuirlo y/o modificarlo
+# bajo los términos de la Licencia Pública General de GNU publicada por
+# la Free Software Foundation, ya sea la versión 3 de la Licencia o
+# (a su elección) cualquier versión posterior.
+# 
+# Este programa se distribuye con la esperanza de que sea útil,
+# pero SIN NINGUNA GARANTÍA, incluso sin la garantía implícita de
+# COMERCIABILIDAD o IDONEIDAD PARA UN PROPÓSITO PARTICULAR.
+# Consulte la Licencia Pública General de GNU para más detalles.
+# 
+# Usted debería haber recibido una copia de la Licencia Pública General de GNU
+# junto con este programa. De no ser así, véase <https://www.gnu.org/licenses/gpl-3.0.html>.
+# 
+# Nota: En caso de cualquier discrepancia entre las traducciones, la versión en inglés prevalecerá.
+#
+# endregion
+
+# endregion
+
+"""
+«benchmark_license_header_regeneration.py»
+────────────────────────────────────────────────────────────
+Este script mide el rendimiento de «regenerate_license_header_in_source_files.py» sobre árboles de código
+sintéticos, para detectar regresiones antes de que lleguen a los servidores de CI.
+
+El árbol sintético se genera con una cantidad configurable de archivos «.cs» y «.py», tamaños con distribución
+log-normal y una mezcla de cabeceras actualizadas, desactualizadas y faltantes. Cada escenario se ejecuta en un
+proceso independiente sobre una copia del árbol y mide por separado:
+    • Descubrimiento: recorrido del árbol para obtener los archivos candidatos.
+    • Análisis: verificación de las cabeceras (sin modificar archivos).
+    • Reescritura: aplicación de las reescrituras de los archivos con cabecera faltante o desactualizada.
+También se informa la memoria máxima residente (RSS) de cada escenario.
+
+Escenarios:
+    • «secuencial»: un solo proceso.
+    • «paralelo»: varios procesos («--jobs»).
+    • «en-vuelo»: canalización asíncrona con a lo sumo N operaciones de E/S en curso («--in-flight»). Está pensada para
+      sistemas de archivos de red; para evaluarla, el directorio de trabajo («--directory») debe estar en uno de ellos.
+    • «incremental»: análisis con el manifiesto incremental ya poblado (ejecución «en caliente»).
+
+Uso desde línea de comando:
+    python benchmark_license_header_regeneration.py [--files N] [--median-size BYTES] [--size-sigma S]
+                                                    [--mix ACTUALIZADA,DESACTUALIZADA,FALTANTE] [--python-ratio R]
+                                                    [--jobs N] [--in-flight N] [--seed N] [--directory RUTA] [--json RUTA]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import asyncio
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import regenerate_license_header_in_source_files as license_tool
+from license_info import LICENSE_BASE_INFO, LICENSE_HEADERS
+
+try:
+    import resource  # Solo disponible en sistemas tipo Unix.
+except ImportError:
+    resource = None
+
+# Escenarios disponibles, en el orden en que se ejecutan.
+SCENARIOS = ("secuencial", "paralelo", "en-vuelo", "incremental")
+
+# Líneas de relleno utilizadas para alcanzar el tamaño de cada archivo sintético.
+FILLER_LINES = {
+    ".cs": "        var value{index} = Compute(value{previous}, \"{index}\"); // Línea sintética.\n",
+    ".py": "value_{index} = compute(value_{previous}, \"{index}\")  # Línea sintética.\n"
+}
+
+# Inicio del código de cada archivo sintético (después de la cabecera).
+CODE_PREAMBLES = {
+    ".cs": "using System;\n\nnamespace Synthetic\n{\n",
+    ".py": "import os\n\n"
+}
+
+def build_synthetic_content(extension: str, header_state: str, size: int) -> str:
+    """
+    «Construye el contenido de un archivo sintético» con la cabecera en el estado indicado.
+
+    Argumentos:
+        «extension» (str): Extensión del archivo («.cs» o «.py»).
+        «header_state» (str): Estado de la cabecera («STATUS_CURRENT», «STATUS_STALE» o «STATUS_MISSING»).
+        «size» (int): Tamaño aproximado del archivo, en bytes.
+
+    Retorna:
+        «str»: Contenido del archivo.
+    """
+    header = LICENSE_HEADERS[extension]["header"]
+    if header_state == license_tool.STATUS_STALE:
+        # Una cabecera desactualizada difiere solo en el año del «copyright».
+        header = header.replace(LICENSE_BASE_INFO["copyright_year"], "1999")
+
+    parts = []
+    if extension == ".py":
+        parts.append("#!/usr/bin/env python3\n# -*- coding: utf-8 -*-\n")
+    if header_state != license_tool.STATUS_MISSING:
+        parts.append(header + "\n\n")
+    parts.append(CODE_PREAMBLES[extension])
+
+    current_size = sum(len(part) for part in parts)
+    index = 0
+    while current_size < size:
+        line = FILLER_LINES[extension].format(index=index + 1, previous=index)
+        parts.append(line)
+        current_size += len(line)
+        index += 1
+
+    return "".join(parts)
+
+def generate_synthetic_tree(
+    root_directory: str,
+    file_count: int,
+    median_size: int,
+    size_sigma: float,
+    header_mix: Tuple[float, float, float],
+    python_ratio: float,
+    seed: int
+) -> Dict[str, Any]:
+    """
+    «Genera un árbol de código sintético» con archivos «.cs» y «.py» repartidos en directorios anidados.
+
+    Argumentos:
+        «root_directory» (str): Directorio donde se genera el árbol (debe existir y estar vacío).
+        «file_count» (int): Número de archivos a generar.
+        «median_size» (int): Mediana del tamaño de los archivos, en bytes.
+        «size_sigma» (float): Desviación de la distribución log-normal de tamaños (0 = todos del mismo tamaño).
+        «header_mix» (Tuple[float, float, float]): Proporción de cabeceras actualizadas, desactualizadas y faltantes.
+        «python_ratio» (float): Proporción de archivos «.py» (el resto son «.cs»).
+        «seed» (int): Semilla del generador aleatorio (el árbol es reproducible).
+
+    Retorna:
+        «Dict[str, Any]»: Descripción del árbol generado (archivos y bytes por estado de cabecera).
+    """
+    generator = random.Random(seed)
+    header_states = (license_tool.STATUS_CURRENT, license_tool.STATUS_STALE, license_tool.STATUS_MISSING)
+    description = {
+        "files": file_count,
+        "bytes": 0,
+        "files_by_state": {state: 0 for state in header_states}
+    }
+
+    for index in range(file_count):
+        extension = ".py" if generator.random() < python_ratio else ".cs"
+        header_state = generator.choices(header_states, weights=header_mix)[0]
+        size = int(generator.lognormvariate(0, size_sigma) * median_size)
+
+        # Reparte los archivos en dos niveles de directorios (hasta 32 x 32).
+        directory = os.path.join(root_directory, f"Component{index % 32:02d}", f"Module{(index // 32) % 32:02d}")
+        os.makedirs(directory, exist_ok=True)
+
+        content = build_synthetic_content(extension, header_state, size).encode("utf-8")
+        with open(os.path.join(directory, f"File{index:06d}{extension}"), "wb") as synthetic_file:
+            synthetic_file.write(content)
+
+        description["bytes"] += len(content)
+        description["files_by_state"][header_state] += 1
+
+    return description
+
+def get_peak_rss_bytes() -> Optional[int]:
+    """
+    «Obtiene la memoria máxima residente (RSS)» del proceso actual y de sus procesos hijos ya finalizados.
+
+    Retorna:
+        «Optional[int]»: Memoria máxima en bytes, o None si la plataforma no la expone.
+    """
+    if resource is None:
+        return None
+    # «ru_maxrss» se expresa en KiB en Linux y en bytes en macOS.
+    unit = 1 if sys.platform == "darwin" else 1024
+    own_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own_peak, children_peak) * unit
+
+def iter_scenario_results(
+    source_files: List[str],
+    root_directory: str,
+    jobs: int,
+    in_flight: int,
+    license_cache: Optional[Dict[str, Dict[str, Any]]] = None,
+    check_only: bool = False,
+    defer_writes: bool = False
+) -> Iterator["license_tool.FileProcessingResult"]:
+    """
+    «Procesa los archivos de un escenario» con «process_source_files» o, si «in_flight» es mayor que 0, con la
+    canalización asíncrona («process_source_files_async»), igual que la herramienta con «--in-flight».
+
+    Argumentos:
+        «source_files» (List[str]): Rutas completas de los archivos a procesar.
+        «root_directory» (str): Directorio raíz del árbol.
+        «jobs» (int): Número de procesos (solo sin canalización asíncrona).
+        «in_flight» (int): Cantidad máxima de operaciones de E/S en curso (0 = sin canalización asíncrona).
+        «license_cache» (Optional[Dict[str, Dict[str, Any]]]): Entradas del manifiesto incremental, o None para no usarlo.
+        «check_only» (bool): True para solo verificar las cabeceras.
+        «defer_writes» (bool): True para retornar los planes de reescritura sin aplicarlos.
+
+    Retorna:
+        «Iterator[FileProcessingResult]»: Resultado de cada archivo, en orden.
+    """
+    if in_flight <= 0:
+        yield from license_tool.process_source_files(source_files, root_directory, jobs, license_cache, check_only=check_only, defer_writes=defer_writes)
+        return
+
+    event_loop = asyncio.new_event_loop()
+    try:
+        with ThreadPoolExecutor(max_workers=in_flight) as io_executor:
+            async_results = license_tool.process_source_files_async(source_files, root_directory, io_executor, in_flight, license_cache, check_only, defer_writes)
+            yield from license_tool.iterate_async_results(async_results, event_loop)
+    finally:
+        event_loop.close()
+
+def run_scenario(template_directory: str, work_directory: str, scenario: str, jobs: int, in_flight: int) -> Dict[str, Any]:
+    """
+    «Ejecuta un escenario» sobre una copia del árbol sintético y mide cada fase por separado.
+    Se ejecuta en un proceso independiente para que la memoria máxima corresponda solo a este escenario.
+
+    Argumentos:
+        «template_directory» (str): Árbol sintético original (no se modifica).
+        «work_directory» (str): Directorio de trabajo del escenario (se crea una copia del árbol en él).
+        «scenario» (str): Nombre del escenario (ver «SCENARIOS»).
+        «jobs» (int): Número de procesos del escenario «paralelo».
+        «in_flight» (int): Cantidad máxima de operaciones de E/S en curso del escenario «en-vuelo».
+
+    Retorna:
+        «Dict[str, Any]»: Métricas del escenario (duraciones en segundos, archivos, bytes y memoria).
+    """
+    root_directory = os.path.join(work_directory, "tree")
+    shutil.copytree(template_directory, root_directory)
+    scenario_jobs = jobs if scenario == "paralelo" else 1
+    scenario_in_flight = in_flight if scenario == "en-vuelo" else 0
+    metrics = {"scenario": scenario, "jobs": scenario_jobs, "in_flight": scenario_in_flight}
+
+    # Fase de descubrimiento.
+    start = time.perf_counter()
+    source_files = license_tool.discover_source_files(root_directory)
+    metrics["discovery_seconds"] = time.perf_counter() - start
+    metrics["files"] = len(source_files)
+    metrics["bytes"] = sum(os.path.getsize(full_file_path) for full_file_path in source_files)
+
+    license_cache = None
+    if scenario == "incremental":
+        # Ejecución «en frío» (no medida) para poblar el manifiesto incremental.
+        license_cache = {}
+        for result in license_tool.process_source_files(source_files, root_directory, check_only=True):
+            if result.cache_entry is not None:
+                license_cache[license_tool.get_cache_key(result.file_path, root_directory)] = result.cache_entry
+
+    # Fase de análisis (solo verificación).
+    start = time.perf_counter()
+    statuses = {}
+    for result in iter_scenario_results(source_files, root_directory, scenario_jobs, scenario_in_flight, license_cache, check_only=True):
+        statuses[result.status] = statuses.get(result.status, 0) + 1
+    metrics["parse_seconds"] = time.perf_counter() - start
+    metrics["statuses"] = statuses
+
+    # Fase de reescritura: se planifican las reescrituras (no medido) y luego se aplican todas juntas.
+    pending_rewrites = [
+        result for result in iter_scenario_results(source_files, root_directory, scenario_jobs, scenario_in_flight, defer_writes=True)
+        if result.rewrite_plan is not None
+    ]
+    bytes_written = 0
+    start = time.perf_counter()
+    for result in pending_rewrites:
+        plan = result.rewrite_plan
+        license_tool.apply_rewrite(result, plan)
+        if result.file_updated:
+            bytes_written += len(plan.head) + plan.size - plan.body_offset
+    metrics["rewrite_seconds"] = time.perf_counter() - start
+    metrics["files_rewritten"] = sum(1 for result in pending_rewrites if result.file_updated)
+    metrics["bytes_written"] = bytes_written
+
+    metrics["peak_rss_bytes"] = get_peak_rss_bytes()
+    shutil.rmtree(root_directory, ignore_errors=True)
+    return metrics
+
+def format_rate(amount: float, seconds: float, unit: str) -> str:
+    """
+    «Formatea una tasa» (cantidad por segundo).
+
+    Argumentos:
+        «amount» (float): Cantidad procesada.
+        «seconds» (float): Duración en segundos.
+        «unit» (str): Unidad de la cantidad.
+
+    Retorna:
+        «str»: Tasa formateada (por ejemplo, «1234 archivos/s»).
+    """
+    if seconds <= 0:
+        return f"∞ {unit}/s"
+    return f"{amount / seconds:,.1f} {unit}/s"
+
+def print_scenario_report(metrics: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    """
+    «Imprime el reporte de un escenario».
+
+    Argumentos:
+        «metrics» (Dict[str, Any]): Métricas del escenario.
+        «baseline» (Optional[Dict[str, Any]]): Métricas del escenario «secuencial», para comparar el análisis.
+    """
+    megabytes = metrics["bytes"] / (1024 * 1024)
+    if metrics["in_flight"] > 0:
+        print(f"📊 Escenario «{metrics['scenario']}» ({metrics['in_flight']} operaciones de E/S en curso):")
+    else:
+        print(f"📊 Escenario «{metrics['scenario']}» ({metrics['jobs']} proceso(s)):")
+    print(f"   🔎 Descubrimiento: {metrics['discovery_seconds']:.3f} s ({format_rate(metrics['files'], metrics['discovery_seconds'], 'archivos')})")
+
+    parse_line = (
+        f"   📖 Análisis: {metrics['parse_seconds']:.3f} s "
+        f"({format_rate(metrics['files'], metrics['parse_seconds'], 'archivos')}, {format_rate(megabytes, metrics['parse_seconds'], 'MB')})"
+    )
+    if baseline is not None and baseline is not metrics and metrics["parse_seconds"] > 0:
+        parse_line += f" → {baseline['parse_seconds'] / metrics['parse_seconds']:.2f}x respecto de «secuencial»"
+    print(parse_line)
+
+    written_megabytes = metrics["bytes_written"] / (1024 * 1024)
+    print(
+        f"   ✍️  Reescritura: {metrics['rewrite_seconds']:.3f} s "
+        f"({metrics['files_rewritten']} archivos, {format_rate(metrics['files_rewritten'], metrics['rewrite_seconds'], 'archivos')}, "
+        f"{format_rate(written_megabytes, metrics['rewrite_seconds'], 'MB')})"
+    )
+
+    peak_rss = metrics["peak_rss_bytes"]
+    peak_rss_text = f"{peak_rss / (1024 * 1024):.1f} MB" if peak_rss is not None else "no disponible en esta plataforma"
+    print(f"   🧠 Memoria máxima (RSS): {peak_rss_text}")
+
+def parse_header_mix(value: str) -> Tuple[float, float, float]:
+    """
+    «Interpreta la mezcla de estados de cabecera» («ACTUALIZADA,DESACTUALIZADA,FALTANTE»).
+
+    Argumentos:
+        «value» (str): Tres proporciones separadas por comas (por ejemplo, «0.8,0.1,0.1»).
+
+    Retorna:
+        «Tuple[float, float, float]»: Proporciones de cabeceras actualizadas, desactualizadas y faltantes.
+    """
+    try:
+        proportions = tuple(float(part) for part in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"mezcla inválida: «{value}»")
+    if len(proportions) != 3 or any(proportion < 0 for proportion in proportions) or sum(proportions) <= 0:
+        raise argparse.ArgumentTypeError(f"mezcla inválida: «{value}» (se esperan tres proporciones no negativas)")
+    return proportions
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    «Interpreta los argumentos de línea de comando».
+
+    Retorna:
+        «argparse.Namespace»: Argumentos interpretados.
+    """
+    parser = argparse.ArgumentParser(description="Mide el rendimiento de la regeneración de cabeceras de licencia sobre árboles sintéticos.")
+    parser.add_argument("--files", type=int, default=2000, metavar="N", help="Número de archivos del árbol sintético.")
+    parser.add_argument("--median-size", type=int, default=4096, metavar="BYTES", help="Mediana del tamaño de los archivos.")
+    parser.add_argument("--size-sigma", type=float, default=1.0, metavar="S", help="Dispersión log-normal de los tamaños (0 = tamaño fijo).")
+    parser.add_argument(
+        "--mix",
+        type=parse_header_mix,
+        default=(0.8, 0.1, 0.1),
+        metavar="A,D,F",
+        help="Proporción de cabeceras actualizadas, desactualizadas y faltantes (por defecto «0.8,0.1,0.1»)."
+    )
+    parser.add_argument("--python-ratio", type=float, default=0.2, metavar="R", help="Proporción de archivos «.py».")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, metavar="N", help="Procesos del escenario «paralelo».")
+    parser.add_argument("--in-flight", type=int, default=16, metavar="N", help="Operaciones de E/S en curso del escenario «en-vuelo».")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS), help="Escenarios a ejecutar.")
+    parser.add_argument("--seed", type=int, default=0, metavar="N", help="Semilla del generador del árbol sintético.")
+    parser.add_argument("--directory", metavar="RUTA", help="Directorio de trabajo (por defecto, uno temporal que se elimina al terminar).")
+    parser.add_argument("--json", metavar="RUTA", help="Guarda la configuración y las métricas en formato JSON.")
+    arguments = parser.parse_args()
+    if arguments.files <= 0 or arguments.median_size <= 0 or arguments.jobs <= 0 or arguments.in_flight <= 0:
+        parser.error("«--files», «--median-size», «--jobs» e «--in-flight» deben ser mayores que 0.")
+    if not 0 <= arguments.python_ratio <= 1:
+        parser.error("«--python-ratio» debe estar entre 0 y 1.")
+    return arguments
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+
+    work_directory = arguments.directory or tempfile.mkdtemp(prefix="license-benchmark-")
+    os.makedirs(work_directory, exist_ok=True)
+    template_directory = os.path.join(work_directory, "template")
+
+    try:
+        print()
+        print(f"🏗️  Generando árbol sintético de {arguments.files} archivos en «{template_directory}»...")
+        start = time.perf_counter()
+        os.makedirs(template_directory)
+        tree_description = generate_synthetic_tree(
+            template_directory,
+            arguments.files,
+            arguments.median_size,
+            arguments.size_sigma,
+            arguments.mix,
+            arguments.python_ratio,
+            arguments.seed
+        )
+        print(f"   {tree_description['bytes'] / (1024 * 1024):.1f} MB generados en {time.perf_counter() - start:.2f} s: {tree_description['files_by_state']}")
+        print()
+
+        # Cada escenario se ejecuta en un proceso nuevo («spawn») para aislar su memoria máxima.
+        all_metrics: List[Dict[str, Any]] = []
+        spawn_context = multiprocessing.get_context("spawn")
+        for scenario in arguments.scenarios:
+            scenario_directory = os.path.join(work_directory, scenario)
+            os.makedirs(scenario_directory, exist_ok=True)
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn_context) as executor:
+                metrics = executor.submit(run_scenario, template_directory, scenario_directory, scenario, arguments.jobs, arguments.in_flight).result()
+            all_metrics.append(metrics)
+
+        baseline = next((metrics for metrics in all_metrics if metrics["scenario"] == "secuencial"), None)
+        for metrics in all_metrics:
+            print_scenario_report(metrics, baseline)
+            print()
+
+        if arguments.json:
+            with open(arguments.json, "w", encoding="utf-8") as json_file:
+                json.dump({"configuration": {**vars(arguments), "tree": tree_description}, "scenarios": all_metrics}, json_file, ensure_ascii=False, indent=2)
+            print(f"💾 Métricas guardadas en «{arguments.json}».")
+    finally:
+        if arguments.directory is None:
+            shutil.rmtree(work_directory, ignore_errors=True)
+
+    print("✅ La medición de rendimiento ha finalizado correctamente.")
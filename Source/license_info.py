@@ -65,8 +65,27 @@ permitiendo su reutilización y facilitando su mantenimiento.
 
 La información de licencia se genera dinámicamente a partir de un texto base,
 adaptándose a los diferentes estilos de comentarios de cada lenguaje.
+
+Cada cabecera incluye una huella digital («fingerprint») y el módulo expone «get_license_fingerprint» (también
+disponible como «LICENSE_FINGERPRINT»), que resume toda la configuración vigente, incluidos los lenguajes registrados
+después de importar el módulo; permiten detectar cuándo cambia la licencia (por ejemplo, para invalidar cachés).
+Además, cada cabecera incluye sus formas en bytes («header_bytes», «header_bytes_crlf»), para verificarla sobre el
+contenido crudo sin decodificarlo, y los inicios de línea de comentario de su lenguaje («comment_prefixes», como texto,
+y «comment_prefix_bytes»), que delimitan el bloque de cabecera: un lenguaje registrado no altera el análisis de otros.
+
+«LANGUAGES» es un registro extensible: cada lenguaje define un estilo de comentarios y todas las extensiones que lo
+utilizan. Se puede ampliar con «register_language» o desde el archivo «license_languages.json» (junto a este módulo),
+con la forma {"nombre": {"extensions": [".ext", ...], "style": {...}}}. Ni el archivo de configuración se lee ni las
+cabeceras se generan al importar el módulo: el archivo se carga en la primera consulta del registro (un archivo no válido
+produce «LicenseConfigError») y «LICENSE_HEADERS» genera la cabecera de cada lenguaje en la primera consulta y la
+conserva (como «str» y como «bytes»).
 """
 
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+
 # Define la información básica de la licencia
 LICENSE_BASE_INFO = {
     "project_name": "Clean Architecture - .NET 8",
@@ -126,10 +145,10 @@ A full copy of the GNU GPL v3 is provided in the root of this project in the "LI
 Additionally, you can view the license at <{license_url}>.
 """.strip()
 
-# Define la metadata para diferentes lenguajes.
+# Define la metadata para diferentes lenguajes (estilo de comentarios y extensiones que lo utilizan).
 LANGUAGES = {
     "csharp": {
-        "extension": ".cs",
+        "extensions": [".cs", ".csx"],
         "style": {
           "line_comment": "// ",
           "block_start": "/*",
@@ -140,7 +159,7 @@ LANGUAGES = {
       }
     },
     "python": {
-        "extension": ".py",
+        "extensions": [".py", ".pyi"],
         "style": {
           "line_comment": "# ",
           "block_start": "#",
@@ -150,9 +169,94 @@ LANGUAGES = {
           "region_end": "# endregion"
         }
     }
-    # Se pueden agregar más lenguajes aquí siguiendo el mismo patrón
+    # Se pueden agregar más lenguajes aquí siguiendo el mismo patrón, con «register_language» o en «license_languages.json».
 }
 
+# Archivo opcional con lenguajes adicionales (o que reemplazan a los anteriores).
+LANGUAGES_CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "license_languages.json")
+
+# Claves que debe definir el estilo de comentarios de cada lenguaje.
+STYLE_KEYS = ("line_comment", "block_start", "block_line", "block_end", "region_start", "region_end")
+
+# Índice de extensión a nombre de lenguaje, e información de licencia ya generada por lenguaje.
+EXTENSION_LANGUAGES = {}
+_generated_license_info = {}
+
+# Revisión del registro (aumenta con cada lenguaje registrado), si ya se cargó el archivo de configuración,
+# y valores derivados del registro ya calculados (se descartan al cambiar la revisión).
+_registry_revision = 0
+_configured_languages_loaded = False
+_derived_values = {}
+
+class LicenseConfigError(ValueError):
+    """Error en la configuración de los lenguajes (por ejemplo, un «license_languages.json» que no se puede leer o no es válido)."""
+
+def _register_language(language_name, extensions, style):
+    """Registra (o reemplaza) un lenguaje sin cargar antes el archivo de configuración."""
+    global _registry_revision
+    if not isinstance(style, Mapping):
+        raise ValueError(f"El estilo del lenguaje {language_name} debe ser un objeto con las claves: {', '.join(STYLE_KEYS)}")
+    missing_keys = [key for key in STYLE_KEYS if key not in style]
+    if missing_keys:
+        raise ValueError(f"El estilo del lenguaje {language_name} no define: {', '.join(missing_keys)}")
+
+    # Retira las extensiones que el lenguaje tenía registradas previamente.
+    for extension in LANGUAGES.get(language_name, {}).get("extensions", []):
+        EXTENSION_LANGUAGES.pop(extension, None)
+
+    LANGUAGES[language_name] = {"extensions": [extension.lower() for extension in extensions], "style": dict(style)}
+    for extension in LANGUAGES[language_name]["extensions"]:
+        EXTENSION_LANGUAGES[extension] = language_name
+    _generated_license_info.pop(language_name, None)
+    _registry_revision += 1
+
+def register_language(language_name, extensions, style):
+    """Registra (o reemplaza) un lenguaje con su estilo de comentarios y las extensiones que lo utilizan."""
+    load_configured_languages()
+    _register_language(language_name, extensions, style)
+
+def load_languages_config(config_file_path):
+    """Registra los lenguajes definidos en un archivo JSON de configuración, si existe (un archivo no válido produce «LicenseConfigError»)."""
+    if not os.path.isfile(config_file_path):
+        return
+    try:
+        with open(config_file_path, "r", encoding="utf-8") as config_file:
+            languages = json.load(config_file)
+        for language_name, language_data in languages.items():
+            _register_language(language_name, language_data["extensions"], language_data["style"])
+    except KeyError as config_error:
+        raise LicenseConfigError(f"La configuración de lenguajes «{config_file_path}» no es válida: falta la clave {config_error}") from config_error
+    except (OSError, ValueError, TypeError, AttributeError) as config_error:
+        raise LicenseConfigError(f"La configuración de lenguajes «{config_file_path}» no es válida: {config_error}") from config_error
+
+def load_configured_languages():
+    """Carga, una sola vez, los lenguajes del archivo de configuración «LANGUAGES_CONFIG_FILE» (se invoca en la primera consulta del registro)."""
+    global _configured_languages_loaded
+    if not _configured_languages_loaded:
+        load_languages_config(LANGUAGES_CONFIG_FILE)
+        _configured_languages_loaded = True
+
+def get_registry_revision():
+    """Retorna la revisión del registro de lenguajes, que cambia cada vez que se registra un lenguaje (útil para invalidar valores derivados)."""
+    if not _configured_languages_loaded:
+        load_configured_languages()
+    return _registry_revision
+
+def _get_derived_value(name, compute):
+    """Retorna un valor derivado del registro, calculándolo solo la primera vez en cada revisión."""
+    revision = get_registry_revision()
+    cached = _derived_values.get(name)
+    if cached is None or cached[0] != revision:
+        cached = (revision, compute())
+        _derived_values[name] = cached
+    return cached[1]
+
+def get_comment_prefixes(style):
+    """Retorna los inicios de línea que pueden formar parte de una cabecera con el estilo de comentarios de un lenguaje."""
+    prefixes = {style[key].strip() for key in STYLE_KEYS} - {""}
+    # Descarta los inicios ya cubiertos por otro más corto (por ejemplo, «# region» está cubierto por «#»).
+    return tuple(sorted(prefix for prefix in prefixes if not any(prefix != other and prefix.startswith(other) for other in prefixes)))
+
 def format_block_text(text, style, indent=""):
     """Formatea un bloque de texto con los estilos de comentario específicos del lenguaje."""
     lines = text.split('\n')
@@ -169,9 +273,11 @@ def format_block_text(text, style, indent=""):
     return '\n'.join(formatted_lines)
 
 def generate_license_info(language_name):
-    """Genera la información de licencia para un lenguaje específico."""
+    """Genera la información de licencia para un lenguaje específico (una sola vez por lenguaje)."""
     if language_name not in LANGUAGES:
         raise ValueError(f"No se ha definido información para el lenguaje {language_name}")
+    if language_name in _generated_license_info:
+        return _generated_license_info[language_name]
     
     language_data = LANGUAGES[language_name]
     style = language_data["style"]
@@ -200,20 +306,75 @@ def generate_license_info(language_name):
     ]
     
     header = '\n' + '\n'.join(header_parts)
+
+    # Formas precompiladas en bytes (UTF-8) para comparar directamente contra el contenido crudo de los archivos.
+    # La cabecera se compara sin espacios al inicio ni al final, con saltos de línea LF o CRLF.
+    header_bytes = header.strip().encode("utf-8")
+    comment_prefixes = get_comment_prefixes(style)
     
-    return {
+    license_info = {
         "marker": marker,
-        "header": header
+        "header": header,
+        "stripped_header": header.strip(),
+        "fingerprint": hashlib.sha256(f"{marker}\n{header}".encode("utf-8")).hexdigest(),
+        "header_bytes": header_bytes,
+        "header_bytes_crlf": header_bytes.replace(b"\n", b"\r\n"),
+        "comment_prefixes": comment_prefixes,
+        "comment_prefix_bytes": tuple(prefix.encode("utf-8") for prefix in comment_prefixes)
     }
+    _generated_license_info[language_name] = license_info
+    return license_info
+
+class LicenseHeaderRegistry(Mapping):
+    """Mapeo de extensión a información de licencia que genera cada cabecera en su primera consulta."""
+
+    def __getitem__(self, extension):
+        if not _configured_languages_loaded:
+            load_configured_languages()
+        return generate_license_info(EXTENSION_LANGUAGES[extension])
+
+    def __contains__(self, extension):
+        # Consultar si una extensión está registrada no genera su cabecera.
+        if not _configured_languages_loaded:
+            load_configured_languages()
+        return extension in EXTENSION_LANGUAGES
+
+    def __iter__(self):
+        load_configured_languages()
+        return iter(EXTENSION_LANGUAGES)
+
+    def __len__(self):
+        load_configured_languages()
+        return len(EXTENSION_LANGUAGES)
 
 # ────────────────────────────────────────────────────────────────────────────── #
+# Registra las extensiones de los lenguajes definidos. Los del archivo de configuración se cargan en la primera consulta.
+for language_name, language_data in list(LANGUAGES.items()):
+    _register_language(language_name, language_data["extensions"], language_data["style"])
+
 # Diccionario que mapea la extensión del archivo con su información de licencia.
-LICENSE_HEADERS = {}
-
-for language_name in LANGUAGES.keys():
-    # Obtiene la extensión directamente de language_data.
-    extension = LANGUAGES[language_name]["extension"];
-    # Genera la información de licencia para el lenguaje.
-    license_info = generate_license_info(language_name);    
-    # Agrega la información al diccionario.
-    LICENSE_HEADERS[extension] = license_info;
\ No newline at end of file
+LICENSE_HEADERS = LicenseHeaderRegistry()
+
+# ────────────────────────────────────────────────────────────────────────────── #
+# Huella digital del código de este módulo: cualquier cambio que afecte a las cabeceras produce una huella distinta.
+with open(os.path.abspath(__file__), "rb") as module_file:
+    MODULE_FINGERPRINT = hashlib.sha256(module_file.read()).hexdigest()
+
+def get_license_fingerprint():
+    """Retorna la huella digital de toda la configuración de licencia vigente (información base, textos, lenguajes registrados y código de este módulo), sin generar las cabeceras."""
+    return _get_derived_value("license_fingerprint", _compute_license_fingerprint)
+
+def _compute_license_fingerprint():
+    """Calcula la huella digital de la configuración de licencia (ver «get_license_fingerprint»)."""
+    return hashlib.sha256(json.dumps({
+        "base_info": LICENSE_BASE_INFO,
+        "texts": [LICENSE_TEXT_HEADER, LICENSE_TEXT_ENGLISH, LICENSE_TEXT_SPANISH],
+        "languages": LANGUAGES,
+        "module": MODULE_FINGERPRINT
+    }, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def __getattr__(name):
+    """Expone «LICENSE_FINGERPRINT» como atributo del módulo calculado en cada consulta (ver «get_license_fingerprint»)."""
+    if name == "LICENSE_FINGERPRINT":
+        return get_license_fingerprint()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -72,13 +72,258 @@ La configuración de la licencia (propiedades «extension_type», «marker» y 
 desde el módulo «license_info.py», centralizando su definición.
 
 Uso desde línea de comando:
-    python regenerate_license_header_in_source_files.py
+    python regenerate_license_header_in_source_files.py [opciones] [RUTA ...]
+
+    Si se indican rutas (archivos o directorios), solo se procesan esos archivos fuente en lugar del árbol completo.
+
+Opciones:
+    --jobs N, -j N: Procesa los archivos en paralelo con N procesos (1 = secuencial, 0 = todos los núcleos).
+                    La salida y el resumen son idénticos a los de la ejecución secuencial. Nunca se utilizan más procesos
+                    que núcleos disponibles, y en modo de verificación cada proceso recibe al menos
+                    «PARALLEL_CHECK_MIN_FILES_PER_JOB» archivos: con menos, se verifica secuencialmente, porque transferir
+                    los resultados entre procesos cuesta tanto como verificar los archivos.
+    --in-flight N: Utiliza una canalización asíncrona («asyncio» con un grupo de hilos) que superpone los listados de directorios,
+                   las lecturas y las escrituras, con a lo sumo N operaciones en curso. Pensada solo para sistemas de archivos de
+                   red (NFS, SMB), donde cada apertura o lectura implica una ida y vuelta. En un disco local no hay latencia que
+                   ocultar y cada archivo paga la coordinación entre los hilos y el ciclo de eventos, por lo que resulta varias
+                   veces más lenta que la ejecución secuencial; conviene medirla antes en el sistema de archivos real (escenario
+                   «en-vuelo» de «benchmark_license_header_regeneration.py»). La salida es idéntica a la secuencial.
+    --incremental: Mantiene un manifiesto («.license-cache» en el directorio raíz) con el «mtime», tamaño, hash del prefijo
+                   y huella de cabecera de cada archivo verificado. Los archivos sin cambios se omiten sin abrirlos.
+                   Cualquier cambio en «license_info.py» invalida el manifiesto completo.
+                   El manifiesto registra además una huella tipo Merkle de cada directorio verificado (a partir del «mtime»
+                   y el tamaño de sus archivos, su huella de cabecera y las huellas de sus subdirectorios): los subárboles
+                   cuya huella no cambió se omiten completos, sin consultar el manifiesto archivo por archivo. También
+                   registra el listado filtrado de cada directorio, que no se vuelve a listar mientras su «mtime» no cambie
+                   (el «stat» de cada archivo sí se consulta, porque editar un archivo no modifica el «mtime» de su directorio).
+    --cache-file RUTA: Utiliza un manifiesto incremental en otra ubicación (implica «--incremental»).
+    --check: Modo de solo lectura para CI y «pre-commit»: ningún archivo fuente se abre para escritura y solo se lee
+             el prefijo con la cabecera. Termina con código 1 si alguna cabecera falta, está desactualizada o no se pudo leer.
+    --fail-fast: Junto con «--check», se detiene en el primer archivo con problemas.
+    --ignore REGLA: Agrega una regla de exclusión (se puede repetir). Las reglas por defecto excluyen «obj/», «bin/»,
+                    «venv/», «env/», «__pycache__/» y los archivos generados «*.Designer.cs», «*.g.cs» y «*.g.i.cs»;
+                    el archivo «.license-ignore» del directorio raíz puede agregar otras, una por línea. Sintaxis:
+                    «*.Generated.cs» (nombre en cualquier nivel), «obj/» (solo directorios), «Source/Generated/» o «/build»
+                    (relativa al directorio raíz) y «re:expresión» (expresión regular sobre la ruta relativa).
+                    Al comenzar se informan, en una sola línea, todas las exclusiones vigentes y el tamaño máximo.
+    --max-size BYTES: Omite, sin abrirlos, los archivos de más de BYTES bytes (por defecto, 8 MiB; 0 = sin límite).
+                      Los archivos binarios o no codificados en UTF-8 se omiten tras leer solo su bloque inicial.
+    --diff: Como «--check», e imprime el diff unificado de la región de la cabecera de cada archivo con la cabecera
+            faltante o desactualizada. Solo se lee el prefijo de cada archivo, no el archivo completo.
+    --patch-out RUTA: Como «--check», y guarda esos diff en RUTA como un parche aplicable con «git apply» desde el directorio raíz.
+    --tracked: Obtiene los archivos desde el índice de git en lugar de recorrer el árbol (omite compilaciones,
+               «node_modules» y cualquier archivo no rastreado).
+    --changed-since REF: Procesa solo los archivos cambiados respecto de la referencia de git REF (incluidos los cambios
+                         sin confirmar) y los archivos nuevos no ignorados. Ideal para «pre-commit».
+    Si no hay un repositorio git, «--tracked» y «--changed-since» recurren al recorrido completo con «os.walk».
+    --batch-writes: Analiza primero todos los archivos y aplica después todas las reescrituras en una sola fase, cuya duración se informa.
+    --stats: Informa el tiempo dedicado a cada fase (descubrimiento, manifiesto, lectura, análisis, comparación y escritura)
+             y los bytes leídos y escritos.
+    --profile [N]: Como «--stats», e informa además los N archivos más lentos (por defecto, 10).
+    --stats-json RUTA: Guarda las estadísticas en formato JSON en RUTA (implica «--stats»).
+    --record-history: Agrega al historial («.license-history.jsonl» en el directorio raíz, una línea JSON por ejecución)
+                      los contadores por estado, el tiempo total y por fase, los archivos por segundo y la huella de la
+                      configuración de licencia, y avisa si la ejecución fue mucho más lenta que la mediana de las
+                      ejecuciones previas del mismo árbol y modo.
+    --history-file RUTA: Utiliza un historial en otra ubicación (implica «--record-history», salvo junto con «--history»).
+    --history [N]: No procesa archivos; informa la tendencia de las últimas N ejecuciones del historial (por defecto, 20)
+                   y marca las que superaron en más de 1.5× la mediana de las 10 ejecuciones previas de su grupo.
+    --watch: Tras el procesamiento inicial, sigue observando el árbol y actualiza solo los archivos que se crean o modifican,
+             agrupando las ráfagas de cambios. Utiliza las notificaciones del sistema de archivos del paquete opcional
+             «watchdog» o, si no está instalado, sondeos periódicos. Las reescrituras propias no se vuelven a procesar.
+             La observación comienza antes del procesamiento inicial: los cambios hechos mientras este se ejecuta
+             también se procesan.
+    --debounce SEGUNDOS: Con «--watch», segundos sin cambios que cierran una ráfaga (por defecto, 0.5).
+    --poll-interval SEGUNDOS: Con «--watch», sondea cada SEGUNDOS en lugar de utilizar las notificaciones del sistema de archivos.
+    --shard K/N: Procesa solo la partición K de N (los archivos se reparten según el hash de su ruta relativa, de forma
+                 determinista) y guarda un reporte parcial con su resumen, para repartir el trabajo entre varios nodos de CI.
+    --report-file RUTA: Ruta del reporte parcial de «--shard» (por defecto, «license-report-K-of-N.json» en el directorio actual).
+    --merge-reports RUTA [RUTA ...]: No procesa archivos; combina los reportes parciales de todas las particiones en el
+                                     resumen total. En modo de verificación, termina con código 1 si hay archivos con problemas.
+    --serve: Inicia un servicio residente que mantiene en memoria las cabeceras, el índice de archivos y el estado de cada
+             archivo, y atiende solicitudes de verificación o corrección en un socket Unix (para IDE y «pre-commit»).
+    --daemon: Delega el procesamiento al servicio residente; si no hay uno escuchando, procesa los archivos en el mismo proceso.
+    --socket RUTA: Ruta del socket del servicio residente (por defecto, un archivo propio de cada árbol en «$XDG_RUNTIME_DIR»
+                   o, si no está definido, en un directorio privado del usuario dentro del directorio temporal).
+                   El socket solo es accesible por el usuario que inició el servicio, y el cliente solo confía en un
+                   servicio del mismo usuario.
+
+Uso como biblioteca:
+    «iter_license_header_results» entrega, sin imprimir el avance, un resultado por archivo («FileProcessingResult»: ruta,
+    estado, bytes leídos y escritos, si fue reescrito y, con «with_diffs», el diff de la región de la cabecera);
+    «regenerate_license_headers» es su consumidor de consola.
+
+Las reescrituras son atómicas: la nueva cabecera y el cuerpo original (copiado sin decodificar, dentro del núcleo con
+«copy_file_range»/«sendfile» cuando el sistema lo admite, o por bloques en caso contrario) se escriben
+en un archivo temporal del mismo directorio que luego reemplaza al original, conservando sus permisos y saltos de línea.
 """
 
+import asyncio
+import codecs
 import os
+import re
+import sys
+import json
+import errno
+import hashlib
+import heapq
+import queue
 import argparse
-from typing import List, Optional, Tuple
+import difflib
+import shutil
+import socket
+import socketserver
+import stat
+import struct
+import subprocess
+import tempfile
+import time
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, closing
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import chain, repeat
+from statistics import median
+from typing import Any, AsyncIterator, BinaryIO, Deque, Dict, Iterator, List, Optional, Pattern, Tuple, Union
+try:
+    from watchdog.observers import Observer  # Notificaciones del sistema de archivos para «--watch» (opcional).
+except ImportError:
+    Observer = None  # Sin «watchdog», «--watch» recurre al sondeo periódico.
 from license_info import LICENSE_HEADERS  # Diccionario que define el marcador y la cabecera para cada tipo de archivo.
+from license_info import LicenseConfigError  # Error en la configuración de lenguajes («license_languages.json»).
+from license_info import get_license_fingerprint  # Huella digital de toda la configuración de licencia.
+from license_info import get_registry_revision  # Revisión del registro de lenguajes (cambia al registrar uno).
+
+# Reglas de exclusión por defecto: carpetas de compilación o entornos virtuales y archivos generados por herramientas
+# (ver «compile_ignore_rules»). El archivo «.license-ignore» del directorio raíz puede agregar otras, una por línea.
+DEFAULT_IGNORE_RULES = ("obj/", "bin/", "venv/", "env/", "__pycache__/", "*.Designer.cs", "*.g.cs", "*.g.i.cs")
+LICENSE_IGNORE_FILE_NAME = ".license-ignore"
+
+# Prefijo de las reglas de exclusión escritas como expresiones regulares.
+IGNORE_REGEX_PREFIX = "re:"
+
+# Tamaño máximo (en bytes) de los archivos a procesar; los mayores (por lo general, generados) se omiten sin abrirlos.
+DEFAULT_MAX_FILE_SIZE = 8 * 1024 * 1024
+
+# Nombre por defecto del manifiesto incremental (se ubica en el directorio raíz) y versión de su formato.
+LICENSE_CACHE_FILE_NAME = ".license-cache"
+LICENSE_CACHE_VERSION = 5
+
+# Antigüedad mínima (en nanosegundos) del «mtime» de un directorio para reutilizar su listado en el siguiente recorrido
+# incremental: cubre la resolución de los «mtime» de los sistemas de archivos más gruesos (FAT, 2 s).
+DIRECTORY_MTIME_GRANULARITY_NS = 2 * 1000 * 1000 * 1000
+
+# Tamaño inicial (en bytes) del prefijo que se lee para analizar la cabecera de un archivo.
+HEADER_PREFIX_SIZE = 8 * 1024
+
+# Líneas de contexto (del cuerpo ya leído en el prefijo) de los diff de la región de la cabecera («--diff» y «--patch-out»).
+HEADER_DIFF_CONTEXT_LINES = 3
+
+# Marca de orden de bytes (BOM) de UTF-8.
+UTF8_BOM = b"\xef\xbb\xbf"
+
+# Inicios (en bytes) de las líneas especiales, equivalentes a «is_special_line».
+SPECIAL_LINE_PREFIXES = (b"#!", b"# -*-", b"# vim:")
+
+# Espacios y saltos de línea ASCII.
+WHITESPACE_PATTERN = re.compile(rb"[ \t\r\n]*")
+
+# Saltos de línea reconocidos por «bytes.splitlines» (CRLF, CR o LF), con los que la vía normal divide las líneas.
+LINE_BREAK_PATTERN = re.compile(rb"\r\n?|\n")
+
+# Cantidad máxima de archivos por lote de la verificación («check_source_file_batch»).
+CHECK_BATCH_SIZE = 256
+
+# Cantidad mínima de archivos por proceso para verificar en paralelo. Verificar un archivo cuesta unas decenas de
+# microsegundos, del orden de lo que cuesta transferir su resultado entre procesos; por debajo de este umbral, iniciar
+# los procesos y transferir los resultados cuesta más de lo que se ahorra, y la verificación se hace secuencialmente.
+PARALLEL_CHECK_MIN_FILES_PER_JOB = 4096
+
+# Tamaño del búfer utilizado para copiar el cuerpo de un archivo al reescribirlo (y de cada bloque de la copia sin búfer).
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Errores con los que el sistema de archivos rechaza una copia sin búfer; en ese caso se recurre a la copia por bloques.
+ZERO_COPY_UNSUPPORTED_ERRORS = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, getattr(errno, "ENOTSUP", errno.EOPNOTSUPP)}
+
+# Estados posibles del procesamiento de un archivo.
+STATUS_CURRENT = "current"  # La cabecera de licencia ya está actualizada.
+STATUS_STALE = "stale"      # La cabecera de licencia existe pero está desactualizada.
+STATUS_MISSING = "missing"  # El archivo no contiene cabecera de licencia.
+STATUS_ERROR = "error"      # El archivo no pudo ser leído.
+STATUS_SKIPPED = "skipped"  # El archivo se omitió por su tamaño o su contenido (binario o con otra codificación).
+
+# Fases medidas por las estadísticas del proceso («--stats» y «--profile»), en el orden en que se informan.
+PHASE_DISCOVERY = "discovery"  # Descubrimiento de archivos (recorrido del árbol o consulta a git).
+PHASE_MANIFEST = "manifest"    # Verificación del «stat» contra el manifiesto incremental.
+PHASE_READ = "read"            # Apertura y lectura del primer bloque de cada archivo.
+PHASE_PARSE = "parse"          # Decodificación del prefijo y ubicación de la cabecera existente.
+PHASE_COMPARE = "compare"      # Comparación de la cabecera existente con la esperada (incluida la vía rápida por bytes).
+PHASE_WRITE = "write"          # Reescritura de los archivos.
+PHASE_LABELS = {
+    PHASE_DISCOVERY: "🔎 Descubrimiento",
+    PHASE_MANIFEST: "🗂️  Manifiesto",
+    PHASE_READ: "📖 Lectura",
+    PHASE_PARSE: "🧩 Análisis",
+    PHASE_COMPARE: "🔍 Comparación",
+    PHASE_WRITE: "✍️  Escritura"
+}
+
+# Cantidad por defecto de archivos más lentos que informa «--profile».
+DEFAULT_PROFILE_FILE_COUNT = 10
+
+# Versión del formato de los reportes parciales de «--shard» y nombre por defecto de cada reporte.
+SHARD_REPORT_VERSION = 2
+SHARD_REPORT_FILE_NAME = "license-report-{shard_number}-of-{shard_count}.json"
+
+# Nombre y versión del historial de ejecuciones (JSON Lines, un registro por línea en el directorio raíz).
+LICENSE_HISTORY_FILE_NAME = ".license-history.jsonl"
+LICENSE_HISTORY_VERSION = 1
+
+# Cantidad de ejecuciones previas (del mismo árbol y modo) cuya mediana sirve de referencia, cantidad mínima para
+# comparar y factor sobre esa mediana a partir del cual una ejecución se considera lenta.
+HISTORY_MEDIAN_WINDOW = 10
+HISTORY_MIN_RUNS = 3
+HISTORY_SLOW_FACTOR = 1.5
+
+# Cantidad por defecto de ejecuciones recientes que informa «--history».
+DEFAULT_HISTORY_RUN_COUNT = 20
+
+# Nombre del socket del servicio residente («--serve»), del directorio privado del usuario que lo contiene cuando no hay
+# «$XDG_RUNTIME_DIR» (dentro del directorio temporal) y tiempo máximo para conectarse a él.
+DAEMON_SOCKET_FILE_NAME = "license-header-{root_digest}.sock"
+DAEMON_SOCKET_DIRECTORY_NAME = "license-header-{user_id}"
+DAEMON_CONNECT_TIMEOUT = 0.5
+
+# Segundos sin cambios que «--watch» espera antes de procesar una ráfaga de cambios, e intervalo del sondeo de respaldo.
+DEFAULT_WATCH_DEBOUNCE = 0.5
+DEFAULT_WATCH_POLL_INTERVAL = 1.0
+
+class LicenseHeaderWarning(UserWarning):
+    """
+    «Advertencia de la herramienta» que no interrumpe el proceso (por ejemplo, que no hay un repositorio git o que no se pudo
+    guardar el manifiesto incremental). Como biblioteca, la herramienta no imprime: emite estas advertencias con «warnings»
+    y quien la invoca decide cómo mostrarlas (la ejecución por línea de comando las imprime con «show_license_header_warning»).
+    """
+
+def show_license_header_warning(message: Union[Warning, str], category: type, filename: str, lineno: int, file: Optional[Any] = None, line: Optional[str] = None) -> None:
+    """
+    «Muestra una advertencia en la consola»: las «LicenseHeaderWarning» se imprimen con el mismo formato que los demás mensajes
+    de la herramienta; el resto, con el formato por defecto de «warnings».
+
+    Argumentos:
+        «message» (Union[Warning, str]): Advertencia emitida.
+        «category» (type): Clase de la advertencia.
+        «filename» (str): Archivo donde se emitió.
+        «lineno» (int): Línea donde se emitió.
+        «file» (Optional[Any]): Archivo de salida (por defecto, «sys.stderr» para las advertencias ajenas a la herramienta).
+        «line» (Optional[str]): Línea de código a mostrar.
+    """
+    if issubclass(category, LicenseHeaderWarning):
+        print(f"⚠️  {message}")
+    else:
+        (file or sys.stderr).write(warnings.formatwarning(message, category, filename, lineno, line))
 
 def is_special_line(line: str) -> bool:
     """
@@ -97,50 +342,60 @@ def is_special_line(line: str) -> bool:
         stripped_line.startswith("# vim:")
     )
 
-def is_comment_line(line: str) -> bool:
+def is_comment_line(line: str, comment_prefixes: Tuple[str, ...]) -> bool:
     """
     «Determina si una línea forma parte de un bloque de cabecera».
-    Se evalúa si la línea está vacía o comienza con un símbolo de comentario típico
-    para archivos «.cs» y «.py».
+    Se evalúa si la línea está vacía o comienza con un símbolo de comentario del lenguaje del archivo
+    (por ejemplo, «//», «/*» y «*» para «.cs», o «#» para «.py»).
 
     Argumentos:
         «line» (str): Línea a evaluar.
+        «comment_prefixes» (Tuple[str, ...]): Inicios de línea de comentario del lenguaje («comment_prefixes» de «LICENSE_HEADERS»).
     
     Retorna:
         «bool»: True si la línea es vacía o de comentario; False en caso contrario.
     """
     # Elimina espacios a la izquierda para evaluar el inicio de la línea.
     stripped_line = line.lstrip()
-    return stripped_line == "" or stripped_line.startswith(("#", "/*", "*", "//"))
+    return stripped_line == "" or stripped_line.startswith(comment_prefixes)
 
-def extract_existing_header(file_content: str, header_marker: str) -> Tuple[Optional[str], str, List[str]]:
+@dataclass
+class HeaderLocation:
     """
-    «Extrae el bloque de cabecera existente» en el archivo, si comienza con el «header_marker» especificado,
-    y detecta las líneas iniciales especiales (shebang y codificación).
+    «Ubicación de la cabecera de licencia» dentro de las líneas iniciales de un archivo.
+
+    Atributos:
+        «preserved_count» (int): Número de líneas especiales iniciales (shebang y codificación) que se deben preservar.
+        «has_header» (bool): True si se encontró el «header_marker».
+        «header_end» (int): Índice (sobre todas las líneas) de la primera línea posterior al bloque de cabecera.
+        «is_conclusive» (bool): True si el análisis se resolvió dentro de las líneas entregadas, es decir,
+            si agregar más líneas al final no puede cambiar el resultado.
+    """
+    preserved_count: int
+    has_header: bool
+    header_end: int
+    is_conclusive: bool
+
+def locate_existing_header(lines: List[str], header_marker: str, comment_prefixes: Tuple[str, ...]) -> HeaderLocation:
+    """
+    «Localiza el bloque de cabecera existente» en las líneas iniciales de un archivo, si comienza con el
+    «header_marker» especificado, y detecta las líneas iniciales especiales (shebang y codificación).
+    Las líneas pueden corresponder solo a un prefijo del archivo; «is_conclusive» indica si fueron suficientes.
 
     Argumentos:
-        «file_content» (str): Contenido completo del archivo.
+        «lines» (List[str]): Líneas del archivo (o de un prefijo de líneas completas), conservando los saltos de línea.
         «header_marker» (str): Marcador que identifica el inicio de la cabecera de licencia.
+        «comment_prefixes» (Tuple[str, ...]): Inicios de línea de comentario del lenguaje del archivo.
 
     Retorna:
-        tuple: Una tupla («existing_header», «content», «preserved_lines») donde:
-            - «preserved_lines» (List[str]): Lista de líneas especiales (shebang y codificación) que se deben preservar.
-            - «existing_header» (Optional[str]): Bloque de cabecera encontrado (incluye líneas vacías y de comentario).
-              Si no se encuentra la cabecera, será None.
-            - «content» (str): Resto del contenido del archivo (sin la cabecera ni las líneas especiales).
+        «HeaderLocation»: Ubicación de las líneas preservadas y del bloque de cabecera.
     """
-    # Divide el contenido en líneas conservando los saltos de línea.
-    lines = file_content.splitlines(keepends=True)
-    
-    # Detecta y preserva las líneas especiales (por ejemplo, shebang o codificación).
-    preserved_lines = []
+    # Detecta las líneas especiales (por ejemplo, shebang o codificación).
     header_start_index = 0
-    for index, line in enumerate(lines):
-        if is_special_line(line):
-            preserved_lines.append(line)
-            header_start_index = index + 1
-        else:
+    for line in lines:
+        if not is_special_line(line):
             break
+        header_start_index += 1
 
     # Considera el contenido a partir de las líneas especiales.
     content_lines = lines[header_start_index:]
@@ -151,6 +406,9 @@ def extract_existing_header(file_content: str, header_marker: str) -> Tuple[Opti
     # Bandera para detectar si hay contenido de código antes del marcador de cabecera
     found_non_empty_line = False
 
+    # Bandera que indica si la búsqueda del marcador terminó antes de agotar las líneas
+    marker_search_finished = False
+
     # Recorremos todas las líneas del contenido
     for index, line in enumerate(content_lines):
         stripped_line = line.strip()  # Eliminamos espacios en blanco de la línea
@@ -158,12 +416,14 @@ def extract_existing_header(file_content: str, header_marker: str) -> Tuple[Opti
         # Si la línea está vacía, seguimos buscando el `header_marker`, pero solo si no hemos encontrado código antes
         if stripped_line == "":
             if found_non_empty_line:
+                marker_search_finished = True
                 break  # Si ya encontramos código antes, detenemos la búsqueda porque la cabecera no debe estar separada
             continue  # Si aún no hay código, permitimos más líneas vacías antes de la cabecera
 
         # Si encontramos el `header_marker`, guardamos el índice y terminamos la búsqueda
         if stripped_line.startswith(header_marker):
             header_start = index
+            marker_search_finished = True
             break
 
         # Si la línea no está vacía ni es la cabecera, significa que hay código antes del `header_marker`
@@ -171,139 +431,3553 @@ def extract_existing_header(file_content: str, header_marker: str) -> Tuple[Opti
 
     # Si no se encontró un marcador de cabecera válido, asumimos que no hay cabecera
     if header_start is None:
-        return preserved_lines, None, "".join(content_lines)  
+        return HeaderLocation(header_start_index, False, header_start_index, marker_search_finished)
+
+    # Determina las líneas que conforman el bloque de cabecera (líneas vacías y de comentario).
+    header_end_index = count_leading_comment_lines(content_lines, comment_prefixes)
+
+    # El bloque es concluyente solo si terminó en una línea de código (y no al agotar las líneas).
+    return HeaderLocation(header_start_index, True, header_start_index + header_end_index, header_end_index < len(content_lines))
+
+def extract_existing_header(file_content: str, header_marker: str, comment_prefixes: Tuple[str, ...]) -> Tuple[List[str], Optional[str], str]:
+    """
+    «Extrae el bloque de cabecera existente» en el archivo, si comienza con el «header_marker» especificado,
+    y detecta las líneas iniciales especiales (shebang y codificación).
+
+    Argumentos:
+        «file_content» (str): Contenido completo del archivo.
+        «header_marker» (str): Marcador que identifica el inicio de la cabecera de licencia.
+        «comment_prefixes» (Tuple[str, ...]): Inicios de línea de comentario del lenguaje del archivo.
+
+    Retorna:
+        tuple: Una tupla («preserved_lines», «existing_header», «content») donde:
+            - «preserved_lines» (List[str]): Lista de líneas especiales (shebang y codificación) que se deben preservar.
+            - «existing_header» (Optional[str]): Bloque de cabecera encontrado (incluye líneas vacías y de comentario).
+              Si no se encuentra la cabecera, será None.
+            - «content» (str): Resto del contenido del archivo (sin la cabecera ni las líneas especiales).
+    """
+    # Divide el contenido en líneas conservando los saltos de línea.
+    lines = file_content.splitlines(keepends=True)
+    location = locate_existing_header(lines, header_marker, comment_prefixes)
+
+    # Líneas especiales (por ejemplo, shebang o codificación) que se deben preservar.
+    preserved_lines = lines[:location.preserved_count]
+
+    # Si no se encontró un marcador de cabecera válido, asumimos que no hay cabecera
+    if not location.has_header:
+        return preserved_lines, None, "".join(lines[location.preserved_count:])
         # Retorna:
         # - `preserved_lines`: Las líneas especiales detectadas (ej. shebang, codificación).
         # - `None`: Indica que no hay cabecera existente.
         # - `content_lines`: El contenido del archivo sin modificaciones.
 
-    # Extrae las líneas que conforman el bloque de cabecera.
-    header_lines = []
-    header_end_index = 0
-    for line in content_lines:
-        if is_comment_line(line):
-            header_lines.append(line)
-            header_end_index += 1
-        else:
+    existing_header = "".join(lines[location.preserved_count:location.header_end])
+    content = "\n" + "".join(lines[location.header_end:])
+    return preserved_lines, existing_header, content
+
+def find_current_header_end(data: bytes, license_config: Dict[str, Any], at_eof: bool) -> Optional[int]:
+    """
+    «Confirma sobre los bytes crudos que la cabecera está actualizada», sin decodificar ni dividir en líneas.
+    Omite la marca BOM, las líneas especiales (shebang, codificación) y los espacios iniciales, y compara la
+    cabecera esperada («header_bytes» o «header_bytes_crlf») con un único «bytes.startswith».
+
+    Es una vía rápida conservadora: solo responde cuando el resultado coincide con el de «extract_existing_header»;
+    ante cualquier forma inusual (saltos de línea mixtos, comentarios tras la cabecera, caracteres de control o no ASCII)
+    retorna None y el archivo se analiza por la vía normal.
+
+    Argumentos:
+        «data» (bytes): Prefijo crudo del archivo.
+        «license_config» (Dict[str, Any]): Configuración de la licencia de la extensión del archivo («LICENSE_HEADERS»).
+        «at_eof» (bool): True si «data» contiene el archivo completo.
+
+    Retorna:
+        «Optional[int]»: Posición de la primera línea de código posterior a la cabecera si está actualizada; None en caso contrario.
+    """
+    position = len(UTF8_BOM) if data.startswith(UTF8_BOM) else 0
+
+    # Omite las líneas especiales (shebang, codificación o configuración de vim). Un «\r» aislado también termina
+    # la línea, igual que en la vía normal.
+    while True:
+        line_break = LINE_BREAK_PATTERN.search(data, position)
+        if line_break is None:
+            return None
+        if not data[position:line_break.start()].strip().startswith(SPECIAL_LINE_PREFIXES):
             break
+        position = line_break.end()
 
-    existing_header = "".join(header_lines)
-    content = "\n" + "".join(content_lines[header_end_index:])
-    return preserved_lines, existing_header, content
+    # La cabecera debe ser lo primero tras las líneas especiales (salvo espacios y líneas vacías).
+    header_start = WHITESPACE_PATTERN.match(data, position).end()
+    if data.startswith(license_config["header_bytes"], header_start):
+        header_end = header_start + len(license_config["header_bytes"])
+    elif data.startswith(license_config["header_bytes_crlf"], header_start):
+        header_end = header_start + len(license_config["header_bytes_crlf"])
+    else:
+        return None
+
+    # Tras la cabecera solo pueden venir líneas vacías y luego una línea de código (o el final del archivo).
+    code_start = WHITESPACE_PATTERN.match(data, header_end).end()
+    if code_start == len(data):
+        return code_start if at_eof else None
+    if data.find(b"\n", header_end, code_start) == -1 and data.find(b"\r", header_end, code_start) == -1:
+        return None  # El código continúa en la misma línea en que termina la cabecera.
+    if not 0x21 <= data[code_start] <= 0x7e or data.startswith(license_config["comment_prefix_bytes"], code_start):
+        return None  # Un comentario a continuación formaría parte del bloque de cabecera.
+
+    return code_start
 
-def regenerate_license_headers(root_directory: str) -> None:
+def decode_source_lines(raw_lines: List[bytes]) -> List[str]:
     """
-    «Recorre el directorio» «root_directory» y procesa cada archivo fuente con extensión «.cs» y «.py».
-    - Inserta la cabecera si no está presente.
-    - Reemplaza la cabecera si está desactualizada.
+    «Decodifica las líneas de un archivo fuente» como UTF-8, normalizando los saltos de línea
+    igual que la lectura en modo texto (los saltos CRLF y CR se convierten en LF).
 
     Argumentos:
-        «root_directory» (str): Directorio raíz desde donde se inicia la búsqueda recursiva.
+        «raw_lines» (List[bytes]): Líneas crudas (sin la marca BOM), conservando sus saltos de línea.
+
+    Retorna:
+        «List[str]»: Líneas decodificadas.
     """
-    # Directorios a excluir (carpetas de compilación o entornos virtuales).
-    excluded_dirs = {"obj", "bin", "venv", "env", "__pycache__"}
+    return [raw_line.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n") for raw_line in raw_lines]
 
-    files_updated = 0
-    files_with_updated_license = 0
-    files_with_outdated_license = 0
-    files_without_license = 0
+def count_leading_comment_lines(lines: List[str], comment_prefixes: Tuple[str, ...]) -> int:
+    """
+    «Cuenta las líneas iniciales vacías o de comentario» (ver «is_comment_line»), que forman el bloque de cabecera.
 
-    # Recorre recursivamente el directorio raíz.
-    for current_dir, subdirs, files in os.walk(root_directory):
+    Argumentos:
+        «lines» (List[str]): Líneas a partir de las líneas especiales preservadas.
+        «comment_prefixes» (Tuple[str, ...]): Inicios de línea de comentario del lenguaje del archivo.
 
-        # Excluye directorios irrelevantes
-        subdirs[:] = [d for d in subdirs if d not in excluded_dirs]
+    Retorna:
+        «int»: Cantidad de líneas iniciales vacías o de comentario.
+    """
+    comment_count = 0
+    for line in lines:
+        if not is_comment_line(line, comment_prefixes):
+            break
+        comment_count += 1
+    return comment_count
 
-        for file_name in files:
-            file_extension = os.path.splitext(file_name)[1].lower()
-            # Procesa solo archivos con extensiones definidas en «LICENSE_HEADERS».
-            if file_extension not in LICENSE_HEADERS:
-                continue
+def scan_for_header_marker(source_file: BinaryIO, pending_data: bytes, header_marker: str) -> bool:
+    """
+    «Continúa la búsqueda del marcador de cabecera» por bloques, con las mismas reglas que «locate_existing_header»
+    cuando ya se encontró código: termina en la primera línea vacía o en la que comienza con el marcador.
+    Cada bloque se descarta después de analizarlo, por lo que la memoria utilizada no depende del tamaño del archivo.
+
+    Argumentos:
+        «source_file» (BinaryIO): Archivo abierto en modo binario, posicionado tras «pending_data».
+        «pending_data» (bytes): Bytes ya leídos que aún no se analizaron.
+        «header_marker» (str): Marcador que identifica el inicio de la cabecera de licencia.
+
+    Retorna:
+        «bool»: True si se encontró el marcador antes de una línea vacía o del final del archivo.
+
+    Excepciones:
+        «UnicodeDecodeError»: Si alguna de las líneas analizadas no es UTF-8 válido.
+    """
+    while True:
+        chunk = source_file.read(COPY_BUFFER_SIZE)
+        at_eof = not chunk
+        pending_data += chunk
+        complete_data = pending_data if at_eof else pending_data[:pending_data.rfind(b"\n") + 1]
+        for line in decode_source_lines(complete_data.splitlines(keepends=True)):
+            stripped_line = line.strip()
+            if stripped_line == "":
+                return False
+            if stripped_line.startswith(header_marker):
+                return True
+        if at_eof:
+            return False
+        pending_data = pending_data[len(complete_data):]
+
+@dataclass
+class HeaderPrefix:
+    """
+    «Prefijo de un archivo fuente» con lo necesario para analizar su cabecera y reescribirla sin decodificar el resto.
+
+    Atributos:
+        «data» (bytes): Prefijo crudo leído (solo líneas completas), incluida la marca BOM si existe.
+        «lines» (List[str]): Líneas decodificadas del prefijo (sin la marca BOM), con saltos de línea normalizados.
+        «line_offsets» (List[int]): Posición en bytes del inicio de cada línea, más la posición del final del prefijo.
+        «location» (HeaderLocation): Ubicación de la cabecera dentro de «lines».
+        «newline» (str): Salto de línea del archivo («\\r\\n» o «\\n»), según su primera línea.
+    """
+    data: bytes
+    lines: List[str]
+    line_offsets: List[int]
+    location: HeaderLocation
+    newline: str
+
+    @property
+    def existing_header(self) -> Optional[str]:
+        """«Bloque de cabecera existente»; None si el archivo no contiene el marcador de la cabecera."""
+        if not self.location.has_header:
+            return None
+        return "".join(self.lines[self.location.preserved_count:self.location.header_end])
+
+def read_header_prefix(source_file: BinaryIO, header_marker: str, comment_prefixes: Tuple[str, ...], data: bytes, prefix_size: int = HEADER_PREFIX_SIZE) -> HeaderPrefix:
+    """
+    «Lee solo el prefijo del archivo» necesario para analizar su cabecera de licencia.
+    Parte del bloque inicial de «prefix_size» bytes ya leído y, solo si la cabecera continúa más allá de él,
+    duplica sucesivamente lo leído hasta que el análisis sea concluyente o se alcance el final del archivo.
+
+    Argumentos:
+        «source_file» (BinaryIO): Archivo abierto en modo binario, posicionado tras el bloque inicial.
+        «header_marker» (str): Marcador que identifica el inicio de la cabecera de licencia.
+        «comment_prefixes» (Tuple[str, ...]): Inicios de línea de comentario del lenguaje del archivo.
+        «data» (bytes): Bloque inicial leído del archivo.
+        «prefix_size» (int): Tamaño del bloque inicial, en bytes.
+
+    Retorna:
+        «HeaderPrefix»: Prefijo leído (solo líneas completas), sus líneas decodificadas y la ubicación de la cabecera.
+
+    Excepciones:
+        «UnicodeDecodeError»: Si el prefijo no es UTF-8 válido.
+    """
+    at_eof = len(data) < prefix_size
+    bom_length = len(UTF8_BOM) if data.startswith(UTF8_BOM) else 0
+
+    while True:
+        # Descarta la última línea si está incompleta (evita cortar caracteres multibyte y líneas a medias).
+        prefix = data if at_eof else data[:data.rfind(b"\n") + 1]
+        raw_lines = prefix[bom_length:].splitlines(keepends=True)
+        lines = decode_source_lines(raw_lines)
+        location = locate_existing_header(lines, header_marker, comment_prefixes)
+        if at_eof or (lines and location.is_conclusive):
+            break
+
+        # Si el bloque inicial de comentarios ya terminó dentro del prefijo y solo resta buscar el marcador
+        # (que puede aparecer tras líneas de código mientras no haya una línea vacía), la búsqueda continúa
+        # sin acumular lo leído: el resto del archivo no forma parte de la cabecera ni se conserva en memoria.
+        leading_comment_count = count_leading_comment_lines(lines[location.preserved_count:], comment_prefixes)
+        if not location.has_header and location.preserved_count + leading_comment_count < len(lines):
+            has_header = scan_for_header_marker(source_file, data[len(prefix):], header_marker)
+            header_end = location.preserved_count + (leading_comment_count if has_header else 0)
+            location = HeaderLocation(location.preserved_count, has_header, header_end, True)
+            break
+
+        # La cabecera continúa más allá del prefijo: se duplica el tamaño leído.
+        chunk = source_file.read(len(data))
+        at_eof = len(chunk) < len(data)
+        data += chunk
+
+    line_offsets = [bom_length]
+    for raw_line in raw_lines:
+        line_offsets.append(line_offsets[-1] + len(raw_line))
+    newline = "\r\n" if raw_lines and raw_lines[0].endswith(b"\r\n") else "\n"
+
+    return HeaderPrefix(prefix, lines, line_offsets, location, newline)
+
+@dataclass
+class RewritePlan:
+    """
+    «Plan de reescritura de un archivo fuente»: el nuevo inicio del archivo y la posición desde la que se copia su cuerpo original.
+
+    Atributos:
+        «file_path» (str): Ruta completa del archivo.
+        «head» (bytes): Nuevo inicio del archivo (marca BOM, líneas preservadas, nueva cabecera y separadores).
+        «body_offset» (int): Posición en bytes del archivo original desde la que se copia el resto sin modificar.
+        «mtime_ns» (int): Fecha de modificación del archivo cuando fue analizado.
+        «size» (int): Tamaño del archivo cuando fue analizado.
+        «mode» (int): Permisos del archivo, que se conservan al reemplazarlo.
+    """
+    file_path: str
+    head: bytes
+    body_offset: int
+    mtime_ns: int
+    size: int
+    mode: int
+
+def create_rewrite_plan(full_file_path: str, file_stat: os.stat_result, header_prefix: HeaderPrefix, new_license_header: str) -> RewritePlan:
+    """
+    «Crea el plan de reescritura» de un archivo: las líneas preservadas, la nueva cabecera de licencia, un salto
+    de línea y el contenido original (precedido de otro salto de línea si se reemplaza una cabecera existente).
+    La marca BOM, las líneas preservadas y el cuerpo se conservan byte a byte, y la cabecera utiliza el salto de línea del archivo.
+
+    Argumentos:
+        «full_file_path» (str): Ruta completa del archivo.
+        «file_stat» (os.stat_result): Resultado de «os.stat» tomado antes de leer el archivo.
+        «header_prefix» (HeaderPrefix): Prefijo analizado del archivo.
+        «new_license_header» (str): Nueva cabecera de licencia.
+
+    Retorna:
+        «RewritePlan»: Plan de reescritura del archivo.
+    """
+    location = header_prefix.location
+    newline = header_prefix.newline
+    preserved_end = header_prefix.line_offsets[location.preserved_count]
+
+    new_header = new_license_header.replace("\n", newline) + newline
+    if location.has_header:
+        # Se reemplaza el bloque de cabecera existente (incluidas sus líneas vacías finales).
+        new_header += newline
+        body_offset = header_prefix.line_offsets[location.header_end]
+    else:
+        body_offset = preserved_end
+
+    head = header_prefix.data[:preserved_end] + new_header.encode("utf-8")
+    return RewritePlan(full_file_path, head, body_offset, file_stat.st_mtime_ns, file_stat.st_size, stat.S_IMODE(file_stat.st_mode))
+
+def copy_file_range_chunk(source_descriptor: int, target_descriptor: int, offset: int, count: int) -> int:
+    """
+    «Copia un bloque con os.copy_file_range» (dentro del núcleo, sin pasar por la memoria del proceso).
+
+    Argumentos:
+        «source_descriptor» (int): Descriptor del archivo original.
+        «target_descriptor» (int): Descriptor del archivo destino (se escribe en su posición actual).
+        «offset» (int): Posición del archivo original desde la que se copia.
+        «count» (int): Cantidad máxima de bytes a copiar.
+
+    Retorna:
+        «int»: Bytes copiados (0 al llegar al final del archivo original).
+    """
+    return os.copy_file_range(source_descriptor, target_descriptor, count, offset)
+
+def sendfile_chunk(source_descriptor: int, target_descriptor: int, offset: int, count: int) -> int:
+    """
+    «Copia un bloque con os.sendfile» (dentro del núcleo; en Linux, el destino puede ser un archivo común).
+
+    Argumentos:
+        «source_descriptor» (int): Descriptor del archivo original.
+        «target_descriptor» (int): Descriptor del archivo destino (se escribe en su posición actual).
+        «offset» (int): Posición del archivo original desde la que se copia.
+        «count» (int): Cantidad máxima de bytes a copiar.
+
+    Retorna:
+        «int»: Bytes copiados (0 al llegar al final del archivo original).
+    """
+    return os.sendfile(target_descriptor, source_descriptor, offset, count)
+
+# Mecanismos de copia sin búfer disponibles, en orden de preferencia.
+ZERO_COPY_FUNCTIONS = []
+if hasattr(os, "copy_file_range"):
+    ZERO_COPY_FUNCTIONS.append(copy_file_range_chunk)
+if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+    ZERO_COPY_FUNCTIONS.append(sendfile_chunk)
 
-            full_file_path = os.path.join(current_dir, file_name)
-            relative_file_path = f"...{os.sep}{os.path.relpath(full_file_path, root_directory)}"
+def copy_file_body(source_file: BinaryIO, target_file: BinaryIO, body_offset: int) -> None:
+    """
+    «Copia el cuerpo de un archivo» desde «body_offset» hasta su final, a continuación de lo ya escrito en «target_file».
+    Se prefiere la copia dentro del núcleo («copy_file_range» o «sendfile»), que no pasa los datos por la memoria del
+    proceso; si el sistema no la admite, el resto se copia por bloques de «COPY_BUFFER_SIZE». En ambos casos el cuerpo
+    nunca se decodifica y el uso de memoria no depende del tamaño del archivo.
+
+    Argumentos:
+        «source_file» (BinaryIO): Archivo original, abierto en modo binario.
+        «target_file» (BinaryIO): Archivo destino, abierto en modo binario.
+        «body_offset» (int): Posición del archivo original desde la que se copia.
+
+    Excepciones:
+        «OSError»: Si falla la lectura del original o la escritura del destino.
+    """
+    # Lo escrito a través del búfer del destino debe llegar al descriptor antes de copiar sobre él.
+    target_file.flush()
+    source_descriptor = source_file.fileno()
+    target_descriptor = target_file.fileno()
+    offset = body_offset
+
+    for copy_chunk in ZERO_COPY_FUNCTIONS:
+        try:
+            while True:
+                copied = copy_chunk(source_descriptor, target_descriptor, offset, COPY_BUFFER_SIZE * 8)
+                if copied == 0:
+                    return
+                offset += copied
+        except OSError as copy_error:
+            if copy_error.errno not in ZERO_COPY_UNSUPPORTED_ERRORS:
+                raise
+            # El mecanismo no se admite aquí: se continúa con el siguiente desde la misma posición.
+
+    source_file.seek(offset)
+    shutil.copyfileobj(source_file, target_file, COPY_BUFFER_SIZE)
+
+def split_patch_lines(text: str) -> List[str]:
+    """
+    «Divide un texto en líneas para un parche», cortando solo en «\\n» (como git) y conservando los saltos de línea.
+
+    Argumentos:
+        «text» (str): Texto a dividir.
+
+    Retorna:
+        «List[str]»: Líneas del texto; la última no termina en «\\n» si el texto tampoco.
+    """
+    lines = [line + "\n" for line in text.split("\n")]
+    lines[-1] = lines[-1][:-1]
+    return lines if lines[-1] else lines[:-1]
+
+def format_header_diff(file_key: str, header_prefix: HeaderPrefix, rewrite_plan: RewritePlan) -> str:
+    """
+    «Genera el diff unificado de la región de la cabecera» de un archivo, a partir de su prefijo y su plan de reescritura:
+    compara el inicio original (hasta «body_offset») con el nuevo, más unas líneas de contexto del cuerpo ya leídas.
+    El cuerpo no se lee, de modo que el costo no depende del tamaño del archivo. El resultado puede aplicarse con «git apply».
 
-            # Intenta leer el contenido original del archivo.
+    Argumentos:
+        «file_key» (str): Ruta del archivo relativa al directorio raíz, con separadores «/» (ver «get_cache_key»).
+        «header_prefix» (HeaderPrefix): Prefijo analizado del archivo.
+        «rewrite_plan» (RewritePlan): Plan de reescritura del archivo.
+
+    Retorna:
+        «str»: Diff unificado del archivo.
+    """
+    # El inicio original puede terminar a mitad de línea (tras la marca BOM), por lo que se une al contexto antes de dividirlo.
+    body_offset = rewrite_plan.body_offset
+    context = "".join(split_patch_lines(header_prefix.data[body_offset:].decode("utf-8", "surrogateescape"))[:HEADER_DIFF_CONTEXT_LINES])
+    original_lines = split_patch_lines(header_prefix.data[:body_offset].decode("utf-8", "surrogateescape") + context)
+    updated_lines = split_patch_lines(rewrite_plan.head.decode("utf-8", "surrogateescape") + context)
+
+    diff_lines = [f"diff --git a/{file_key} b/{file_key}\n"]
+    for diff_line in difflib.unified_diff(original_lines, updated_lines, f"a/{file_key}", f"b/{file_key}", n=HEADER_DIFF_CONTEXT_LINES):
+        diff_lines.append(diff_line)
+        if not diff_line.endswith("\n"):
+            # Última línea del archivo sin salto de línea, con la marca que espera «git apply».
+            diff_lines.append("\n\\ No newline at end of file\n")
+    return "".join(diff_lines)
+
+def apply_rewrite_plan(plan: RewritePlan) -> Optional[Tuple[int, int]]:
+    """
+    «Aplica un plan de reescritura» de forma atómica: el nuevo inicio y el cuerpo original se escriben por bloques
+    en un archivo temporal del mismo directorio, que luego reemplaza al original con «os.replace».
+    Si el proceso se interrumpe, el archivo original queda intacto.
+
+    Argumentos:
+        «plan» (RewritePlan): Plan de reescritura del archivo.
+
+    Retorna:
+        «Optional[Tuple[int, int]]»: Estado («mtime» en nanosegundos y tamaño) del archivo reescrito, o None si cambió
+            desde que fue analizado (y por lo tanto se omitió).
+
+    Excepciones:
+        «OSError»: Si no se pudo leer el original o escribir el archivo temporal.
+    """
+    # Se escribe sobre el destino real, para no reemplazar enlaces simbólicos por archivos.
+    target_path = os.path.realpath(plan.file_path)
+    target_directory, target_name = os.path.split(target_path)
+
+    with open(target_path, "rb") as source_file:
+        current_stat = os.fstat(source_file.fileno())
+        if current_stat.st_mtime_ns != plan.mtime_ns or current_stat.st_size != plan.size:
+            return None
+
+        temporary_descriptor, temporary_path = tempfile.mkstemp(prefix=f".{target_name}.", suffix=".tmp", dir=target_directory)
+        try:
+            with os.fdopen(temporary_descriptor, "wb") as target_file:
+                target_file.write(plan.head)
+                copy_file_body(source_file, target_file, plan.body_offset)
+                target_file.flush()
+                os.fsync(target_file.fileno())
+                written_stat = os.fstat(target_file.fileno())
+            os.chmod(temporary_path, plan.mode)
+            os.replace(temporary_path, target_path)
+        except BaseException:
+            # Elimina el archivo temporal si la escritura no se completó.
             try:
-                with open(full_file_path, "r", encoding="utf-8") as source_file:
-                    original_content = source_file.read()
-            except Exception as read_error:
-                print(f"❌ No se pudo leer {relative_file_path}: {read_error}")
-                continue
+                os.remove(temporary_path)
+            except OSError:
+                pass
+            raise
 
-            # Obtiene la configuración de la licencia según la extensión del archivo.
-            license_config = LICENSE_HEADERS[file_extension]
-            header_marker = license_config["marker"]
-            new_license_header = license_config["header"]
-
-            # Extrae la cabecera existente (si la hay) y las líneas especiales que se deben preservar.
-            preserved_lines, existing_header, content = extract_existing_header(original_content, header_marker)
-
-            # Bandera para determinar si se debe actualizar el archivo y variable para el nuevo contenido.
-            file_updated = False
-            updated_content = ""
-
-            # Determina si es necesario insertar, actualizar o conservar la cabecera de licencia.
-            # Se verifica si la cabecera existente es None o si la cabecera existente es diferente de la nueva, ignorando espacios innecesarios al inicio y al final.
-            is_new_header = existing_header is None
-            header_needs_update = is_new_header or existing_header.strip() != new_license_header.strip()
-
-            if header_needs_update:
-                # Si es necesario actualizar la cabecera, se asigna la acción adecuada:
-                # - "Insertando" si es una nueva cabecera (es decir, no hay cabecera existente),
-                # - "Regenerando" si la cabecera existente debe ser reemplazada por una nueva.
-                action = "Insertando" if is_new_header else "Regenerando"
-                print(f"➕ {action} «License Header» en «{relative_file_path}».")
-                
-                # Se actualiza el contenido del archivo concatenando las líneas preservadas, la nueva cabecera de licencia,
-                # un salto de línea, y el contenido original del archivo.
-                updated_content = "".join(preserved_lines) + new_license_header + "\n" + content
-                file_updated = True  # Se marca que el archivo fue actualizado.
-
-                # Actualiza los contadores de archivos según si la cabecera es nueva o estaba desactualizada.
-                if is_new_header:
-                    # Si la cabecera es nueva, incrementa el contador de archivos sin cabecera de licencia.
-                    files_without_license += 1  # Archivo sin cabecera de licencia.
-                else:
-                    # Si la cabecera estaba desactualizada, incrementa el contador de archivos con cabecera de licencia desactualizada.
-                    files_with_outdated_license += 1  # Archivo con cabecera de licencia desactualizada.
-            else:
-                # Si la cabecera ya está actualizada (es decir, no necesita cambios), 
-                # se incrementa el contador de archivos que ya tienen la cabecera de licencia actualizada.
-                files_with_updated_license += 1  # Archivo con cabecera de licencia actualizada.
+    return written_stat.st_mtime_ns, written_stat.st_size
 
-            # Se sobrescribe el archivo únicamente si se realizó alguna modificación.
-            if file_updated:
-                try:
-                    with open(full_file_path, "w", encoding="utf-8") as target_file:
-                        target_file.write(updated_content)
-                    files_updated += 1
-                except Exception as write_error:
-                    print(f"❌ No se pudo escribir en {relative_file_path}: {write_error}")
+@dataclass
+class FileProcessingResult:
+    """
+    «Resultado del procesamiento de un archivo fuente».
 
-    if (files_updated > 0):
-        print()
-    print("📊 Resumen del proceso:")
-    print(f"✔️  Archivos con licencia actualizada: {files_with_updated_license}")
-    print(f"🔄 Archivos con licencia desactualizada: {files_with_outdated_license}")
-    print(f"➕ Archivos sin licencia: {files_without_license}")
-    print(f"✅ Total de archivos modificados: {files_updated}")
+    Atributos:
+        «file_path» (str): Ruta completa del archivo.
+        «relative_file_path» (str): Ruta del archivo relativa al directorio raíz (para mostrar).
+        «status» (str): Estado de la cabecera de licencia («STATUS_CURRENT», «STATUS_STALE», «STATUS_MISSING», «STATUS_ERROR» o «STATUS_SKIPPED»).
+        «file_updated» (bool): True si el archivo fue reescrito correctamente.
+        «messages» (List[str]): Mensajes generados durante el procesamiento, en orden de aparición.
+        «cache_entry» (Optional[Dict[str, Any]]): Entrada del manifiesto incremental para el archivo
+            (solo cuando la cabecera quedó verificada como actualizada).
+        «rewrite_plan» (Optional[RewritePlan]): Reescritura pendiente, cuando se difiere para la fase de escritura.
+        «phase_seconds» (Dict[str, float]): Segundos dedicados al archivo en cada fase («PHASE_*»).
+        «bytes_read» (int): Bytes leídos del archivo (prefijo y, si se reescribió, su cuerpo).
+        «bytes_written» (int): Bytes escritos al reescribir el archivo.
+        «header_diff» (Optional[str]): Diff unificado de la región de la cabecera, cuando se solicita y el archivo debe reescribirse.
+        «file_key» (Optional[str]): Clave del manifiesto incremental del archivo (ver «get_cache_key»), calculada una sola vez
+            junto con la ruta relativa (siempre presente cuando hay «cache_entry»).
+        «written_state» (Optional[Tuple[int, int]]): Estado («mtime» en nanosegundos y tamaño) del archivo justo después
+            de reescribirlo (solo cuando «file_updated»), con el que «--watch» reconoce sus propias escrituras.
+    """
+    file_path: str
+    relative_file_path: str
+    status: str
+    file_updated: bool = False
+    messages: List[str] = field(default_factory=list)
+    cache_entry: Optional[Dict[str, Any]] = None
+    rewrite_plan: Optional[RewritePlan] = None
+    phase_seconds: Dict[str, float] = field(default_factory=dict)
+    bytes_read: int = 0
+    bytes_written: int = 0
+    header_diff: Optional[str] = None
+    file_key: Optional[str] = None
+    written_state: Optional[Tuple[int, int]] = None
 
-if __name__ == "__main__":
-    # Obtiene el directorio del script actual.
-    script_directory = os.path.dirname(os.path.abspath(__file__))
+def translate_ignore_glob(glob: str) -> str:
+    """
+    «Traduce un patrón glob a una expresión regular»: «**/» abarca cualquier cantidad de directorios (incluso ninguno),
+    «**» cualquier texto, y «*» y «?» cualquier texto o carácter dentro de un mismo nombre (sin cruzar «/»).
 
-    # Define el directorio raíz como la carpeta padre del script actual.
-    root_dir = os.path.abspath(os.path.join(script_directory, os.pardir))
-    
-    # Imprime un salto de línea para separar el mensaje de inicio.
-    print()
-    
-    # Ejecuta la regeneración/inserción de cabeceras de licencia.
-    regenerate_license_headers(root_dir)
-    
-    # Imprime un salto de línea para separar el mensaje de finalización.
-    print()
+    Argumentos:
+        «glob» (str): Patrón glob.
+
+    Retorna:
+        «str»: Expresión regular equivalente (sin anclas).
+    """
+    glob_tokens = {"**/": "(?:.*/)?", "**": ".*", "*": "[^/]*", "?": "[^/]"}
+    return "".join(glob_tokens.get(token, re.escape(token)) for token in re.split(r"(\*\*/?|\*|\?)", glob) if token)
+
+@lru_cache(maxsize=None)
+def compile_ignore_rules(ignore_rules: Tuple[str, ...]) -> Pattern[str]:
+    """
+    «Compila las reglas de exclusión» en una sola expresión regular, de modo que cada ruta se evalúa contra todas las
+    reglas en una única pasada. Las rutas se expresan relativas al directorio raíz, con separadores «/» y, si son
+    directorios, terminadas en «/». La expresión también coincide con el contenido de los directorios excluidos.
+
+    Sintaxis de las reglas (similar a «.gitignore»):
+        - «nombre» o «*.Designer.cs»: coincide con archivos o directorios de ese nombre en cualquier nivel.
+        - «obj/»: la «/» final limita la regla a directorios.
+        - «Source/Generated/» o «/build»: una «/» al inicio o en medio ancla la regla al directorio raíz.
+        - «re:expresión»: expresión regular que se busca en cualquier parte de la ruta relativa.
+
+    Argumentos:
+        «ignore_rules» (Tuple[str, ...]): Reglas de exclusión.
+
+    Retorna:
+        «Pattern[str]»: Expresión compilada; «match» coincide con las rutas excluidas.
 
-    # Mensaje de confirmación de finalización.
-    print("✅ La regeneración de las «License Header's» en los archivos del código fuente ha finalizado correctamente.")
+    Excepciones:
+        «ValueError»: Si una regla «re:» no es una expresión regular válida.
+    """
+    alternatives = []
+    for ignore_rule in ignore_rules:
+        if ignore_rule.startswith(IGNORE_REGEX_PREFIX):
+            rule_pattern = ignore_rule[len(IGNORE_REGEX_PREFIX):]
+            try:
+                re.compile(rule_pattern)
+            except re.error as pattern_error:
+                raise ValueError(f"La regla de exclusión «{ignore_rule}» no es válida: {pattern_error}") from pattern_error
+            alternatives.append(f".*?(?:{rule_pattern})")
+            continue
+
+        directory_only = ignore_rule.endswith("/")
+        glob = ignore_rule.strip("/")
+        anchored = "/" in ignore_rule.rstrip("/")
+        prefix = "" if anchored else "(?:.*/)?"
+        suffix = "/" if directory_only else "(?:/|\\Z)"
+        alternatives.append(prefix + translate_ignore_glob(glob) + suffix)
+
+    return re.compile("|".join(f"(?:{alternative})" for alternative in alternatives) or "(?!)")
+
+def load_ignore_rules(ignore_file_path: str) -> List[str]:
+    """
+    «Carga las reglas de exclusión» de un archivo (una por línea; se omiten las líneas vacías y las que inician con «#»).
+
+    Argumentos:
+        «ignore_file_path» (str): Ruta del archivo de reglas.
+
+    Retorna:
+        «List[str]»: Reglas del archivo, o una lista vacía si el archivo no existe.
+
+    Excepciones:
+        «OSError»: Si el archivo existe pero no se puede leer.
+    """
+    try:
+        with open(ignore_file_path, "r", encoding="utf-8") as ignore_file:
+            lines = ignore_file.read().splitlines()
+    except FileNotFoundError:
+        return []
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+@dataclass(frozen=True)
+class SourceFileFilter:
+    """
+    «Filtros previos de los archivos fuente», que se aplican antes de abrirlos o decodificarlos.
+
+    Atributos:
+        «root_directory» (str): Directorio raíz respecto del cual se evalúan las reglas de exclusión.
+        «ignore_pattern» (Pattern[str]): Reglas de exclusión compiladas (ver «compile_ignore_rules»).
+        «max_file_size» (int): Tamaño máximo, en bytes, de los archivos a procesar (0 = sin límite).
+        «root_ignore_rules» (Tuple[str, ...]): Reglas del archivo «LICENSE_IGNORE_FILE_NAME» del directorio raíz.
+        «extra_ignore_rules» (Tuple[str, ...]): Reglas adicionales (por ejemplo, las de «--ignore»).
+    """
+    root_directory: str
+    ignore_pattern: Pattern[str]
+    max_file_size: int = DEFAULT_MAX_FILE_SIZE
+    root_ignore_rules: Tuple[str, ...] = ()
+    extra_ignore_rules: Tuple[str, ...] = ()
+
+    def get_relative_prefix(self, directory_path: str) -> str:
+        """«Prefijo relativo de las entradas de un directorio»: su ruta relativa al directorio raíz terminada en «/» («» para la raíz)."""
+        relative_directory = get_cache_key(directory_path, self.root_directory)
+        return "" if relative_directory == "." else f"{relative_directory}/"
+
+    def is_ignored(self, relative_path: str, is_directory: bool = False) -> bool:
+        """«Determina si una ruta está excluida» («relative_path» es relativa al directorio raíz, con separadores «/»)."""
+        return self.ignore_pattern.match(f"{relative_path}/" if is_directory else relative_path) is not None
+
+def create_source_file_filter(
+    root_directory: str,
+    ignore_rules: Optional[List[str]] = None,
+    max_file_size: int = DEFAULT_MAX_FILE_SIZE
+) -> SourceFileFilter:
+    """
+    «Crea los filtros previos de un árbol»: las reglas de exclusión por defecto («DEFAULT_IGNORE_RULES»), las del archivo
+    «LICENSE_IGNORE_FILE_NAME» del directorio raíz (si existe) y las indicadas en «ignore_rules», compiladas una sola vez.
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz.
+        «ignore_rules» (Optional[List[str]]): Reglas de exclusión adicionales.
+        «max_file_size» (int): Tamaño máximo, en bytes, de los archivos a procesar (0 = sin límite).
+
+    Retorna:
+        «SourceFileFilter»: Filtros del árbol.
+
+    Excepciones:
+        «ValueError»: Si alguna regla no es válida.
+        «OSError»: Si el archivo de reglas del directorio raíz existe pero no se puede leer.
+    """
+    root_ignore_rules = tuple(load_ignore_rules(os.path.join(root_directory, LICENSE_IGNORE_FILE_NAME)))
+    extra_ignore_rules = tuple(ignore_rules or [])
+    ignore_pattern = compile_ignore_rules((*DEFAULT_IGNORE_RULES, *root_ignore_rules, *extra_ignore_rules))
+    return SourceFileFilter(root_directory, ignore_pattern, max_file_size, root_ignore_rules, extra_ignore_rules)
+
+def describe_source_file_filter(source_filter: SourceFileFilter) -> str:
+    """
+    «Describe los filtros previos vigentes» en una línea para la consola: las reglas de exclusión por defecto, las del
+    archivo «LICENSE_IGNORE_FILE_NAME» y las adicionales, y el tamaño máximo de los archivos.
+
+    Argumentos:
+        «source_filter» (SourceFileFilter): Filtros previos.
+
+    Retorna:
+        «str»: Descripción de los filtros.
+    """
+    rule_groups = [(DEFAULT_IGNORE_RULES, "por defecto"), (source_filter.root_ignore_rules, f"de «{LICENSE_IGNORE_FILE_NAME}»"), (source_filter.extra_ignore_rules, "de «--ignore»")]
+    rules_text = "; ".join(f"{', '.join(f'«{rule}»' for rule in rules)} ({origin})" for rules, origin in rule_groups if rules)
+    if source_filter.max_file_size > 0:
+        size_text = f"se omiten los archivos de más de {format_byte_count(source_filter.max_file_size)} («--max-size»)"
+    else:
+        size_text = "sin límite de tamaño de los archivos"
+    return f"🚫 Exclusiones: {rules_text}; {size_text}."
+
+def sniff_source_block(data: bytes, at_eof: bool) -> Optional[str]:
+    """
+    «Inspecciona el bloque inicial de un archivo» para descartar, antes de analizarlo, los archivos binarios
+    y los que no están codificados en UTF-8.
+
+    Argumentos:
+        «data» (bytes): Bloque inicial del archivo.
+        «at_eof» (bool): True si el bloque contiene el archivo completo (si no, se admite un carácter cortado al final).
+
+    Retorna:
+        «Optional[str]»: Motivo para omitir el archivo, o None si puede analizarse.
+    """
+    if b"\0" in data:
+        return "contiene bytes nulos (es binario o está codificado en UTF-16 o UTF-32)"
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(data, final=at_eof)
+    except UnicodeDecodeError:
+        return "no está codificado en UTF-8"
+    return None
+
+def is_candidate_source_file(relative_file_path: str, source_filter: SourceFileFilter) -> bool:
+    """
+    «Determina si un archivo debe procesarse» según su extensión y las reglas de exclusión (del archivo y de los directorios que lo contienen).
+
+    Argumentos:
+        «relative_file_path» (str): Ruta del archivo relativa al directorio raíz.
+        «source_filter» (SourceFileFilter): Filtros previos del árbol.
+
+    Retorna:
+        «bool»: True si su extensión está definida en «LICENSE_HEADERS» y ninguna regla de exclusión lo alcanza.
+    """
+    relative_file_path = os.path.normpath(relative_file_path).replace(os.sep, "/")
+    if os.path.splitext(relative_file_path)[1].lower() not in LICENSE_HEADERS:
+        return False
+    return not source_filter.is_ignored(relative_file_path)
+
+def walk_source_files(
+    root_directory: str,
+    directory_mtimes: Optional[Dict[str, int]] = None,
+    source_filter: Optional[SourceFileFilter] = None
+) -> List[str]:
+    """
+    «Descubre los archivos fuente» recorriendo recursivamente «root_directory» con «os.walk».
+    El recorrido se realiza en orden alfabético para que el resultado sea determinista.
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz desde donde se inicia la búsqueda recursiva.
+        «directory_mtimes» (Optional[Dict[str, int]]): Si se indica, registra en él el «mtime» de cada directorio recorrido.
+        «source_filter» (Optional[SourceFileFilter]): Filtros previos; si es None, los de «root_directory» (ver «create_source_file_filter»).
+
+    Retorna:
+        «List[str]»: Rutas completas de los archivos con extensiones definidas en «LICENSE_HEADERS» no excluidos.
+    """
+    source_filter = source_filter or create_source_file_filter(root_directory)
+    source_files = []
+
+    # Recorre recursivamente el directorio raíz.
+    for current_dir, subdirs, files in os.walk(root_directory):
+        relative_prefix = source_filter.get_relative_prefix(current_dir)
+
+        # Excluye directorios irrelevantes y ordena el resto para un recorrido determinista.
+        subdirs[:] = sorted(d for d in subdirs if not source_filter.is_ignored(relative_prefix + d, is_directory=True))
+
+        if directory_mtimes is not None:
+            try:
+                directory_mtimes[current_dir] = os.stat(current_dir).st_mtime_ns
+            except OSError:
+                directory_mtimes[current_dir] = -1  # Se reconstruirá el índice en la próxima consulta.
+
+        for file_name in sorted(files):
+            file_extension = os.path.splitext(file_name)[1].lower()
+            # Procesa solo archivos con extensiones definidas en «LICENSE_HEADERS» que no estén excluidos.
+            if file_extension in LICENSE_HEADERS and not source_filter.is_ignored(relative_prefix + file_name):
+                source_files.append(os.path.join(current_dir, file_name))
+
+    return source_files
+
+def run_git(root_directory: str, *git_arguments: str) -> List[str]:
+    """
+    «Ejecuta un comando de git» en «root_directory» y retorna las rutas que imprime (separadas por «NUL»).
+
+    Argumentos:
+        «root_directory» (str): Directorio donde se ejecuta git.
+        «git_arguments» (str): Argumentos del comando (deben incluir «-z»).
+
+    Retorna:
+        «List[str]»: Rutas impresas por el comando.
+
+    Excepciones:
+        «RuntimeError»: Si git termina con error (por ejemplo, una referencia inexistente).
+    """
+    completed = subprocess.run(["git", "-C", root_directory, *git_arguments], capture_output=True)
+    if completed.returncode != 0:
+        error_message = completed.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"Falló «git {' '.join(git_arguments)}»: {error_message}")
+    return [path for path in completed.stdout.decode("utf-8", errors="surrogateescape").split("\0") if path]
+
+def is_git_repository(root_directory: str) -> bool:
+    """
+    «Verifica si el directorio está dentro de un repositorio git» (y si git está disponible).
+
+    Argumentos:
+        «root_directory» (str): Directorio a verificar.
+
+    Retorna:
+        «bool»: True si git está instalado y «root_directory» pertenece a un árbol de trabajo.
+    """
+    try:
+        completed = subprocess.run(["git", "-C", root_directory, "rev-parse", "--is-inside-work-tree"], capture_output=True)
+    except OSError:
+        return False
+    return completed.returncode == 0 and completed.stdout.strip() == b"true"
+
+def list_git_source_files(root_directory: str, changed_since: Optional[str] = None, source_filter: Optional[SourceFileFilter] = None) -> List[str]:
+    """
+    «Descubre los archivos fuente a partir del índice de git», sin recorrer el árbol de directorios.
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz (debe pertenecer a un repositorio git).
+        «changed_since» (Optional[str]): Referencia de git («HEAD», «origin/main», un «commit»...). Si se indica,
+            solo se consideran los archivos agregados, copiados, modificados o renombrados respecto de ella
+            (incluidos los cambios sin confirmar) y los archivos nuevos aún no rastreados (que no estén ignorados).
+            Si es None, se consideran todos los archivos rastreados.
+        «source_filter» (Optional[SourceFileFilter]): Filtros previos; si es None, los de «root_directory».
+
+    Retorna:
+        «List[str]»: Rutas completas de los archivos, ordenadas alfabéticamente.
+    """
+    source_filter = source_filter or create_source_file_filter(root_directory)
+    if changed_since is None:
+        relative_paths = run_git(root_directory, "ls-files", "-z")
+    else:
+        relative_paths = run_git(root_directory, "diff", "--name-only", "--relative", "--diff-filter=ACMR", "-z", changed_since, "--")
+        relative_paths += run_git(root_directory, "ls-files", "-z", "--others", "--exclude-standard")
+
+    source_files = set()
+    for relative_path in relative_paths:
+        full_file_path = os.path.join(root_directory, os.path.normpath(relative_path))
+        # Omite los archivos eliminados del árbol de trabajo que aún figuran en el índice.
+        if is_candidate_source_file(relative_path, source_filter) and os.path.isfile(full_file_path):
+            source_files.add(full_file_path)
+
+    return sorted(source_files)
+
+def discover_source_files(
+    root_directory: str,
+    git_tracked: bool = False,
+    changed_since: Optional[str] = None,
+    source_filter: Optional[SourceFileFilter] = None
+) -> List[str]:
+    """
+    «Descubre los archivos fuente» a procesar bajo «root_directory».
+    Si se solicita el descubrimiento mediante git pero «root_directory» no pertenece a un repositorio,
+    se recurre al recorrido completo con «os.walk».
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz desde donde se inicia la búsqueda.
+        «git_tracked» (bool): True para considerar solo los archivos rastreados por git.
+        «changed_since» (Optional[str]): Referencia de git; si se indica, solo se consideran los archivos cambiados respecto de ella.
+        «source_filter» (Optional[SourceFileFilter]): Filtros previos; si es None, los de «root_directory».
+
+    Retorna:
+        «List[str]»: Rutas completas de los archivos con extensiones definidas en «LICENSE_HEADERS» no excluidos.
+    """
+    if git_tracked or changed_since is not None:
+        if is_git_repository(root_directory):
+            return list_git_source_files(root_directory, changed_since, source_filter)
+        warnings.warn("No se encontró un repositorio git; se recorrerá el directorio completo.", LicenseHeaderWarning, stacklevel=2)
+
+    return walk_source_files(root_directory, source_filter=source_filter)
+
+def resolve_source_file_paths(paths: List[str], root_directory: str, source_filter: Optional[SourceFileFilter] = None) -> List[str]:
+    """
+    «Resuelve las rutas indicadas explícitamente» (por ejemplo, por un «hook» de «pre-commit» o un editor) a los archivos
+    fuente a procesar: los directorios se recorren con «walk_source_files» y se descartan los archivos que no existen o no
+    son candidatos (ver «is_candidate_source_file»). Se conserva el orden indicado, sin repetir archivos.
+
+    Argumentos:
+        «paths» (List[str]): Rutas de archivos o directorios, absolutas o relativas al directorio actual.
+        «root_directory» (str): Directorio raíz.
+        «source_filter» (Optional[SourceFileFilter]): Filtros previos; si es None, los de «root_directory».
+
+    Retorna:
+        «List[str]»: Rutas completas de los archivos fuente.
+    """
+    source_filter = source_filter or create_source_file_filter(root_directory)
+    source_files = []
+    for path in paths:
+        full_path = os.path.abspath(path)
+        if os.path.isdir(full_path):
+            if not source_filter.is_ignored(get_cache_key(full_path, root_directory), is_directory=True):
+                source_files.extend(walk_source_files(full_path, source_filter=source_filter))
+        elif os.path.isfile(full_path) and is_candidate_source_file(os.path.relpath(full_path, root_directory), source_filter):
+            source_files.append(full_path)
+    return list(dict.fromkeys(source_files))
+
+def get_cache_key(full_file_path: str, root_directory: str) -> str:
+    """
+    «Obtiene la clave del manifiesto incremental» para un archivo: su ruta relativa con separadores «/».
+
+    Argumentos:
+        «full_file_path» (str): Ruta completa del archivo.
+        «root_directory» (str): Directorio raíz.
+
+    Retorna:
+        «str»: Clave portable del archivo.
+    """
+    return os.path.relpath(full_file_path, root_directory).replace(os.sep, "/")
+
+def get_shard_number(full_file_path: str, root_directory: str, shard_count: int) -> int:
+    """
+    «Obtiene la partición a la que pertenece un archivo» a partir del hash de su ruta relativa.
+    El resultado no depende del orden del descubrimiento, del sistema operativo ni de la ejecución, de modo que
+    todos los nodos de CI reparten los mismos archivos de la misma forma.
+
+    Argumentos:
+        «full_file_path» (str): Ruta completa del archivo.
+        «root_directory» (str): Directorio raíz.
+        «shard_count» (int): Cantidad total de particiones.
+
+    Retorna:
+        «int»: Número de partición, entre 1 y «shard_count».
+    """
+    path_digest = hashlib.sha1(get_cache_key(full_file_path, root_directory).encode("utf-8")).digest()
+    return int.from_bytes(path_digest[:8], "big") % shard_count + 1
+
+def select_shard_files(source_files: List[str], root_directory: str, shard: Tuple[int, int]) -> List[str]:
+    """
+    «Selecciona los archivos de una partición» («--shard K/N»), conservando el orden del descubrimiento.
+
+    Argumentos:
+        «source_files» (List[str]): Rutas completas de los archivos descubiertos.
+        «root_directory» (str): Directorio raíz.
+        «shard» (Tuple[int, int]): Número de la partición (desde 1) y cantidad total de particiones.
+
+    Retorna:
+        «List[str]»: Rutas completas de los archivos que pertenecen a la partición.
+    """
+    shard_number, shard_count = shard
+    return [full_file_path for full_file_path in source_files if get_shard_number(full_file_path, root_directory, shard_count) == shard_number]
+
+def is_cache_entry_valid(cache_entry: Optional[Dict[str, Any]], file_stat: os.stat_result, header_fingerprint: str) -> bool:
+    """
+    «Verifica si una entrada del manifiesto sigue siendo válida» comparando el «stat» actual del archivo
+    y la huella de la cabecera con la que fue verificado.
+
+    Argumentos:
+        «cache_entry» (Optional[Dict[str, Any]]): Entrada registrada en el manifiesto (o None).
+        «file_stat» (os.stat_result): Resultado de «os.stat» del archivo.
+        «header_fingerprint» (str): Huella de la cabecera vigente para la extensión del archivo.
+
+    Retorna:
+        «bool»: True si el archivo no ha cambiado desde que se verificó su cabecera.
+    """
+    return (
+        cache_entry is not None and
+        cache_entry["mtime_ns"] == file_stat.st_mtime_ns and
+        cache_entry["size"] == file_stat.st_size and
+        cache_entry["header_fingerprint"] == header_fingerprint
+    )
+
+def load_license_cache(cache_file_path: str, source_filter: Optional[SourceFileFilter] = None) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    «Carga el manifiesto incremental» desde disco.
+    Si el archivo no existe, está dañado o fue generado con otra configuración de licencia
+    («get_license_fingerprint» distinta), se descarta por completo. Los registros de los directorios se descartan también
+    si fueron generados con otros filtros previos (sus listados dependen de las reglas de exclusión).
+
+    Argumentos:
+        «cache_file_path» (str): Ruta del manifiesto.
+        «source_filter» (Optional[SourceFileFilter]): Filtros previos del recorrido actual, o None para descartar
+            los registros de los directorios.
+
+    Retorna:
+        «Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]»: Entradas de los archivos y registros de los directorios
+            recorridos (ver «create_directory_record»), ambos indexados por ruta relativa.
+    """
+    try:
+        with open(cache_file_path, "r", encoding="utf-8") as cache_file:
+            manifest = json.load(cache_file)
+    except (OSError, ValueError):
+        return {}, {}
+
+    if not isinstance(manifest, dict) or manifest.get("version") != LICENSE_CACHE_VERSION or manifest.get("license_fingerprint") != get_license_fingerprint():
+        return {}, {}
+
+    if source_filter is None or manifest.get("filter") != get_filter_signature(source_filter):
+        return manifest.get("files", {}), {}
+    return manifest.get("files", {}), manifest.get("directories", {})
+
+def save_license_cache(
+    cache_file_path: str,
+    cache_entries: Dict[str, Dict[str, Any]],
+    directory_records: Optional[Dict[str, Dict[str, Any]]] = None,
+    source_filter: Optional[SourceFileFilter] = None
+) -> None:
+    """
+    «Guarda el manifiesto incremental» en disco de forma atómica (archivo temporal + «os.replace»).
+
+    Argumentos:
+        «cache_file_path» (str): Ruta del manifiesto.
+        «cache_entries» (Dict[str, Dict[str, Any]]): Entradas a guardar, indexadas por ruta relativa.
+        «directory_records» (Optional[Dict[str, Dict[str, Any]]]): Registros de los directorios recorridos, indexados por ruta relativa.
+        «source_filter» (Optional[SourceFileFilter]): Filtros previos con los que se recorrieron esos directorios.
+    """
+    manifest = {
+        "version": LICENSE_CACHE_VERSION,
+        "license_fingerprint": get_license_fingerprint(),
+        "filter": get_filter_signature(source_filter) if source_filter is not None else None,
+        "files": dict(sorted(cache_entries.items())),
+        "directories": dict(sorted((directory_records or {}).items()))
+    }
+    temporary_path = f"{cache_file_path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as cache_file:
+        json.dump(manifest, cache_file, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temporary_path, cache_file_path)
+
+def create_cache_entry(file_stat: os.stat_result, inspected_prefix: bytes, license_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    «Crea la entrada del manifiesto incremental» de un archivo cuya cabecera quedó verificada.
+
+    Argumentos:
+        «file_stat» (os.stat_result): Resultado de «os.stat» tomado antes de leer el archivo.
+        «inspected_prefix» (bytes): Prefijo del archivo del que depende el estado de su cabecera.
+        «license_config» (Dict[str, Any]): Configuración de la licencia con la que fue verificado.
+
+    Retorna:
+        «Dict[str, Any]»: Entrada con el «mtime», tamaño, hash del prefijo y huella de la cabecera.
+    """
+    return {
+        "mtime_ns": file_stat.st_mtime_ns,
+        "size": file_stat.st_size,
+        "hash": hashlib.sha256(inspected_prefix).hexdigest(),
+        "header_fingerprint": license_config["fingerprint"]
+    }
+
+@dataclass
+class DirectoryScan:
+    """
+    «Recorrido de un directorio» con su huella tipo Merkle, calculada a partir del «mtime» y el tamaño de sus archivos
+    fuente, la huella de cabecera de cada uno y las huellas de sus subdirectorios.
+
+    Atributos:
+        «relative_path» (str): Ruta del directorio relativa al directorio raíz, con separador «/» («.» para la raíz).
+        «mtime_ns» (Optional[int]): «mtime» del directorio (None si no se pudo obtener).
+        «digest» (str): Huella del directorio y de todo su subárbol.
+        «is_pruned» (bool): True si la huella coincide con la registrada en el manifiesto (el subárbol no cambió desde
+            que se verificó).
+        «file_names» (List[str]): Nombres de los archivos fuente del directorio, en orden alfabético.
+        «file_paths» (List[str]): Rutas completas de esos archivos.
+        «file_keys» (List[str]): Claves del manifiesto de esos archivos (ver «get_cache_key»).
+        «file_states» (List[Optional[Tuple[int, int]]]): «mtime» y tamaño de esos archivos (None si no se pudo obtener).
+        «subdirectories» (List[DirectoryScan]): Subdirectorios recorridos, en orden alfabético.
+    """
+    relative_path: str
+    mtime_ns: Optional[int]
+    digest: str
+    is_pruned: bool
+    file_names: List[str]
+    file_paths: List[str]
+    file_keys: List[str]
+    file_states: List[Optional[Tuple[int, int]]]
+    subdirectories: List["DirectoryScan"]
+
+def get_filter_signature(source_filter: SourceFileFilter) -> str:
+    """
+    «Obtiene la firma de los filtros previos»: las reglas de exclusión compiladas y el tamaño máximo de los archivos.
+    Los registros de los directorios del manifiesto solo se reutilizan con la misma firma.
+
+    Argumentos:
+        «source_filter» (SourceFileFilter): Filtros previos.
+
+    Retorna:
+        «str»: Firma de los filtros.
+    """
+    return f"{source_filter.max_file_size}\0{source_filter.ignore_pattern.pattern}"
+
+def compute_directory_digest(
+    file_names: List[str],
+    file_states: List[Optional[Tuple[int, int]]],
+    subdirectory_records: List[Tuple[str, str]]
+) -> str:
+    """
+    «Calcula la huella de un directorio» a partir de sus archivos y de las huellas de sus subdirectorios.
+
+    Argumentos:
+        «file_names» (List[str]): Nombres de los archivos fuente, en orden alfabético.
+        «file_states» (List[Optional[Tuple[int, int]]]): Estado («mtime» y tamaño) de cada archivo.
+        «subdirectory_records» (List[Tuple[str, str]]): Nombre y huella de cada subdirectorio, en orden alfabético.
+
+    Retorna:
+        «str»: Huella SHA-256 (hexadecimal) del directorio.
+    """
+    directory_hash = hashlib.sha256()
+    for file_name, file_state in zip(file_names, file_states):
+        # Los nombres de los archivos fuente siempre tienen una extensión registrada en «LICENSE_HEADERS».
+        header_fingerprint = LICENSE_HEADERS[file_name[file_name.rfind("."):].lower()]["fingerprint"]
+        directory_hash.update(f"f\0{file_name}\0{file_state}\0{header_fingerprint}\n".encode("utf-8", "surrogateescape"))
+    for subdirectory_name, subdirectory_digest in subdirectory_records:
+        directory_hash.update(f"d\0{subdirectory_name}\0{subdirectory_digest}\n".encode("utf-8", "surrogateescape"))
+    return directory_hash.hexdigest()
+
+def list_scanned_directory(directory_path: str, relative_prefix: str, source_filter: SourceFileFilter) -> Tuple[List[str], List[str]]:
+    """
+    «Lista un directorio del recorrido incremental» con «os.scandir»: sus archivos fuente y sus subdirectorios no excluidos.
+
+    Argumentos:
+        «directory_path» (str): Directorio a listar.
+        «relative_prefix» (str): Ruta relativa del directorio terminada en «/» («» para la raíz).
+        «source_filter» (SourceFileFilter): Filtros previos.
+
+    Retorna:
+        «Tuple[List[str], List[str]]»: Nombres de los archivos fuente y de los subdirectorios, en orden alfabético.
+    """
+    file_names = []
+    subdirectory_names = []
+    with os.scandir(directory_path) as directory_entries:
+        for entry in directory_entries:
+            try:
+                is_directory = entry.is_dir()
+            except OSError:
+                is_directory = False
+            if is_directory:
+                # Igual que «os.walk», no desciende por enlaces simbólicos a directorios.
+                if not source_filter.is_ignored(relative_prefix + entry.name, is_directory=True) and not entry.is_symlink():
+                    subdirectory_names.append(entry.name)
+            elif os.path.splitext(entry.name)[1].lower() in LICENSE_HEADERS and not source_filter.is_ignored(relative_prefix + entry.name):
+                file_names.append(entry.name)
+    return sorted(file_names), sorted(subdirectory_names)
+
+def scan_source_tree(
+    directory_path: str,
+    source_filter: SourceFileFilter,
+    directory_records: Dict[str, Dict[str, Any]],
+    relative_path: str = "."
+) -> DirectoryScan:
+    """
+    «Recorre un árbol de directorios» y calcula la huella de cada directorio, de abajo hacia arriba.
+    Los archivos no se abren: solo se consulta su «stat». Un directorio cuyo «mtime» coincide con el registrado en el
+    manifiesto no se vuelve a listar (su «mtime» cambia al crear, eliminar o renombrar sus entradas), sino que se
+    reutiliza su listado filtrado. Las rutas relativas se construyen concatenando los nombres desde el directorio raíz.
+    El orden de los archivos coincide con el de «walk_source_files».
+
+    Argumentos:
+        «directory_path» (str): Directorio a recorrer (el directorio raíz en la llamada inicial).
+        «source_filter» (SourceFileFilter): Filtros previos (los registros deben provenir de la misma firma de filtros).
+        «directory_records» (Dict[str, Dict[str, Any]]): Registros de los directorios del manifiesto, indexados por ruta relativa.
+        «relative_path» (str): Ruta del directorio relativa al directorio raíz, con separador «/» («.» para la raíz).
+
+    Retorna:
+        «DirectoryScan»: Recorrido del directorio y de su subárbol.
+    """
+    relative_prefix = "" if relative_path == "." else f"{relative_path}/"
+    path_prefix = directory_path if directory_path.endswith(os.sep) else directory_path + os.sep
+    directory_record = directory_records.get(relative_path)
+    try:
+        mtime_ns = os.stat(directory_path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+
+    if directory_record is not None and mtime_ns is not None and directory_record["mtime_ns"] == mtime_ns:
+        file_names, subdirectory_names = directory_record["files"], directory_record["subdirectories"]
+    else:
+        file_names, subdirectory_names = list_scanned_directory(directory_path, relative_prefix, source_filter)
+
+    file_paths = [path_prefix + file_name for file_name in file_names]
+    file_states = []
+    for full_file_path in file_paths:
+        try:
+            file_stat = os.stat(full_file_path)
+            file_states.append((file_stat.st_mtime_ns, file_stat.st_size))
+        except OSError:
+            file_states.append(None)  # El error se informará al intentar leer el archivo.
+
+    subdirectories = [
+        scan_source_tree(path_prefix + subdirectory_name, source_filter, directory_records, relative_prefix + subdirectory_name)
+        for subdirectory_name in subdirectory_names
+    ]
+    digest = compute_directory_digest(file_names, file_states, [(subdirectory_name, subdirectory.digest) for subdirectory_name, subdirectory in zip(subdirectory_names, subdirectories)])
+
+    return DirectoryScan(
+        relative_path,
+        mtime_ns,
+        digest,
+        directory_record is not None and directory_record.get("digest") == digest,
+        file_names,
+        file_paths,
+        [relative_prefix + file_name for file_name in file_names],
+        file_states,
+        subdirectories
+    )
+
+def collect_unpruned_source_files(directory_scan: DirectoryScan, source_files: List[str], pruned_scans: List[DirectoryScan]) -> None:
+    """
+    «Separa los archivos a procesar de los subárboles sin cambios».
+    Un subárbol se poda completo cuando su huella coincide con la registrada en el manifiesto, es decir, cuando todos sus
+    archivos conservan el «mtime», el tamaño y la huella de cabecera con los que fueron verificados como actualizados.
+
+    Argumentos:
+        «directory_scan» (DirectoryScan): Recorrido del directorio.
+        «source_files» (List[str]): Lista donde se agregan, en orden, los archivos que deben procesarse.
+        «pruned_scans» (List[DirectoryScan]): Lista donde se agregan las raíces de los subárboles podados.
+    """
+    if directory_scan.is_pruned:
+        pruned_scans.append(directory_scan)
+        return
+
+    source_files.extend(directory_scan.file_paths)
+    for subdirectory in directory_scan.subdirectories:
+        collect_unpruned_source_files(subdirectory, source_files, pruned_scans)
+
+def iter_pruned_results(pruned_scans: List[DirectoryScan], license_cache: Dict[str, Dict[str, Any]]) -> Iterator[FileProcessingResult]:
+    """
+    «Entrega los resultados de los archivos de los subárboles podados» a medida que se consumen, sin abrir los archivos:
+    su cabecera sigue verificada como actualizada y su entrada del manifiesto no cambia.
+
+    Argumentos:
+        «pruned_scans» (List[DirectoryScan]): Raíces de los subárboles podados (ver «collect_unpruned_source_files»).
+        «license_cache» (Dict[str, Dict[str, Any]]): Entradas del manifiesto incremental.
+
+    Retorna:
+        «Iterator[FileProcessingResult]»: Resultado de cada archivo podado.
+    """
+    pending_scans = list(reversed(pruned_scans))
+    while pending_scans:
+        pruned_scan = pending_scans.pop()
+        for full_file_path, file_key in zip(pruned_scan.file_paths, pruned_scan.file_keys):
+            relative_file_path = f"...{os.sep}{file_key.replace('/', os.sep)}"
+            yield FileProcessingResult(full_file_path, relative_file_path, STATUS_CURRENT, cache_entry=license_cache[file_key], file_key=file_key)
+        pending_scans.extend(reversed(pruned_scan.subdirectories))
+
+def create_directory_record(directory_scan: DirectoryScan, is_verified: bool, scan_start_ns: int) -> Dict[str, Any]:
+    """
+    «Crea el registro de un directorio recorrido» para el manifiesto: su «mtime», su listado filtrado y, si está verificado,
+    su huella. El «mtime» no se registra si es demasiado reciente (posterior a «scan_start_ns» menos
+    «DIRECTORY_MTIME_GRANULARITY_NS»), porque un cambio en el mismo instante podría no modificarlo.
+
+    Argumentos:
+        «directory_scan» (DirectoryScan): Recorrido del directorio.
+        «is_verified» (bool): True si el directorio y todo su subárbol quedaron verificados.
+        «scan_start_ns» (int): Instante (en nanosegundos desde la época) en que comenzó el recorrido.
+
+    Retorna:
+        «Dict[str, Any]»: Registro del directorio.
+    """
+    mtime_ns = directory_scan.mtime_ns
+    if mtime_ns is not None and mtime_ns > scan_start_ns - DIRECTORY_MTIME_GRANULARITY_NS:
+        mtime_ns = None
+    return {
+        "mtime_ns": mtime_ns,
+        "files": directory_scan.file_names,
+        "subdirectories": [os.path.basename(subdirectory.relative_path) for subdirectory in directory_scan.subdirectories],
+        "digest": directory_scan.digest if is_verified else None
+    }
+
+def collect_directory_records(
+    directory_scan: DirectoryScan,
+    cache_entries: Dict[str, Dict[str, Any]],
+    scan_start_ns: int,
+    directory_records: Dict[str, Dict[str, Any]]
+) -> bool:
+    """
+    «Registra los directorios recorridos» para el manifiesto, con la huella de los verificados: aquellos cuyos archivos tienen,
+    todos, una entrada en el manifiesto con el mismo «mtime», tamaño y huella de cabecera observados en el recorrido
+    (y cuyos subdirectorios también están verificados). Los archivos de los subárboles podados no se vuelven a comparar.
+
+    Argumentos:
+        «directory_scan» (DirectoryScan): Recorrido del directorio.
+        «cache_entries» (Dict[str, Dict[str, Any]]): Entradas del manifiesto que se guardarán.
+        «scan_start_ns» (int): Instante (en nanosegundos desde la época) en que comenzó el recorrido.
+        «directory_records» (Dict[str, Dict[str, Any]]): Diccionario donde se registran los directorios.
+
+    Retorna:
+        «bool»: True si el directorio y todo su subárbol quedaron verificados.
+    """
+    is_verified = True
+    for subdirectory in directory_scan.subdirectories:
+        is_verified = collect_directory_records(subdirectory, cache_entries, scan_start_ns, directory_records) and is_verified
+
+    if is_verified and not directory_scan.is_pruned:
+        for file_name, file_key, file_state in zip(directory_scan.file_names, directory_scan.file_keys, directory_scan.file_states):
+            cache_entry = cache_entries.get(file_key)
+            if (
+                cache_entry is None or file_state is None or
+                (cache_entry["mtime_ns"], cache_entry["size"]) != file_state or
+                cache_entry["header_fingerprint"] != LICENSE_HEADERS[file_name[file_name.rfind("."):].lower()]["fingerprint"]
+            ):
+                is_verified = False
+                break
+
+    directory_records[directory_scan.relative_path] = create_directory_record(directory_scan, is_verified, scan_start_ns)
+    return is_verified
+
+def process_source_file(
+    full_file_path: str,
+    root_directory: str,
+    cache_entry: Optional[Dict[str, Any]] = None,
+    check_only: bool = False,
+    defer_write: bool = False,
+    with_diff: bool = False,
+    max_file_size: int = DEFAULT_MAX_FILE_SIZE
+) -> FileProcessingResult:
+    """
+    «Procesa un archivo fuente»: inserta la cabecera si no está presente o la reemplaza si está desactualizada.
+    En modo de verificación («check_only») solo informa el estado del archivo, sin abrirlo nunca para escritura.
+    No imprime nada; los mensajes se acumulan en el resultado para que puedan mostrarse en orden,
+    incluso cuando el archivo se procesa en otro proceso.
+
+    Si se entrega la entrada previa del manifiesto incremental y el contenido del archivo conserva el mismo hash
+    (por ejemplo, solo cambió su fecha de modificación), se da por actualizado sin volver a analizarlo.
+
+    Los archivos que superan «max_file_size» se omiten sin abrirlos, y los binarios o no codificados en UTF-8
+    (ver «sniff_source_block») se omiten tras leer solo su bloque inicial.
+
+    Argumentos:
+        «full_file_path» (str): Ruta completa del archivo a procesar.
+        «root_directory» (str): Directorio raíz (se utiliza para construir la ruta relativa).
+        «cache_entry» (Optional[Dict[str, Any]]): Entrada previa del manifiesto incremental para el archivo, si existe.
+        «check_only» (bool): True para solo verificar la cabecera, sin modificar el archivo.
+        «defer_write» (bool): True para no reescribir el archivo y retornar el plan de reescritura en el resultado.
+        «with_diff» (bool): True para adjuntar al resultado el diff de la región de la cabecera (ver «format_header_diff»).
+        «max_file_size» (int): Tamaño máximo, en bytes, de los archivos a procesar (0 = sin límite).
+
+    Retorna:
+        «FileProcessingResult»: Estado del archivo y mensajes generados.
+    """
+    relative_path = os.path.relpath(full_file_path, root_directory)
+    relative_file_path = f"...{os.sep}{relative_path}"
+    file_key = relative_path.replace(os.sep, "/")
+    file_extension = os.path.splitext(full_file_path)[1].lower()
+
+    # Obtiene la configuración de la licencia según la extensión del archivo.
+    license_config = LICENSE_HEADERS[file_extension]
+    header_marker = license_config["marker"]
+    new_license_header = license_config["header"]
+    expected_header = license_config["stripped_header"]
+
+    # Tiempos y bytes leídos del archivo, que se adjuntan a su resultado.
+    phase_seconds = {PHASE_READ: 0.0, PHASE_PARSE: 0.0, PHASE_COMPARE: 0.0}
+    bytes_read = 0
+
+    # Intenta leer y analizar solo el prefijo del archivo que contiene la cabecera.
+    # El «stat» se toma antes de la lectura: si el archivo cambia mientras se lee, la entrada quedará obsoleta y se volverá a verificar.
+    try:
+        phase_start = time.perf_counter()
+        file_stat = os.stat(full_file_path)
+        if 0 < max_file_size < file_stat.st_size:
+            skip_message = f"⏭️  Se omitió «{relative_file_path}»: su tamaño ({format_byte_count(file_stat.st_size)}) supera el máximo ({format_byte_count(max_file_size)})."
+            return FileProcessingResult(full_file_path, relative_file_path, STATUS_SKIPPED, messages=[skip_message], phase_seconds=phase_seconds)
+        with open(full_file_path, "rb") as source_file:
+            data = source_file.read(HEADER_PREFIX_SIZE)
+            bytes_read = len(data)
+            phase_end = time.perf_counter()
+            phase_seconds[PHASE_READ] = phase_end - phase_start
+
+            # Vía rápida: confirma la cabecera actualizada comparando bytes, sin decodificar el archivo.
+            code_start = find_current_header_end(data, license_config, len(data) < HEADER_PREFIX_SIZE)
+            phase_start, phase_end = phase_end, time.perf_counter()
+            phase_seconds[PHASE_COMPARE] = phase_end - phase_start
+            if code_start is not None:
+                new_cache_entry = create_cache_entry(file_stat, data[:code_start], license_config)
+                return FileProcessingResult(full_file_path, relative_file_path, STATUS_CURRENT, cache_entry=new_cache_entry, phase_seconds=phase_seconds, bytes_read=bytes_read, file_key=file_key)
+
+            # Descarta los archivos binarios o con otra codificación antes de analizarlos.
+            skip_reason = sniff_source_block(data, len(data) < HEADER_PREFIX_SIZE)
+            if skip_reason is not None:
+                return FileProcessingResult(full_file_path, relative_file_path, STATUS_SKIPPED, messages=[f"⏭️  Se omitió «{relative_file_path}»: {skip_reason}."], phase_seconds=phase_seconds, bytes_read=bytes_read)
+
+            header_prefix = read_header_prefix(source_file, header_marker, license_config["comment_prefixes"], data)
+            bytes_read = source_file.tell()
+            phase_start, phase_end = phase_end, time.perf_counter()
+            phase_seconds[PHASE_PARSE] = phase_end - phase_start
+    except Exception as read_error:
+        return FileProcessingResult(full_file_path, relative_file_path, STATUS_ERROR, messages=[f"❌ No se pudo leer {relative_file_path}: {read_error}"], phase_seconds=phase_seconds, bytes_read=bytes_read)
+
+    new_cache_entry = create_cache_entry(file_stat, header_prefix.data, license_config)
+
+    # Si el prefijo es idéntico al ya verificado con la misma cabecera, no es necesario analizarlo.
+    if (
+        cache_entry is not None and
+        cache_entry["size"] == file_stat.st_size and
+        cache_entry["hash"] == new_cache_entry["hash"] and
+        cache_entry["header_fingerprint"] == license_config["fingerprint"]
+    ):
+        return FileProcessingResult(full_file_path, relative_file_path, STATUS_CURRENT, cache_entry=new_cache_entry, phase_seconds=phase_seconds, bytes_read=bytes_read, file_key=file_key)
+
+    # Obtiene la cabecera existente (si la hay) a partir del prefijo.
+    existing_header = header_prefix.existing_header
+
+    # Determina si es necesario insertar, actualizar o conservar la cabecera de licencia.
+    # Se verifica si la cabecera existente es None o si la cabecera existente es diferente de la nueva, ignorando espacios innecesarios al inicio y al final.
+    phase_start = time.perf_counter()
+    is_new_header = existing_header is None
+    header_needs_update = is_new_header or existing_header.strip() != expected_header
+    phase_seconds[PHASE_COMPARE] += time.perf_counter() - phase_start
+
+    if not header_needs_update:
+        # La cabecera ya está actualizada, no es necesario modificar el archivo.
+        return FileProcessingResult(full_file_path, relative_file_path, STATUS_CURRENT, cache_entry=new_cache_entry, phase_seconds=phase_seconds, bytes_read=bytes_read, file_key=file_key)
+
+    status = STATUS_MISSING if is_new_header else STATUS_STALE
+
+    # El archivo se reescribe con las líneas preservadas, la nueva cabecera y el contenido original copiado sin decodificar.
+    rewrite_plan = create_rewrite_plan(full_file_path, file_stat, header_prefix, new_license_header)
+    header_diff = format_header_diff(file_key, header_prefix, rewrite_plan) if with_diff else None
+
+    if check_only:
+        # En modo de verificación solo se informa el estado; el archivo no se lee completo ni se modifica.
+        problem = "Falta la «License Header»" if is_new_header else "«License Header» desactualizada"
+        return FileProcessingResult(full_file_path, relative_file_path, status, messages=[f"❗ {problem} en «{relative_file_path}»."], phase_seconds=phase_seconds, bytes_read=bytes_read, header_diff=header_diff)
+
+    # Si es necesario actualizar la cabecera, se asigna la acción adecuada:
+    # - "Insertando" si es una nueva cabecera (es decir, no hay cabecera existente),
+    # - "Regenerando" si la cabecera existente debe ser reemplazada por una nueva.
+    action = "Insertando" if is_new_header else "Regenerando"
+    result = FileProcessingResult(full_file_path, relative_file_path, status, phase_seconds=phase_seconds, bytes_read=bytes_read, header_diff=header_diff)
+    result.messages.append(f"➕ {action} «License Header» en «{relative_file_path}».")
+
+    if defer_write:
+        result.rewrite_plan = rewrite_plan
+    else:
+        apply_rewrite(result, rewrite_plan)
+
+    return result
+
+def apply_rewrite(result: FileProcessingResult, rewrite_plan: RewritePlan) -> None:
+    """
+    «Aplica la reescritura de un archivo» y registra el resultado («file_updated», estado final, mensajes de error, tiempo y bytes escritos).
+
+    Argumentos:
+        «result» (FileProcessingResult): Resultado del archivo, que se actualiza.
+        «rewrite_plan» (RewritePlan): Plan de reescritura del archivo.
+    """
+    write_start = time.perf_counter()
+    try:
+        written_state = apply_rewrite_plan(rewrite_plan)
+        if written_state is not None:
+            result.file_updated = True
+            result.written_state = written_state
+            body_size = rewrite_plan.size - rewrite_plan.body_offset
+            result.bytes_read += body_size
+            result.bytes_written += len(rewrite_plan.head) + body_size
+        else:
+            result.messages.append(f"⚠️  {result.relative_file_path} cambió desde que fue analizado; no se modificó.")
+    except Exception as write_error:
+        result.messages.append(f"❌ No se pudo escribir en {result.relative_file_path}: {write_error}")
+    result.phase_seconds[PHASE_WRITE] = result.phase_seconds.get(PHASE_WRITE, 0.0) + time.perf_counter() - write_start
+
+def lookup_license_cache(
+    full_file_path: str,
+    root_directory: str,
+    license_cache: Dict[str, Dict[str, Any]]
+) -> Tuple[Optional[FileProcessingResult], Optional[Dict[str, Any]], float]:
+    """
+    «Consulta el manifiesto incremental» para un archivo: si su «stat» y su huella de cabecera coinciden con su entrada,
+    el archivo se da por actualizado sin abrirlo.
+
+    Argumentos:
+        «full_file_path» (str): Ruta completa del archivo.
+        «root_directory» (str): Directorio raíz (se utiliza para construir la ruta relativa).
+        «license_cache» (Dict[str, Dict[str, Any]]): Entradas del manifiesto incremental.
+
+    Retorna:
+        «Tuple[Optional[FileProcessingResult], Optional[Dict[str, Any]], float]»: Resultado del archivo si la entrada sigue
+            siendo válida (o None), la entrada registrada (o None) y los segundos dedicados a la consulta.
+    """
+    manifest_start = time.perf_counter()
+    relative_path = os.path.relpath(full_file_path, root_directory)
+    file_key = relative_path.replace(os.sep, "/")
+    cache_entry = license_cache.get(file_key)
+    header_fingerprint = LICENSE_HEADERS[os.path.splitext(full_file_path)[1].lower()]["fingerprint"]
+    try:
+        file_stat = os.stat(full_file_path)
+    except OSError:
+        file_stat = None  # El error se informará al intentar leer el archivo.
+    if file_stat is not None and is_cache_entry_valid(cache_entry, file_stat, header_fingerprint):
+        manifest_seconds = {PHASE_MANIFEST: time.perf_counter() - manifest_start}
+        cached_result = FileProcessingResult(full_file_path, f"...{os.sep}{relative_path}", STATUS_CURRENT, cache_entry=cache_entry, phase_seconds=manifest_seconds, file_key=file_key)
+        return cached_result, cache_entry, manifest_seconds[PHASE_MANIFEST]
+    return None, cache_entry, time.perf_counter() - manifest_start
+
+@lru_cache(maxsize=None)
+def compile_current_header_patterns(file_extension: str, registry_revision: int) -> Tuple[Pattern[bytes], Pattern[bytes], bool]:
+    """
+    «Compila las expresiones que confirman una cabecera actualizada» para una extensión. En conjunto equivalen a
+    «find_current_header_end» (marca BOM, líneas especiales y espacios iniciales, la cabecera esperada con «\\n» o «\\r\\n»,
+    y líneas vacías hasta una línea de código o el final del prefijo), pero se evalúan dentro del motor de expresiones
+    regulares. Los grupos «(?=(...))\\1» impiden el retroceso, igual que los recorridos de «find_current_header_end».
+
+    Argumentos:
+        «file_extension» (str): Extensión del archivo (definida en «LICENSE_HEADERS»).
+        «registry_revision» (int): Revisión del registro de lenguajes («get_registry_revision»); las expresiones se
+            vuelven a compilar si se registra un lenguaje.
+
+    Retorna:
+        «Tuple[Pattern[bytes], Pattern[bytes], bool]»: Expresión completa, que se evalúa desde el inicio del prefijo;
+            expresión del final, que se evalúa tras la cabecera (ambas terminan en la primera línea de código posterior a
+            la cabecera, o en el final del prefijo, que solo es concluyente si contiene el archivo completo); e indicador de
+            si una cabecera al inicio del prefijo puede compararse directamente (la cabecera no comienza con texto que el
+            inicio de la expresión completa consumiría: marca BOM, espacios o una línea especial).
+    """
+    license_config = LICENSE_HEADERS[file_extension]
+    special_lines = b"(?:[ \\t\\x0b\\x0c]*(?:" + b"|".join(map(re.escape, SPECIAL_LINE_PREFIXES)) + b")[^\\r\\n]*(?:\\r\\n?|\\n))*"
+    headers = re.escape(license_config["header_bytes"]) + b"|" + re.escape(license_config["header_bytes_crlf"])
+    comments = b"|".join(map(re.escape, license_config["comment_prefix_bytes"]))
+    code_start = b"(?:(?=([ \\t\\r\\n]*\\Z))\\{0}|(?=([ \\t]*[\\r\\n][ \\t\\r\\n]*))\\{1}(?=[\\x21-\\x7e])(?!" + comments + b"))"
+    header_pattern = re.compile(
+        b"(?=((?:" + re.escape(UTF8_BOM) + b")?" + special_lines + b"[ \\t\\r\\n]*))\\1(?:" + headers + b")" + code_start.replace(b"{0}", b"2").replace(b"{1}", b"3")
+    )
+    allows_direct_compare = all(
+        not header_bytes.startswith((UTF8_BOM, b" ", b"\t", b"\r", b"\n", b"\x0b", b"\x0c") + SPECIAL_LINE_PREFIXES)
+        for header_bytes in (license_config["header_bytes"], license_config["header_bytes_crlf"])
+    )
+    return header_pattern, re.compile(code_start.replace(b"{0}", b"1").replace(b"{1}", b"2")), allows_direct_compare
+
+def match_current_header(prefix_buffer: bytearray, start: int, end: int, license_config: Dict[str, Any], file_extension: str) -> Optional[int]:
+    """
+    «Confirma la cabecera actualizada de un prefijo» del búfer de un lote («prefix_buffer[start:end]»), sin copiarlo.
+    Si el prefijo comienza directamente con la cabecera (el caso habitual), esta se compara con «startswith» y solo el
+    final se evalúa con la expresión; en caso contrario, se evalúa la expresión completa (ver «compile_current_header_patterns»).
+
+    Argumentos:
+        «prefix_buffer» (bytearray): Búfer con los prefijos del lote.
+        «start» (int): Posición del inicio del prefijo en el búfer.
+        «end» (int): Posición del final del prefijo en el búfer.
+        «license_config» (Dict[str, Any]): Configuración de la licencia de la extensión del archivo («LICENSE_HEADERS»).
+        «file_extension» (str): Extensión del archivo.
+
+    Retorna:
+        «Optional[int]»: Posición (en el búfer) de la primera línea de código posterior a la cabecera, o «end» si tras
+            la cabecera solo hay espacios; None si la cabecera no queda confirmada como actualizada.
+    """
+    header_pattern, code_start_pattern, allows_direct_compare = compile_current_header_patterns(file_extension, get_registry_revision())
+    for header_bytes in (license_config["header_bytes"], license_config["header_bytes_crlf"]):
+        if allows_direct_compare and prefix_buffer.startswith(header_bytes, start, end):
+            header_match = code_start_pattern.match(prefix_buffer, start + len(header_bytes), end)
+            break
+    else:
+        header_match = header_pattern.match(prefix_buffer, start, end)
+    return header_match.end() if header_match is not None else None
+
+def check_source_file_batch(
+    source_files: List[str],
+    root_directory: str,
+    cache_entries: List[Optional[Dict[str, Any]]],
+    with_cache_entries: bool = False,
+    with_diff: bool = False,
+    max_file_size: int = DEFAULT_MAX_FILE_SIZE
+) -> List[FileProcessingResult]:
+    """
+    «Verifica un lote de archivos fuente» en dos pasadas: primero carga el prefijo de cada archivo en un único búfer
+    contiguo y luego clasifica todos los prefijos con la expresión precompilada de su lenguaje
+    («match_current_header»), sin crear objetos intermedios por archivo. Los archivos cuya cabecera no queda
+    confirmada como actualizada (faltante, desactualizada, de forma inusual, demasiado grandes o ilegibles) se procesan
+    con «process_source_file», de modo que los resultados son idénticos a los de la verificación archivo por archivo.
+
+    Argumentos:
+        «source_files» (List[str]): Rutas completas de los archivos del lote.
+        «root_directory» (str): Directorio raíz (se utiliza para construir las rutas relativas).
+        «cache_entries» (List[Optional[Dict[str, Any]]]): Entrada previa del manifiesto incremental de cada archivo.
+        «with_cache_entries» (bool): True para crear la entrada del manifiesto de los archivos actualizados.
+        «with_diff» (bool): True para adjuntar el diff de la región de la cabecera de los archivos a reescribir.
+        «max_file_size» (int): Tamaño máximo, en bytes, de los archivos a procesar (0 = sin límite).
+
+    Retorna:
+        «List[FileProcessingResult]»: Resultado de cada archivo, en el orden de «source_files».
+    """
+    prefix_buffer = bytearray(len(source_files) * HEADER_PREFIX_SIZE)
+    prefix_view = memoryview(prefix_buffer)
+    root_prefix = os.path.join(root_directory, "")
+
+    # Primera pasada: lee el prefijo de cada archivo en su tramo del búfer.
+    prefix_records: List[Optional[Tuple[int, int, os.stat_result, float]]] = []
+    for index, full_file_path in enumerate(source_files):
+        offset = index * HEADER_PREFIX_SIZE
+        read_start = time.perf_counter()
+        try:
+            with open(full_file_path, "rb", buffering=0) as source_file:
+                file_stat = os.fstat(source_file.fileno())
+                if 0 < max_file_size < file_stat.st_size:
+                    prefix_records.append(None)
+                    continue
+                length = source_file.readinto(prefix_view[offset:offset + HEADER_PREFIX_SIZE])
+        except OSError:
+            prefix_records.append(None)  # El error se informará por la vía normal.
+            continue
+        prefix_records.append((offset, length, file_stat, time.perf_counter() - read_start))
+
+    # Segunda pasada: clasifica todos los prefijos.
+    results = []
+    for full_file_path, cache_entry, prefix_record in zip(source_files, cache_entries, prefix_records):
+        if prefix_record is not None:
+            offset, length, file_stat, read_seconds = prefix_record
+            compare_start = time.perf_counter()
+            file_extension = os.path.splitext(full_file_path)[1].lower()
+            license_config = LICENSE_HEADERS[file_extension]
+            code_start = match_current_header(prefix_buffer, offset, offset + length, license_config, file_extension)
+            # Un prefijo que termina en espacios solo es concluyente si contiene el archivo completo.
+            if code_start is not None and (code_start < offset + length or length == file_stat.st_size):
+                if full_file_path.startswith(root_prefix):
+                    relative_path = full_file_path[len(root_prefix):]
+                else:
+                    relative_path = os.path.relpath(full_file_path, root_directory)
+                relative_file_path = f"...{os.sep}{relative_path}"
+                new_cache_entry = None
+                if with_cache_entries:
+                    new_cache_entry = create_cache_entry(file_stat, prefix_view[offset:code_start], license_config)
+                phase_seconds = {PHASE_READ: read_seconds, PHASE_PARSE: 0.0, PHASE_COMPARE: time.perf_counter() - compare_start}
+                results.append(FileProcessingResult(
+                    full_file_path, relative_file_path, STATUS_CURRENT, cache_entry=new_cache_entry, phase_seconds=phase_seconds,
+                    bytes_read=length, file_key=relative_path.replace(os.sep, "/")
+                ))
+                continue
+
+        # Sin confirmación: el archivo se procesa por la vía normal.
+        results.append(process_source_file(full_file_path, root_directory, cache_entry, check_only=True, with_diff=with_diff, max_file_size=max_file_size))
+
+    return results
+
+def get_available_cpu_count() -> int:
+    """
+    «Obtiene la cantidad de núcleos disponibles» para el proceso actual (respetando la afinidad de CPU, por ejemplo
+    en contenedores), o la cantidad total de núcleos si la plataforma no permite consultarla.
+
+    Retorna:
+        «int»: Cantidad de núcleos disponibles (al menos 1).
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+def process_source_files(
+    source_files: List[str],
+    root_directory: str,
+    jobs: int = 1,
+    license_cache: Optional[Dict[str, Dict[str, Any]]] = None,
+    check_only: bool = False,
+    defer_writes: bool = False,
+    with_diffs: bool = False,
+    max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+    statistics: Optional[Dict[str, Any]] = None
+) -> Iterator[FileProcessingResult]:
+    """
+    «Procesa una lista de archivos fuente», de forma secuencial o mediante un grupo de procesos.
+    Los resultados se entregan siempre en el mismo orden de «source_files». Si el consumidor deja de iterar
+    (por ejemplo, al detenerse en el primer archivo desactualizado), los archivos pendientes se cancelan.
+
+    Si se entrega el manifiesto incremental («license_cache»), los archivos cuyo «stat» y huella de cabecera
+    coinciden con su entrada se dan por actualizados sin abrirlos.
+
+    En modo de verificación, los archivos se verifican por lotes («check_source_file_batch»), que también son
+    la unidad de trabajo de cada proceso; los resultados son idénticos a los de la verificación archivo por archivo.
+
+    La cantidad de procesos se limita a los núcleos disponibles («get_available_cpu_count») y, en modo de verificación,
+    a uno por cada «PARALLEL_CHECK_MIN_FILES_PER_JOB» archivos; si queda en uno, los archivos se procesan secuencialmente.
+
+    Argumentos:
+        «source_files» (List[str]): Rutas completas de los archivos a procesar.
+        «root_directory» (str): Directorio raíz (se utiliza para construir las rutas relativas).
+        «jobs» (int): Número máximo de procesos a utilizar. 1 procesa secuencialmente; 0 utiliza todos los núcleos disponibles.
+        «license_cache» (Optional[Dict[str, Dict[str, Any]]]): Entradas del manifiesto incremental, o None para no usarlo.
+        «check_only» (bool): True para solo verificar las cabeceras, sin modificar los archivos.
+        «defer_writes» (bool): True para no reescribir los archivos y retornar sus planes de reescritura en los resultados.
+        «with_diffs» (bool): True para adjuntar a los resultados el diff de la región de la cabecera de los archivos a reescribir.
+        «max_file_size» (int): Tamaño máximo, en bytes, de los archivos a procesar (0 = sin límite).
+        «statistics» (Optional[Dict[str, Any]]): Estadísticas (ver «create_statistics») donde se registra la cantidad de
+            procesos efectivamente utilizados («jobs»; 1 si se procesó secuencialmente), o None para no registrarla.
+
+    Retorna:
+        «Iterator[FileProcessingResult]»: Resultado de cada archivo, en orden.
+    """
+    # Resultados resueltos por el manifiesto (None para los archivos que deben procesarse).
+    cached_results: List[Optional[FileProcessingResult]] = [None] * len(source_files)
+    pending_files = []
+    pending_entries = []
+    pending_manifest_seconds = []
+
+    for index, full_file_path in enumerate(source_files):
+        cache_entry = None
+        if license_cache is not None:
+            cached_result, cache_entry, manifest_seconds = lookup_license_cache(full_file_path, root_directory, license_cache)
+            if cached_result is not None:
+                cached_results[index] = cached_result
+                continue
+            pending_manifest_seconds.append(manifest_seconds)
+        pending_files.append(full_file_path)
+        pending_entries.append(cache_entry)
+
+    # Más procesos que núcleos solo agregan costo de comunicación.
+    available_cpu_count = get_available_cpu_count()
+    jobs = available_cpu_count if jobs == 0 else min(jobs, available_cpu_count)
+
+    root_directories = repeat(root_directory)
+    check_only_flags = repeat(check_only)
+    defer_write_flags = repeat(defer_writes)
+    with_diff_flags = repeat(with_diffs)
+    max_file_sizes = repeat(max_file_size)
+
+    with ExitStack() as stack:
+        if check_only and not defer_writes:
+            # Solo se verifica en paralelo si cada proceso recibe archivos suficientes para compensar la comunicación.
+            jobs = min(jobs, len(pending_files) // PARALLEL_CHECK_MIN_FILES_PER_JOB)
+            # Reparte los archivos en lotes (al menos cuatro por proceso, para equilibrar la carga).
+            batch_size = max(1, min(CHECK_BATCH_SIZE, len(pending_files) // (max(jobs, 1) * 4)))
+            file_batches = [pending_files[start:start + batch_size] for start in range(0, len(pending_files), batch_size)]
+            entry_batches = [pending_entries[start:start + batch_size] for start in range(0, len(pending_entries), batch_size)]
+            batch_arguments = (file_batches, root_directories, entry_batches, repeat(license_cache is not None), with_diff_flags, max_file_sizes)
+            if jobs <= 1 or len(file_batches) <= 1:
+                worker_count = 1
+                batch_results = map(check_source_file_batch, *batch_arguments)
+            else:
+                worker_count = min(jobs, len(file_batches))
+                executor = ProcessPoolExecutor(max_workers=worker_count)
+                stack.callback(executor.shutdown, wait=True, cancel_futures=True)
+                batch_results = executor.map(check_source_file_batch, *batch_arguments)
+            processed_results = chain.from_iterable(batch_results)
+        elif jobs <= 1 or len(pending_files) <= 1:
+            worker_count = 1
+            processed_results = map(process_source_file, pending_files, root_directories, pending_entries, check_only_flags, defer_write_flags, with_diff_flags, max_file_sizes)
+        else:
+            worker_count = min(jobs, len(pending_files))
+            executor = ProcessPoolExecutor(max_workers=worker_count)
+            stack.callback(executor.shutdown, wait=True, cancel_futures=True)
+            # Agrupa los archivos en bloques para amortizar el costo de comunicación entre procesos.
+            chunk_size = max(1, len(pending_files) // (jobs * 4))
+            # «executor.map» entrega los resultados en el mismo orden en que se enviaron los archivos.
+            processed_results = executor.map(process_source_file, pending_files, root_directories, pending_entries, check_only_flags, defer_write_flags, with_diff_flags, max_file_sizes, chunksize=chunk_size)
+        if statistics is not None:
+            statistics["jobs"] = worker_count
+
+        # Intercala los resultados del manifiesto con los procesados, respetando el orden original.
+        pending_index = 0
+        for cached_result in cached_results:
+            if cached_result is not None:
+                yield cached_result
+                continue
+            processed_result = next(processed_results)
+            if pending_manifest_seconds:
+                # Agrega el tiempo de la consulta al manifiesto que no evitó procesar el archivo.
+                processed_result.phase_seconds[PHASE_MANIFEST] = pending_manifest_seconds[pending_index]
+            pending_index += 1
+            yield processed_result
+
+def list_source_directory(directory_path: str, source_filter: SourceFileFilter) -> Tuple[List[str], List[str]]:
+    """
+    «Lista un directorio» con las mismas reglas que «walk_source_files»: archivos con extensiones definidas en
+    «LICENSE_HEADERS» y subdirectorios no excluidos (sin seguir enlaces simbólicos), ambos en orden alfabético.
+    Si el directorio no se puede listar, se omite (igual que «os.walk»).
+
+    Argumentos:
+        «directory_path» (str): Directorio a listar.
+        «source_filter» (SourceFileFilter): Filtros previos del árbol.
+
+    Retorna:
+        «Tuple[List[str], List[str]]»: Rutas completas de los archivos fuente y de los subdirectorios a recorrer.
+    """
+    relative_prefix = source_filter.get_relative_prefix(directory_path)
+    file_paths = []
+    subdirectory_paths = []
+    try:
+        with os.scandir(directory_path) as directory_entries:
+            for entry in directory_entries:
+                try:
+                    is_directory = entry.is_dir()
+                except OSError:
+                    is_directory = False
+                if is_directory:
+                    if not source_filter.is_ignored(relative_prefix + entry.name, is_directory=True) and not entry.is_symlink():
+                        subdirectory_paths.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in LICENSE_HEADERS and not source_filter.is_ignored(relative_prefix + entry.name):
+                    file_paths.append(entry.path)
+    except OSError:
+        return [], []
+    return sorted(file_paths), sorted(subdirectory_paths)
+
+async def walk_source_files_async(root_directory: str, executor: ThreadPoolExecutor, source_filter: SourceFileFilter) -> AsyncIterator[str]:
+    """
+    «Descubre los archivos fuente de forma asíncrona», en el mismo orden que «walk_source_files».
+    Cada directorio se lista en «executor» y, apenas se conoce, se anticipa el listado de todos sus subdirectorios,
+    de modo que los listados se superponen entre sí y con el procesamiento de los archivos ya descubiertos.
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz desde donde se inicia la búsqueda recursiva.
+        «executor» (ThreadPoolExecutor): Grupo de hilos donde se ejecutan las llamadas bloqueantes.
+        «source_filter» (SourceFileFilter): Filtros previos del árbol.
+
+    Retorna:
+        «AsyncIterator[str]»: Rutas completas de los archivos fuente.
+    """
+    loop = asyncio.get_running_loop()
+
+    async def walk_directory(directory_listing: "asyncio.Future[Tuple[List[str], List[str]]]") -> AsyncIterator[str]:
+        file_paths, subdirectory_paths = await directory_listing
+        subdirectory_listings = [loop.run_in_executor(executor, list_source_directory, subdirectory_path, source_filter) for subdirectory_path in subdirectory_paths]
+        for full_file_path in file_paths:
+            yield full_file_path
+        for subdirectory_listing in subdirectory_listings:
+            async for full_file_path in walk_directory(subdirectory_listing):
+                yield full_file_path
+
+    async for full_file_path in walk_directory(loop.run_in_executor(executor, list_source_directory, root_directory, source_filter)):
+        yield full_file_path
+
+def process_source_file_with_cache(
+    full_file_path: str,
+    root_directory: str,
+    license_cache: Optional[Dict[str, Dict[str, Any]]] = None,
+    check_only: bool = False,
+    defer_write: bool = False,
+    with_diff: bool = False,
+    max_file_size: int = DEFAULT_MAX_FILE_SIZE
+) -> FileProcessingResult:
+    """
+    «Procesa un archivo fuente consultando antes el manifiesto incremental» (ver «lookup_license_cache» y «process_source_file»).
+
+    Argumentos:
+        «full_file_path» (str): Ruta completa del archivo.
+        «root_directory» (str): Directorio raíz (se utiliza para construir la ruta relativa).
+        «license_cache» (Optional[Dict[str, Dict[str, Any]]]): Entradas del manifiesto incremental, o None para no usarlo.
+        «check_only» (bool): True para solo verificar la cabecera, sin modificar el archivo.
+        «defer_write» (bool): True para no reescribir el archivo y retornar su plan de reescritura en el resultado.
+        «with_diff» (bool): True para adjuntar al resultado el diff de la región de la cabecera.
+        «max_file_size» (int): Tamaño máximo, en bytes, de los archivos a procesar (0 = sin límite).
+
+    Retorna:
+        «FileProcessingResult»: Resultado del procesamiento del archivo.
+    """
+    if license_cache is None:
+        return process_source_file(full_file_path, root_directory, None, check_only, defer_write, with_diff, max_file_size)
+
+    cached_result, cache_entry, manifest_seconds = lookup_license_cache(full_file_path, root_directory, license_cache)
+    if cached_result is not None:
+        return cached_result
+    result = process_source_file(full_file_path, root_directory, cache_entry, check_only, defer_write, with_diff, max_file_size)
+    result.phase_seconds[PHASE_MANIFEST] = manifest_seconds
+    return result
+
+async def process_source_files_async(
+    source_files: Union[List[str], AsyncIterator[str]],
+    root_directory: str,
+    executor: ThreadPoolExecutor,
+    in_flight_limit: int,
+    license_cache: Optional[Dict[str, Dict[str, Any]]] = None,
+    check_only: bool = False,
+    defer_writes: bool = False,
+    with_diffs: bool = False,
+    max_file_size: int = DEFAULT_MAX_FILE_SIZE
+) -> AsyncIterator[FileProcessingResult]:
+    """
+    «Procesa archivos fuente de forma asíncrona», con a lo sumo «in_flight_limit» archivos en curso a la vez.
+    Las aperturas, lecturas y escrituras (bloqueantes) se ejecutan en «executor», de modo que en sistemas de archivos
+    de red sus latencias se superponen. Los resultados se entregan en el mismo orden de «source_files» y son idénticos
+    a los de «process_source_files».
+
+    Argumentos:
+        «source_files» (Union[List[str], AsyncIterator[str]]): Rutas completas de los archivos a procesar.
+        «root_directory» (str): Directorio raíz (se utiliza para construir las rutas relativas).
+        «executor» (ThreadPoolExecutor): Grupo de hilos donde se ejecutan las llamadas bloqueantes.
+        «in_flight_limit» (int): Cantidad máxima de archivos en curso a la vez.
+        «license_cache» (Optional[Dict[str, Dict[str, Any]]]): Entradas del manifiesto incremental, o None para no usarlo.
+        «check_only» (bool): True para solo verificar las cabeceras, sin modificar los archivos.
+        «defer_writes» (bool): True para no reescribir los archivos y retornar sus planes de reescritura en los resultados.
+        «with_diffs» (bool): True para adjuntar a los resultados el diff de la región de la cabecera de los archivos a reescribir.
+        «max_file_size» (int): Tamaño máximo, en bytes, de los archivos a procesar (0 = sin límite).
+
+    Retorna:
+        «AsyncIterator[FileProcessingResult]»: Resultado de cada archivo, en orden.
+    """
+    loop = asyncio.get_running_loop()
+    in_flight_results: Deque["asyncio.Future[FileProcessingResult]"] = deque()
+
+    async def iterate_source_files() -> AsyncIterator[str]:
+        if isinstance(source_files, list):
+            for full_file_path in source_files:
+                yield full_file_path
+        else:
+            async for full_file_path in source_files:
+                yield full_file_path
+
+    try:
+        async for full_file_path in iterate_source_files():
+            in_flight_results.append(loop.run_in_executor(executor, process_source_file_with_cache, full_file_path, root_directory, license_cache, check_only, defer_writes, with_diffs, max_file_size))
+            if len(in_flight_results) >= in_flight_limit:
+                yield await in_flight_results.popleft()
+        while in_flight_results:
+            yield await in_flight_results.popleft()
+    finally:
+        # Si el consumidor deja de iterar, los archivos aún no iniciados se cancelan.
+        for in_flight_result in in_flight_results:
+            in_flight_result.cancel()
+
+def iterate_async_results(async_results: AsyncIterator[FileProcessingResult], loop: asyncio.AbstractEventLoop) -> Iterator[FileProcessingResult]:
+    """
+    «Consume un iterador asíncrono desde código síncrono», avanzando el ciclo de eventos «loop» un resultado a la vez.
+    Al cerrarse (incluso antes de agotarse), cierra el iterador asíncrono.
+
+    Argumentos:
+        «async_results» (AsyncIterator[FileProcessingResult]): Resultados asíncronos.
+        «loop» (asyncio.AbstractEventLoop): Ciclo de eventos donde se ejecuta el iterador.
+
+    Retorna:
+        «Iterator[FileProcessingResult]»: Los mismos resultados, en orden.
+    """
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(async_results.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(async_results.aclose())
+
+def create_summary() -> Dict[str, int]:
+    """
+    «Crea el resumen vacío» con los contadores del proceso.
+
+    Retorna:
+        «Dict[str, int]»: Contadores inicializados en cero.
+    """
+    return {
+        "files_updated": 0,
+        "files_with_updated_license": 0,
+        "files_with_outdated_license": 0,
+        "files_without_license": 0,
+        "files_with_errors": 0,
+        "files_skipped": 0
+    }
+
+def accumulate_result(summary: Dict[str, int], result: FileProcessingResult) -> None:
+    """
+    «Acumula el resultado de un archivo» en los contadores del resumen.
+
+    Argumentos:
+        «summary» (Dict[str, int]): Resumen a actualizar.
+        «result» (FileProcessingResult): Resultado del procesamiento de un archivo.
+    """
+    if result.status == STATUS_CURRENT:
+        summary["files_with_updated_license"] += 1  # Archivo con cabecera de licencia actualizada.
+    elif result.status == STATUS_STALE:
+        summary["files_with_outdated_license"] += 1  # Archivo con cabecera de licencia desactualizada.
+    elif result.status == STATUS_MISSING:
+        summary["files_without_license"] += 1  # Archivo sin cabecera de licencia.
+    elif result.status == STATUS_ERROR:
+        summary["files_with_errors"] += 1  # Archivo que no pudo ser leído.
+    elif result.status == STATUS_SKIPPED:
+        summary["files_skipped"] += 1  # Archivo omitido por su tamaño o su contenido.
+
+    if result.file_updated:
+        summary["files_updated"] += 1
+
+def print_summary(summary: Dict[str, int]) -> None:
+    """
+    «Imprime el resumen del proceso».
+
+    Argumentos:
+        «summary» (Dict[str, int]): Contadores del proceso.
+    """
+    if (summary["files_updated"] > 0 or summary["files_with_outdated_license"] + summary["files_without_license"] > 0):
+        print()
+    print("📊 Resumen del proceso:")
+    print(f"✔️  Archivos con licencia actualizada: {summary['files_with_updated_license']}")
+    print(f"🔄 Archivos con licencia desactualizada: {summary['files_with_outdated_license']}")
+    print(f"➕ Archivos sin licencia: {summary['files_without_license']}")
+    print(f"✅ Total de archivos modificados: {summary['files_updated']}")
+    if summary["files_with_errors"] > 0:
+        print(f"❌ Archivos que no se pudieron leer: {summary['files_with_errors']}")
+    if summary["files_skipped"] > 0:
+        print(f"⏭️  Archivos omitidos (demasiado grandes, binarios o con otra codificación): {summary['files_skipped']}")
+
+def create_statistics(slowest_file_count: int = 0) -> Dict[str, Any]:
+    """
+    «Crea las estadísticas vacías» del proceso: tiempo por fase, bytes leídos y escritos y archivos más lentos.
+
+    Argumentos:
+        «slowest_file_count» (int): Cantidad de archivos más lentos a registrar (0 para no registrarlos).
+
+    Retorna:
+        «Dict[str, Any]»: Estadísticas inicializadas en cero.
+    """
+    return {
+        "jobs": 1,
+        "files": 0,
+        "wall_seconds": 0.0,
+        "phase_seconds": {phase: 0.0 for phase in PHASE_LABELS},
+        "bytes_read": 0,
+        "bytes_written": 0,
+        "slowest_file_count": slowest_file_count,
+        "slowest_files": []
+    }
+
+def accumulate_statistics(statistics: Dict[str, Any], result: FileProcessingResult) -> None:
+    """
+    «Acumula los tiempos y bytes de un archivo» en las estadísticas del proceso.
+    Los archivos más lentos se mantienen en un montículo acotado a «slowest_file_count» elementos.
+
+    Argumentos:
+        «statistics» (Dict[str, Any]): Estadísticas a actualizar.
+        «result» (FileProcessingResult): Resultado del procesamiento de un archivo.
+    """
+    statistics["files"] += 1
+    statistics["bytes_read"] += result.bytes_read
+    statistics["bytes_written"] += result.bytes_written
+    phase_seconds = statistics["phase_seconds"]
+    for phase, seconds in result.phase_seconds.items():
+        phase_seconds[phase] += seconds
+
+    if statistics["slowest_file_count"] > 0:
+        file_entry = (sum(result.phase_seconds.values()), result.relative_file_path)
+        if len(statistics["slowest_files"]) < statistics["slowest_file_count"]:
+            heapq.heappush(statistics["slowest_files"], file_entry)
+        else:
+            heapq.heappushpop(statistics["slowest_files"], file_entry)
+
+def finish_statistics(statistics: Dict[str, Any], wall_seconds: float) -> None:
+    """
+    «Completa las estadísticas del proceso»: registra el tiempo total y ordena los archivos más lentos
+    de mayor a menor duración, en una forma serializable como JSON. La cantidad de procesos («jobs») ya quedó
+    registrada durante el procesamiento (ver «process_source_files»).
+
+    Argumentos:
+        «statistics» (Dict[str, Any]): Estadísticas a completar.
+        «wall_seconds» (float): Tiempo total transcurrido del proceso.
+    """
+    statistics["wall_seconds"] = wall_seconds
+    statistics["slowest_files"] = [
+        {"path": relative_file_path, "seconds": seconds}
+        for seconds, relative_file_path in sorted(statistics["slowest_files"], reverse=True)
+    ]
+
+def format_byte_count(byte_count: int) -> str:
+    """
+    «Formatea una cantidad de bytes» en la unidad más legible.
+
+    Argumentos:
+        «byte_count» (int): Cantidad de bytes.
+
+    Retorna:
+        «str»: Cantidad formateada (por ejemplo, "1.50 MiB").
+    """
+    value = float(byte_count)
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.2f} {unit}"
+        value /= 1024
+    return f"{value:.2f} GiB"
+
+def print_statistics(statistics: Dict[str, Any]) -> None:
+    """
+    «Imprime las estadísticas del proceso»: tiempo por fase, bytes leídos y escritos y, si se registraron, los archivos más lentos.
+
+    Argumentos:
+        «statistics» (Dict[str, Any]): Estadísticas completadas con «finish_statistics».
+    """
+    print()
+    print("⏱️  Estadísticas del proceso:")
+    print(f"   Tiempo total: {statistics['wall_seconds']:.3f} s ({statistics['files']} archivos)")
+    for phase, label in PHASE_LABELS.items():
+        print(f"   {label}: {statistics['phase_seconds'][phase]:.3f} s")
+    if statistics["jobs"] > 1:
+        print("   (Con procesamiento concurrente, las fases por archivo suman el tiempo de todos los procesos o hilos y pueden superar el tiempo total.)")
+    print(f"   📥 Bytes leídos: {format_byte_count(statistics['bytes_read'])}")
+    print(f"   📤 Bytes escritos: {format_byte_count(statistics['bytes_written'])}")
+
+    if statistics["slowest_files"]:
+        print("🐢 Archivos más lentos:")
+        for slowest_file in statistics["slowest_files"]:
+            print(f"   {slowest_file['seconds'] * 1000:8.3f} ms  {slowest_file['path']}")
+
+def save_statistics(statistics_file_path: str, statistics: Dict[str, Any]) -> None:
+    """
+    «Guarda las estadísticas del proceso» como JSON, para su consumo por otras herramientas.
+
+    Argumentos:
+        «statistics_file_path» (str): Ruta del archivo JSON.
+        «statistics» (Dict[str, Any]): Estadísticas completadas con «finish_statistics».
+
+    Excepciones:
+        «OSError»: Si no se pudo escribir el archivo.
+    """
+    with open(statistics_file_path, "w", encoding="utf-8") as statistics_file:
+        json.dump(statistics, statistics_file, ensure_ascii=False, indent=2)
+        statistics_file.write("\n")
+
+def save_shard_report(report_file_path: str, shard: Tuple[int, int], summary: Dict[str, int], check_only: bool) -> None:
+    """
+    «Guarda el reporte parcial de una partición» («--shard K/N») como JSON, para combinarlo luego con «--merge-reports».
+
+    Argumentos:
+        «report_file_path» (str): Ruta del reporte.
+        «shard» (Tuple[int, int]): Número de la partición (desde 1) y cantidad total de particiones.
+        «summary» (Dict[str, int]): Contadores del proceso de la partición.
+        «check_only» (bool): True si la partición se ejecutó en modo de verificación.
+
+    Excepciones:
+        «OSError»: Si no se pudo escribir el reporte.
+    """
+    shard_number, shard_count = shard
+    report = {
+        "version": SHARD_REPORT_VERSION,
+        "license_fingerprint": get_license_fingerprint(),
+        "shard": shard_number,
+        "shard_count": shard_count,
+        "check_only": check_only,
+        "summary": summary
+    }
+    with open(report_file_path, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=2)
+        report_file.write("\n")
+
+def merge_shard_reports(report_file_paths: List[str]) -> Tuple[Dict[str, int], bool]:
+    """
+    «Combina los reportes parciales de todas las particiones» en los mismos contadores que imprime el resumen.
+    Los reportes deben cubrir exactamente una vez cada partición de 1 a N y provenir de la misma configuración de licencia.
+
+    Argumentos:
+        «report_file_paths» (List[str]): Rutas de los reportes parciales.
+
+    Retorna:
+        «Tuple[Dict[str, int], bool]»: Contadores combinados y True si todas las particiones se ejecutaron en modo de verificación.
+
+    Excepciones:
+        «ValueError»: Si un reporte no se puede leer, no es válido o los reportes no forman un conjunto completo y coherente.
+    """
+    summary = create_summary()
+    shard_numbers = set()
+    shard_counts = set()
+    check_only = True
+
+    for report_file_path in report_file_paths:
+        try:
+            with open(report_file_path, "r", encoding="utf-8") as report_file:
+                report = json.load(report_file)
+            if report.get("version") != SHARD_REPORT_VERSION:
+                raise ValueError(f"versión de reporte no soportada: {report.get('version')}")
+            if report["license_fingerprint"] != get_license_fingerprint():
+                raise ValueError("fue generado con otra configuración de licencia")
+            shard_number = report["shard"]
+            shard_counts.add(report["shard_count"])
+            for counter in summary:
+                summary[counter] += report["summary"][counter]
+            check_only = check_only and report["check_only"]
+        except (OSError, ValueError, KeyError, TypeError) as report_error:
+            raise ValueError(f"El reporte «{report_file_path}» no es válido: {report_error}") from report_error
+
+        if shard_number in shard_numbers:
+            raise ValueError(f"La partición {shard_number} aparece en más de un reporte.")
+        shard_numbers.add(shard_number)
+
+    if len(shard_counts) != 1:
+        raise ValueError(f"Los reportes provienen de distintas cantidades de particiones: {sorted(shard_counts)}.")
+    shard_count = shard_counts.pop()
+    missing_shards = sorted(set(range(1, shard_count + 1)) - shard_numbers)
+    if missing_shards:
+        raise ValueError(f"Faltan los reportes de las particiones: {', '.join(map(str, missing_shards))} (de {shard_count}).")
+
+    return summary, check_only
+
+def create_history_record(root_directory: str, summary: Dict[str, int], statistics: Dict[str, Any], check_only: bool, incremental: bool) -> Dict[str, Any]:
+    """
+    «Crea el registro de una ejecución» para el historial: contadores por estado, tiempo total y por fase,
+    archivos por segundo y huella de la configuración de licencia.
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz procesado.
+        «summary» (Dict[str, int]): Contadores del proceso (ver «create_summary»).
+        «statistics» (Dict[str, Any]): Estadísticas completadas con «finish_statistics».
+        «check_only» (bool): True si la ejecución fue en modo de verificación.
+        «incremental» (bool): True si la ejecución utilizó el manifiesto incremental.
+
+    Retorna:
+        «Dict[str, Any]»: Registro serializable como JSON.
+    """
+    wall_seconds = statistics["wall_seconds"]
+    return {
+        "version": LICENSE_HISTORY_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "root_directory": root_directory,
+        "check_only": check_only,
+        "incremental": incremental,
+        "jobs": statistics["jobs"],
+        "license_fingerprint": get_license_fingerprint(),
+        "files": statistics["files"],
+        "summary": summary,
+        "wall_seconds": wall_seconds,
+        "phase_seconds": statistics["phase_seconds"],
+        "files_per_second": statistics["files"] / wall_seconds if wall_seconds > 0 else 0.0
+    }
+
+def append_history_record(history_file_path: str, record: Dict[str, Any]) -> None:
+    """
+    «Agrega el registro de una ejecución al historial», como una sola línea JSON al final del archivo.
+
+    Argumentos:
+        «history_file_path» (str): Ruta del historial.
+        «record» (Dict[str, Any]): Registro creado con «create_history_record».
+
+    Excepciones:
+        «OSError»: Si no se pudo escribir el historial.
+    """
+    with open(history_file_path, "a", encoding="utf-8") as history_file:
+        history_file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+def load_history_records(history_file_path: str) -> List[Dict[str, Any]]:
+    """
+    «Carga los registros del historial» en orden cronológico.
+    Las líneas dañadas (por ejemplo, de una ejecución interrumpida) o de otra versión del formato se descartan.
+
+    Argumentos:
+        «history_file_path» (str): Ruta del historial.
+
+    Retorna:
+        «List[Dict[str, Any]]»: Registros válidos, o una lista vacía si el historial no existe.
+
+    Excepciones:
+        «OSError»: Si el historial existe pero no se pudo leer.
+    """
+    records = []
+    try:
+        with open(history_file_path, "r", encoding="utf-8") as history_file:
+            for line in history_file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and record.get("version") == LICENSE_HISTORY_VERSION:
+                    records.append(record)
+    except FileNotFoundError:
+        return []
+    return records
+
+def get_history_group(record: Dict[str, Any]) -> Tuple[str, bool, bool, int]:
+    """
+    «Obtiene el grupo de comparación de un registro»: solo se comparan entre sí las ejecuciones del mismo árbol,
+    con el mismo modo (verificación o corrección), el mismo uso del manifiesto y la misma cantidad de procesos
+    efectivamente utilizados (no la solicitada con «--jobs», que se limita a los núcleos y a la cantidad de archivos).
+
+    Argumentos:
+        «record» (Dict[str, Any]): Registro del historial.
+
+    Retorna:
+        «Tuple[str, bool, bool, int]»: Directorio raíz, modo de verificación, uso del manifiesto y cantidad de procesos.
+    """
+    return record["root_directory"], record["check_only"], record["incremental"], record["jobs"]
+
+def get_history_baseline(previous_records: List[Dict[str, Any]], record: Dict[str, Any]) -> Optional[float]:
+    """
+    «Calcula el tiempo de referencia de una ejecución»: la mediana del tiempo total de las últimas
+    «HISTORY_MEDIAN_WINDOW» ejecuciones previas de su mismo grupo (ver «get_history_group»).
+
+    Argumentos:
+        «previous_records» (List[Dict[str, Any]]): Registros anteriores a la ejecución, en orden cronológico.
+        «record» (Dict[str, Any]): Registro de la ejecución.
+
+    Retorna:
+        «Optional[float]»: Mediana en segundos, o None si hay menos de «HISTORY_MIN_RUNS» ejecuciones previas del grupo.
+    """
+    group = get_history_group(record)
+    group_seconds = [previous_record["wall_seconds"] for previous_record in previous_records if get_history_group(previous_record) == group]
+    if len(group_seconds) < HISTORY_MIN_RUNS:
+        return None
+    return median(group_seconds[-HISTORY_MEDIAN_WINDOW:])
+
+def is_slow_run(record: Dict[str, Any], baseline_seconds: Optional[float]) -> bool:
+    """
+    «Determina si una ejecución fue lenta»: si su tiempo total supera «HISTORY_SLOW_FACTOR» veces su tiempo de referencia.
+
+    Argumentos:
+        «record» (Dict[str, Any]): Registro de la ejecución.
+        «baseline_seconds» (Optional[float]): Tiempo de referencia (ver «get_history_baseline»), o None si no hay.
+
+    Retorna:
+        «bool»: True si la ejecución fue lenta.
+    """
+    return baseline_seconds is not None and record["wall_seconds"] > baseline_seconds * HISTORY_SLOW_FACTOR
+
+def print_history_report(records: List[Dict[str, Any]], run_count: int = DEFAULT_HISTORY_RUN_COUNT) -> None:
+    """
+    «Imprime la tendencia de las últimas ejecuciones» del historial: por cada una, la fecha, el modo, la cantidad
+    de archivos, el tiempo total, los archivos por segundo y la relación con su tiempo de referencia
+    (ver «get_history_baseline»), marcando las ejecuciones lentas.
+
+    Argumentos:
+        «records» (List[Dict[str, Any]]): Registros del historial, en orden cronológico.
+        «run_count» (int): Cantidad de ejecuciones recientes a informar.
+    """
+    print(f"📈 Historial de ejecuciones (últimas {min(run_count, len(records))} de {len(records)}):")
+    slow_run_count = 0
+    for record_index in range(max(0, len(records) - run_count), len(records)):
+        record = records[record_index]
+        baseline_seconds = get_history_baseline(records[:record_index], record)
+        mode = "verificación" if record["check_only"] else "corrección"
+        if record["incremental"]:
+            mode += " incremental"
+        ratio = f"×{record['wall_seconds'] / baseline_seconds:.2f}" if baseline_seconds else "—"
+        slow_mark = ""
+        if is_slow_run(record, baseline_seconds):
+            slow_run_count += 1
+            slow_mark = "  🐢 lenta"
+        print(
+            f"   {record['timestamp']}  {mode} (j{record['jobs']})  {record['files']} archivos  "
+            f"{record['wall_seconds']:.3f} s  {record['files_per_second']:.0f} archivos/s  {ratio}{slow_mark}"
+        )
+    if slow_run_count > 0:
+        print(f"🐢 {slow_run_count} ejecuciones superaron en más de {HISTORY_SLOW_FACTOR}× la mediana de las {HISTORY_MEDIAN_WINDOW} ejecuciones previas del mismo árbol y modo.")
+
+def iter_license_header_results(
+    root_directory: str,
+    jobs: int = 1,
+    cache_file_path: Optional[str] = None,
+    check_only: bool = False,
+    git_tracked: bool = False,
+    changed_since: Optional[str] = None,
+    batch_writes: bool = False,
+    shard: Optional[Tuple[int, int]] = None,
+    statistics: Optional[Dict[str, Any]] = None,
+    in_flight: int = 0,
+    file_paths: Optional[List[str]] = None,
+    with_diffs: bool = False,
+    source_filter: Optional[SourceFileFilter] = None
+) -> Iterator[FileProcessingResult]:
+    """
+    «Procesa los archivos fuente de «root_directory»» y entrega un resultado por archivo, a medida que se obtienen.
+    Es la interfaz pública para utilizar la herramienta como biblioteca: no imprime el avance ni el resumen, de modo que
+    quien la invoca puede filtrar, contar o detenerse en cualquier momento sin acumular los resultados de todo el árbol.
+    Cada resultado («FileProcessingResult») informa la ruta («file_path»), el estado («status»: «STATUS_CURRENT»,
+    «STATUS_MISSING», «STATUS_STALE», «STATUS_ERROR» o «STATUS_SKIPPED»), los bytes leídos y escritos y si el archivo fue reescrito
+    («file_updated»), junto con los mensajes para la consola. Las situaciones que no interrumpen el proceso (por ejemplo,
+    que no hay un repositorio git o que no se pudo guardar el manifiesto) se emiten como «LicenseHeaderWarning».
+
+    Los resultados se entregan en el orden del descubrimiento, salvo dos excepciones: los archivos de los subárboles
+    podados por el manifiesto incremental se entregan primero (a medida que se consumen, sin acumularlos), y con
+    «batch_writes» los archivos reescritos se entregan al final, una vez aplicada su reescritura. Al terminar (o al
+    cerrarse el generador antes de tiempo) se guarda el manifiesto incremental, solo si cambió alguna de sus entradas o
+    de sus registros de directorio; si el generador se cierra antes de la fase de escritura, las reescrituras diferidas
+    no se aplican.
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz desde donde se inicia la búsqueda recursiva.
+        «jobs» (int): Número de procesos a utilizar. 1 procesa secuencialmente; 0 utiliza todos los núcleos disponibles.
+        «cache_file_path» (Optional[str]): Ruta del manifiesto incremental. Si es None, se procesan todos los archivos.
+        «check_only» (bool): True para solo verificar las cabeceras; ningún archivo fuente se abre para escritura.
+        «git_tracked» (bool): True para procesar solo los archivos rastreados por git.
+        «changed_since» (Optional[str]): Referencia de git; si se indica, solo se procesan los archivos cambiados respecto de ella.
+        «batch_writes» (bool): True para analizar primero todos los archivos y aplicar luego todas las reescrituras en una sola fase.
+        «shard» (Optional[Tuple[int, int]]): Número de partición (desde 1) y cantidad de particiones; si se indica,
+            solo se procesan los archivos de esa partición (ver «get_shard_number»).
+        «statistics» (Optional[Dict[str, Any]]): Estadísticas (ver «create_statistics») donde se registran el tiempo
+            del descubrimiento y la cantidad de procesos (u operaciones de E/S en curso) efectivamente utilizados, o None
+            para no registrarlos.
+        «in_flight» (int): Si es mayor que 0, utiliza la canalización asíncrona («process_source_files_async») con a lo sumo
+            «in_flight» operaciones de E/S en curso, en lugar de «jobs». Los resultados son idénticos.
+        «file_paths» (Optional[List[str]]): Archivos o directorios a procesar (ver «resolve_source_file_paths»);
+            si se indican, reemplazan al descubrimiento del árbol completo.
+        «with_diffs» (bool): True para adjuntar a los resultados de los archivos que deben reescribirse el diff unificado
+            de la región de la cabecera («header_diff»), calculado solo a partir del prefijo leído.
+        «source_filter» (Optional[SourceFileFilter]): Reglas de exclusión y tamaño máximo de los archivos; si es None,
+            los de «root_directory» (ver «create_source_file_filter»).
+
+    Retorna:
+        «Iterator[FileProcessingResult]»: Resultado de cada archivo.
+
+    Excepciones:
+        «RuntimeError»: Si falla la consulta a git para descubrir los archivos.
+        «ValueError»: Si alguna regla de exclusión no es válida.
+        «OSError»: Si el archivo de reglas de exclusión del directorio raíz no se puede leer.
+    """
+    discovery_start = time.perf_counter()
+    source_filter = source_filter or create_source_file_filter(root_directory)
+    license_cache, directory_records = load_license_cache(cache_file_path, source_filter) if cache_file_path is not None else (None, {})
+    updated_cache = {}
+    cache_changed = False
+    pruned_results = iter(())
+    pending_rewrites = []
+    completed = False
+
+    # La canalización asíncrona utiliza su propio ciclo de eventos y un grupo de hilos para las llamadas bloqueantes.
+    event_loop = asyncio.new_event_loop() if in_flight > 0 else None
+    io_executor = ThreadPoolExecutor(max_workers=in_flight) if in_flight > 0 else None
+
+    # Con el manifiesto y un recorrido completo del árbol, se podan los subárboles cuya huella no cambió.
+    tree_scan = None
+    if file_paths is not None:
+        source_files = resolve_source_file_paths(file_paths, root_directory, source_filter)
+    elif license_cache is not None and not git_tracked and changed_since is None and shard is None:
+        scan_start_ns = time.time_ns()
+        tree_scan = scan_source_tree(root_directory, source_filter, directory_records)
+        source_files = []
+        pruned_scans = []
+        collect_unpruned_source_files(tree_scan, source_files, pruned_scans)
+        pruned_results = iter_pruned_results(pruned_scans, license_cache)
+    elif event_loop is not None and not git_tracked and changed_since is None and shard is None:
+        # El recorrido asíncrono se superpone con el procesamiento de los archivos ya descubiertos.
+        source_files = walk_source_files_async(root_directory, io_executor, source_filter)
+    else:
+        source_files = discover_source_files(root_directory, git_tracked, changed_since, source_filter)
+        if shard is not None:
+            source_files = select_shard_files(source_files, root_directory, shard)
+    if statistics is not None:
+        statistics["phase_seconds"][PHASE_DISCOVERY] += time.perf_counter() - discovery_start
+
+    if event_loop is not None:
+        async_results = process_source_files_async(source_files, root_directory, io_executor, in_flight, license_cache, check_only, batch_writes, with_diffs, source_filter.max_file_size)
+        processed_results = iterate_async_results(async_results, event_loop)
+        if statistics is not None:
+            statistics["jobs"] = in_flight
+    else:
+        processed_results = process_source_files(source_files, root_directory, jobs, license_cache, check_only, batch_writes, with_diffs, source_filter.max_file_size, statistics)
+    try:
+        for result in chain(pruned_results, processed_results):
+            if result.cache_entry is not None:
+                updated_cache[result.file_key] = result.cache_entry
+                # Las entradas que siguen vigentes se entregan tal cual las cargó el manifiesto (el mismo objeto).
+                cache_changed = cache_changed or license_cache is None or license_cache.get(result.file_key) is not result.cache_entry
+            if result.rewrite_plan is not None:
+                pending_rewrites.append(result)
+                continue
+            yield result
+
+        # Fase de escritura: aplica todas las reescrituras diferidas en una sola pasada.
+        for result in pending_rewrites:
+            apply_rewrite(result, result.rewrite_plan)
+            result.rewrite_plan = None
+            yield result
+
+        completed = True
+    finally:
+        processed_results.close()
+        if event_loop is not None:
+            io_executor.shutdown(wait=True, cancel_futures=True)
+            # Finaliza los generadores asíncronos anidados (por ejemplo, el recorrido) que quedaron abiertos.
+            event_loop.run_until_complete(event_loop.shutdown_asyncgens())
+            event_loop.close()
+
+        if cache_file_path is not None:
+            # Si el recorrido fue parcial, se conservan las entradas de los archivos no visitados.
+            if not completed or changed_since is not None or shard is not None or file_paths is not None:
+                updated_cache = {**license_cache, **updated_cache}
+            else:
+                # Tras un recorrido completo, las entradas de los archivos que dejaron de estar actualizados se descartan.
+                cache_changed = cache_changed or len(updated_cache) != len(license_cache)
+            # Los registros de los directorios solo se actualizan tras un recorrido completo del árbol; en otro caso se
+            # conservan (una huella desactualizada no poda nada, porque se compara con la calculada en cada recorrido).
+            updated_directory_records = directory_records
+            if tree_scan is not None:
+                updated_directory_records = {}
+                collect_directory_records(tree_scan, updated_cache, scan_start_ns, updated_directory_records)
+            try:
+                # El manifiesto solo se reescribe si cambió alguna entrada o algún registro de directorio.
+                if cache_changed or updated_directory_records != directory_records:
+                    save_license_cache(cache_file_path, updated_cache, updated_directory_records, source_filter)
+            except OSError as cache_error:
+                warnings.warn(f"No se pudo guardar el manifiesto incremental «{cache_file_path}»: {cache_error}", LicenseHeaderWarning, stacklevel=2)
+
+def regenerate_license_headers(
+    root_directory: str,
+    jobs: int = 1,
+    cache_file_path: Optional[str] = None,
+    check_only: bool = False,
+    fail_fast: bool = False,
+    git_tracked: bool = False,
+    changed_since: Optional[str] = None,
+    batch_writes: bool = False,
+    statistics: Optional[Dict[str, Any]] = None,
+    shard: Optional[Tuple[int, int]] = None,
+    in_flight: int = 0,
+    file_paths: Optional[List[str]] = None,
+    show_diff: bool = False,
+    patch_file_path: Optional[str] = None,
+    source_filter: Optional[SourceFileFilter] = None,
+    written_states: Optional[Dict[str, Tuple[int, int]]] = None
+) -> Dict[str, int]:
+    """
+    «Recorre el directorio» «root_directory» y procesa cada archivo fuente con extensión «.cs» y «.py».
+    - Inserta la cabecera si no está presente.
+    - Reemplaza la cabecera si está desactualizada.
+
+    Es el consumidor de consola de «iter_license_header_results»: imprime los mensajes de cada archivo a medida
+    que se obtienen y, al final, el resumen del proceso.
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz desde donde se inicia la búsqueda recursiva.
+        «jobs» (int): Número de procesos a utilizar. 1 procesa secuencialmente; 0 utiliza todos los núcleos disponibles.
+        «cache_file_path» (Optional[str]): Ruta del manifiesto incremental. Si es None, se procesan todos los archivos.
+        «check_only» (bool): True para solo verificar las cabeceras; ningún archivo fuente se abre para escritura.
+        «fail_fast» (bool): True para detenerse en el primer archivo cuya cabecera falte, esté desactualizada o no se pueda leer.
+        «git_tracked» (bool): True para procesar solo los archivos rastreados por git.
+        «changed_since» (Optional[str]): Referencia de git; si se indica, solo se procesan los archivos cambiados respecto de ella.
+        «batch_writes» (bool): True para analizar primero todos los archivos y aplicar luego todas las reescrituras en una sola fase.
+        «statistics» (Optional[Dict[str, Any]]): Estadísticas (ver «create_statistics») que se completan con los tiempos
+            por fase y los bytes leídos y escritos, o None para no registrarlas.
+        «shard» (Optional[Tuple[int, int]]): Número de partición (desde 1) y cantidad de particiones; si se indica,
+            solo se procesan los archivos de esa partición (ver «get_shard_number»).
+        «in_flight» (int): Si es mayor que 0, cantidad máxima de operaciones de E/S en curso de la canalización asíncrona.
+        «file_paths» (Optional[List[str]]): Archivos o directorios a procesar en lugar del árbol completo.
+        «show_diff» (bool): True para imprimir el diff de la región de la cabecera de cada archivo que debe reescribirse.
+        «patch_file_path» (Optional[str]): Ruta donde se guardan esos diff como un parche aplicable con «git apply».
+        «source_filter» (Optional[SourceFileFilter]): Reglas de exclusión y tamaño máximo de los archivos; si es None,
+            los de «root_directory».
+        «written_states» (Optional[Dict[str, Tuple[int, int]]]): Diccionario donde se registra, por ruta completa, el estado
+            de cada archivo reescrito justo después de su escritura («written_state»), o None para no registrarlo.
+
+    Retorna:
+        «Dict[str, int]»: Contadores del proceso (ver «create_summary»).
+
+    Excepciones:
+        «RuntimeError»: Si falla la consulta a git para descubrir los archivos o no se pudo escribir el parche.
+    """
+    process_start = time.perf_counter()
+    summary = create_summary()
+    stopped_early = False
+    batch_rewrite_count = 0
+    batch_write_seconds = 0.0
+
+    with_diffs = show_diff or patch_file_path is not None
+
+    with ExitStack() as stack:
+        # Los diff se escriben en el parche a medida que se obtienen, conservando los saltos de línea de cada archivo.
+        patch_file = None
+        if patch_file_path is not None:
+            try:
+                patch_file = stack.enter_context(open(patch_file_path, "w", encoding="utf-8", errors="surrogateescape", newline=""))
+            except OSError as patch_error:
+                raise RuntimeError(f"No se pudo escribir el parche en «{patch_file_path}»: {patch_error}") from patch_error
+        results = stack.enter_context(closing(iter_license_header_results(root_directory, jobs, cache_file_path, check_only, git_tracked, changed_since, batch_writes, shard, statistics, in_flight, file_paths, with_diffs, source_filter)))
+        for result in results:
+            for message in result.messages:
+                print(message)
+            if result.header_diff is not None:
+                if show_diff:
+                    print(result.header_diff, end="")
+                if patch_file is not None:
+                    try:
+                        patch_file.write(result.header_diff)
+                    except OSError as patch_error:
+                        raise RuntimeError(f"No se pudo escribir el parche en «{patch_file_path}»: {patch_error}") from patch_error
+            accumulate_result(summary, result)
+            if written_states is not None and result.written_state is not None:
+                written_states[result.file_path] = result.written_state
+            if statistics is not None:
+                accumulate_statistics(statistics, result)
+            if batch_writes and PHASE_WRITE in result.phase_seconds:
+                batch_rewrite_count += 1
+                batch_write_seconds += result.phase_seconds[PHASE_WRITE]
+            if fail_fast and result.status not in (STATUS_CURRENT, STATUS_SKIPPED):
+                stopped_early = True
+                break
+
+        if patch_file is not None:
+            try:
+                patch_file.flush()
+            except OSError as patch_error:
+                raise RuntimeError(f"No se pudo escribir el parche en «{patch_file_path}»: {patch_error}") from patch_error
+
+    if batch_rewrite_count > 0:
+        print(f"💾 Fase de escritura: {summary['files_updated']} de {batch_rewrite_count} archivos reescritos en {batch_write_seconds:.3f} s.")
+    if stopped_early:
+        print("⏹️  Verificación detenida en el primer archivo con problemas («--fail-fast»).")
+    print_summary(summary)
+    if statistics is not None:
+        finish_statistics(statistics, time.perf_counter() - process_start)
+    return summary
+
+
+class SourceFileEventHandler:
+    """
+    «Receptor de notificaciones del sistema de archivos» para «--watch».
+    Implementa el método «dispatch» que «watchdog» invoca por cada evento y encola las rutas de los archivos fuente
+    creados, modificados o renombrados; los directorios, los archivos eliminados y los no candidatos se descartan.
+
+    Atributos:
+        «root_directory» (str): Directorio raíz observado.
+        «touched_files» (queue.Queue): Cola donde se depositan las rutas completas de los archivos afectados.
+        «source_filter» (SourceFileFilter): Filtros previos del árbol.
+    """
+
+    def __init__(self, root_directory: str, touched_files: "queue.Queue[str]", source_filter: SourceFileFilter) -> None:
+        self.root_directory = root_directory
+        self.touched_files = touched_files
+        self.source_filter = source_filter
+
+    def dispatch(self, event: Any) -> None:
+        """
+        «Atiende un evento del sistema de archivos».
+
+        Argumentos:
+            «event» (Any): Evento de «watchdog» («FileSystemEvent»).
+        """
+        if event.is_directory or event.event_type not in ("created", "modified", "moved"):
+            return
+        # En un renombrado interesa el destino (por ejemplo, el archivo que reemplaza un editor al guardar).
+        file_path = event.dest_path if event.event_type == "moved" else event.src_path
+        if isinstance(file_path, bytes):
+            file_path = os.fsdecode(file_path)
+        if is_candidate_source_file(os.path.relpath(file_path, self.root_directory), self.source_filter):
+            self.touched_files.put(os.path.abspath(file_path))
+
+def start_filesystem_observer(root_directory: str, touched_files: "queue.Queue[str]", source_filter: SourceFileFilter) -> Optional[Any]:
+    """
+    «Inicia la observación del sistema de archivos» con «watchdog», si está instalado.
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz a observar recursivamente.
+        «touched_files» (queue.Queue): Cola donde se depositan las rutas de los archivos afectados.
+        «source_filter» (SourceFileFilter): Filtros previos del árbol.
+
+    Retorna:
+        «Optional[Any]»: Observador iniciado, o None si «watchdog» no está disponible o no pudo iniciarse (en este caso,
+            el motivo se emite como «LicenseHeaderWarning»).
+    """
+    if Observer is None:
+        return None
+    observer = Observer()
+    try:
+        observer.schedule(SourceFileEventHandler(root_directory, touched_files, source_filter), root_directory, recursive=True)
+        observer.start()
+    except OSError as observer_error:
+        warnings.warn(f"No se pudo observar «{root_directory}» ({observer_error}).", LicenseHeaderWarning, stacklevel=2)
+        return None
+    return observer
+
+def get_file_state(file_path: str) -> Optional[Tuple[int, int]]:
+    """
+    «Obtiene el estado de un archivo» (fecha de modificación y tamaño), con el que se detectan sus cambios.
+
+    Argumentos:
+        «file_path» (str): Ruta completa del archivo.
+
+    Retorna:
+        «Optional[Tuple[int, int]]»: «mtime» en nanosegundos y tamaño, o None si el archivo ya no existe.
+    """
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return None
+    return file_stat.st_mtime_ns, file_stat.st_size
+
+def scan_source_file_states(root_directory: str, source_filter: SourceFileFilter) -> Dict[str, Tuple[int, int]]:
+    """
+    «Toma una instantánea del estado de los archivos fuente», utilizada por el sondeo de respaldo de «--watch».
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz a recorrer.
+        «source_filter» (SourceFileFilter): Filtros previos del árbol.
+
+    Retorna:
+        «Dict[str, Tuple[int, int]]»: Estado («mtime» y tamaño) de cada archivo fuente, por ruta completa.
+    """
+    file_states = {}
+    for full_file_path in walk_source_files(root_directory, source_filter=source_filter):
+        file_state = get_file_state(full_file_path)
+        if file_state is not None:
+            file_states[full_file_path] = file_state
+    return file_states
+
+def wait_for_notified_changes(touched_files: "queue.Queue[str]", debounce_seconds: float) -> List[str]:
+    """
+    «Espera una ráfaga de notificaciones» y la entrega completa una vez que transcurren «debounce_seconds» sin eventos nuevos.
+    Así, los guardados múltiples de un IDE o los archivos emitidos por un generador se procesan juntos y una sola vez.
+
+    Argumentos:
+        «touched_files» (queue.Queue): Cola con las rutas de los archivos afectados.
+        «debounce_seconds» (float): Segundos de calma que cierran la ráfaga.
+
+    Retorna:
+        «List[str]»: Rutas completas de los archivos afectados, sin repetir y en orden alfabético.
+    """
+    # La espera del primer evento se hace por intervalos para que «Ctrl+C» se atienda en todas las plataformas.
+    while True:
+        try:
+            burst = {touched_files.get(timeout=1.0)}
+            break
+        except queue.Empty:
+            continue
+
+    while True:
+        try:
+            burst.add(touched_files.get(timeout=debounce_seconds))
+        except queue.Empty:
+            return sorted(burst)
+
+def wait_for_polled_changes(
+    root_directory: str,
+    known_states: Dict[str, Tuple[int, int]],
+    poll_interval: float,
+    debounce_seconds: float,
+    source_filter: SourceFileFilter
+) -> List[str]:
+    """
+    «Sondea el árbol hasta detectar cambios» respecto de «known_states» y espera a que se estabilicen
+    (dos sondeos consecutivos, separados por «debounce_seconds», con los mismos cambios).
+    Los archivos eliminados se retiran de «known_states».
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz a recorrer.
+        «known_states» (Dict[str, Tuple[int, int]]): Último estado conocido de cada archivo fuente.
+        «poll_interval» (float): Segundos entre sondeos mientras no hay cambios.
+        «debounce_seconds» (float): Segundos entre los sondeos que confirman que la ráfaga terminó.
+        «source_filter» (SourceFileFilter): Filtros previos del árbol.
+
+    Retorna:
+        «List[str]»: Rutas completas de los archivos nuevos o modificados, en orden alfabético.
+    """
+    changed_states: Dict[str, Tuple[int, int]] = {}
+    while True:
+        time.sleep(debounce_seconds if changed_states else poll_interval)
+        current_states = scan_source_file_states(root_directory, source_filter)
+        for removed_file_path in known_states.keys() - current_states.keys():
+            del known_states[removed_file_path]
+        previous_changed_states = changed_states
+        changed_states = {
+            file_path: file_state
+            for file_path, file_state in current_states.items()
+            if known_states.get(file_path) != file_state
+        }
+        if changed_states and changed_states == previous_changed_states:
+            return sorted(changed_states)
+
+@dataclass
+class SourceTreeWatch:
+    """
+    «Observación de un árbol en curso» para «--watch»: las notificaciones del sistema de archivos o la instantánea del
+    sondeo con la que se comparan los sondeos siguientes.
+
+    Atributos:
+        «source_filter» (SourceFileFilter): Filtros previos del árbol.
+        «touched_files» (queue.Queue): Cola donde el observador deposita las rutas de los archivos afectados.
+        «observer» (Optional[Any]): Observador de «watchdog» iniciado, o None si se utiliza el sondeo.
+        «poll_interval» (Optional[float]): Intervalo del sondeo (None con el observador).
+        «known_states» (Dict[str, Tuple[int, int]]): Último estado conocido de cada archivo fuente, por ruta completa.
+    """
+    source_filter: SourceFileFilter
+    touched_files: "queue.Queue[str]"
+    observer: Optional[Any]
+    poll_interval: Optional[float]
+    known_states: Dict[str, Tuple[int, int]]
+
+def start_watching_source_files(root_directory: str, poll_interval: Optional[float] = None, source_filter: Optional[SourceFileFilter] = None) -> SourceTreeWatch:
+    """
+    «Comienza a observar un árbol» para «--watch»: inicia el observador de «watchdog» o, si no está disponible o
+    «poll_interval» se indica, toma la instantánea del sondeo. Se invoca antes del procesamiento inicial, de modo que
+    los archivos que cambian mientras este se ejecuta también se procesan al comenzar la observación. Los archivos que
+    reescribe el propio procesamiento inicial deben registrarse después en «known_states» con su estado final
+    («written_state»), para que sus eventos se descarten.
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz a observar.
+        «poll_interval» (Optional[float]): Intervalo del sondeo; si es None, se prefieren las notificaciones del sistema de archivos.
+        «source_filter» (Optional[SourceFileFilter]): Filtros previos; si es None, los de «root_directory».
+
+    Retorna:
+        «SourceTreeWatch»: Observación iniciada. Si se recurre al sondeo sin haberlo pedido, el motivo se emite como
+            «LicenseHeaderWarning».
+    """
+    source_filter = source_filter or create_source_file_filter(root_directory)
+    touched_files: "queue.Queue[str]" = queue.Queue()
+    observer = start_filesystem_observer(root_directory, touched_files, source_filter) if poll_interval is None else None
+    known_states: Dict[str, Tuple[int, int]] = {}
+
+    if observer is None:
+        if poll_interval is None:
+            warnings.warn(f"«watchdog» no está disponible; se sondeará el directorio cada {DEFAULT_WATCH_POLL_INTERVAL} s.", LicenseHeaderWarning, stacklevel=2)
+            poll_interval = DEFAULT_WATCH_POLL_INTERVAL
+        known_states = scan_source_file_states(root_directory, source_filter)
+
+    return SourceTreeWatch(source_filter, touched_files, observer, poll_interval, known_states)
+
+def watch_source_files(
+    root_directory: str,
+    debounce_seconds: float = DEFAULT_WATCH_DEBOUNCE,
+    poll_interval: Optional[float] = None,
+    source_filter: Optional[SourceFileFilter] = None,
+    tree_watch: Optional[SourceTreeWatch] = None
+) -> None:
+    """
+    «Mantiene actualizadas las cabeceras mientras se editan los archivos» («--watch»), hasta que se interrumpa con «Ctrl+C».
+    Utiliza las notificaciones del sistema de archivos («watchdog») o, si no están disponibles o «poll_interval» se indica,
+    sondeos periódicos. Solo se procesan los archivos fuente afectados por cada ráfaga de cambios.
+
+    El estado («mtime» y tamaño) de cada archivo se registra después de procesarlo; los eventos cuyo estado coincide con
+    el registrado (como las reescrituras hechas por la propia herramienta) se descartan sin volver a procesar el archivo.
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz a observar.
+        «debounce_seconds» (float): Segundos sin cambios que cierran una ráfaga antes de procesarla.
+        «poll_interval» (Optional[float]): Intervalo del sondeo; si es None, se prefieren las notificaciones del sistema de archivos.
+        «source_filter» (Optional[SourceFileFilter]): Filtros previos; si es None, los de «root_directory».
+        «tree_watch» (Optional[SourceTreeWatch]): Observación ya iniciada (ver «start_watching_source_files»), por ejemplo
+            antes del procesamiento inicial; si es None, se inicia al invocar la función.
+    """
+    tree_watch = tree_watch or start_watching_source_files(root_directory, poll_interval, source_filter)
+    source_filter = tree_watch.source_filter
+    observer = tree_watch.observer
+    poll_interval = tree_watch.poll_interval
+    known_states = tree_watch.known_states
+    touched_files = tree_watch.touched_files
+
+    print(f"👀 Observando los cambios en «{root_directory}» (Ctrl+C para terminar)...")
+
+    try:
+        while True:
+            if observer is not None:
+                changed_files = wait_for_notified_changes(touched_files, debounce_seconds)
+            else:
+                changed_files = wait_for_polled_changes(root_directory, known_states, poll_interval, debounce_seconds, source_filter)
+
+            for full_file_path in changed_files:
+                file_state = get_file_state(full_file_path)
+                if file_state is None:
+                    known_states.pop(full_file_path, None)
+                    continue
+                if known_states.get(full_file_path) == file_state:
+                    continue  # Sin cambios desde el último procesamiento (por ejemplo, la reescritura propia).
+
+                result = process_source_file(full_file_path, root_directory, max_file_size=source_filter.max_file_size)
+                for message in result.messages:
+                    print(message)
+
+                # Registra el estado final del archivo para ignorar los eventos de su propia reescritura.
+                file_state = get_file_state(full_file_path)
+                if file_state is not None:
+                    known_states[full_file_path] = file_state
+    except KeyboardInterrupt:
+        print("⏹️  Observación finalizada.")
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+def is_private_directory(directory_path: str) -> bool:
+    """
+    «Verifica si un directorio es privado del usuario actual»: es un directorio (no un enlace simbólico), le pertenece
+    y ni el grupo ni los demás usuarios tienen permisos sobre él.
+
+    Argumentos:
+        «directory_path» (str): Ruta del directorio.
+
+    Retorna:
+        «bool»: True si el directorio existe y es privado del usuario actual.
+    """
+    try:
+        directory_stat = os.lstat(directory_path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(directory_stat.st_mode) and directory_stat.st_uid == os.getuid() and directory_stat.st_mode & 0o077 == 0
+
+def get_socket_directory() -> str:
+    """
+    «Obtiene el directorio privado donde se crean los sockets del servicio residente»: «$XDG_RUNTIME_DIR» si está definido
+    y es privado del usuario actual o, en caso contrario, un directorio propio del usuario dentro del directorio temporal,
+    que se crea con permisos 0700. Así, ningún otro usuario puede crear de antemano el socket ni conectarse a él.
+
+    Retorna:
+        «str»: Ruta del directorio.
+
+    Excepciones:
+        «RuntimeError»: Si el directorio del usuario en el directorio temporal existe pero no es privado (por ejemplo,
+            porque otro usuario lo creó antes).
+        «OSError»: Si no se pudo crear el directorio.
+    """
+    runtime_directory = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_directory and is_private_directory(runtime_directory):
+        return runtime_directory
+
+    socket_directory = os.path.join(tempfile.gettempdir(), DAEMON_SOCKET_DIRECTORY_NAME.format(user_id=os.getuid()))
+    try:
+        os.mkdir(socket_directory, 0o700)
+    except FileExistsError:
+        pass
+    if not is_private_directory(socket_directory):
+        raise RuntimeError(f"El directorio «{socket_directory}» no es privado del usuario actual; indique otro socket con «--socket».")
+    return socket_directory
+
+def get_default_socket_path(root_directory: str) -> str:
+    """
+    «Obtiene la ruta por defecto del socket del servicio residente» de «root_directory»: un archivo del directorio privado
+    de sockets (ver «get_socket_directory») cuyo nombre incluye una huella del directorio raíz (así, cada árbol tiene su
+    propio servicio y la ruta es corta).
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz.
+
+    Retorna:
+        «str»: Ruta del socket.
+
+    Excepciones:
+        «RuntimeError»: Si el directorio de sockets no es privado del usuario actual.
+        «OSError»: Si no se pudo crear el directorio de sockets.
+    """
+    root_digest = hashlib.sha1(os.path.abspath(root_directory).encode("utf-8", "surrogateescape")).hexdigest()[:12]
+    return os.path.join(get_socket_directory(), DAEMON_SOCKET_FILE_NAME.format(root_digest=root_digest))
+
+@dataclass
+class SourceFileIndex:
+    """
+    «Índice de los archivos fuente» que el servicio residente mantiene en memoria.
+
+    Atributos:
+        «source_files» (List[str]): Rutas completas de los archivos fuente, en el orden de «walk_source_files».
+        «directory_mtimes» (Dict[str, int]): «mtime» de cada directorio recorrido, que cambia al crear, eliminar o renombrar
+            sus entradas (y, por lo tanto, indica cuándo el índice debe reconstruirse).
+    """
+    source_files: List[str]
+    directory_mtimes: Dict[str, int]
+
+def build_source_file_index(root_directory: str, source_filter: SourceFileFilter) -> SourceFileIndex:
+    """
+    «Construye el índice de los archivos fuente» de «root_directory».
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz.
+        «source_filter» (SourceFileFilter): Filtros previos del árbol.
+
+    Retorna:
+        «SourceFileIndex»: Índice con los archivos fuente y el «mtime» de cada directorio recorrido.
+    """
+    directory_mtimes = {}
+    return SourceFileIndex(walk_source_files(root_directory, directory_mtimes, source_filter), directory_mtimes)
+
+def is_source_file_index_current(file_index: SourceFileIndex) -> bool:
+    """
+    «Verifica si el índice sigue vigente»: ningún directorio recorrido cambió su «mtime» ni dejó de existir.
+
+    Argumentos:
+        «file_index» (SourceFileIndex): Índice a verificar.
+
+    Retorna:
+        «bool»: True si el conjunto de archivos fuente no cambió desde que se construyó el índice.
+    """
+    for directory_path, directory_mtime in file_index.directory_mtimes.items():
+        try:
+            if os.stat(directory_path).st_mtime_ns != directory_mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+@dataclass
+class DaemonState:
+    """
+    «Estado en memoria del servicio residente» («--serve»).
+
+    Atributos:
+        «root_directory» (str): Directorio raíz atendido.
+        «source_filter» (SourceFileFilter): Reglas de exclusión y tamaño máximo de los archivos.
+        «license_cache» (Dict[str, Dict[str, Any]]): Estado de cada archivo verificado como actualizado (mismas entradas
+            que el manifiesto incremental), con el que los archivos sin cambios se responden sin abrirlos.
+        «file_index» (Optional[SourceFileIndex]): Índice de los archivos fuente, o None si aún no se construyó.
+    """
+    root_directory: str
+    source_filter: SourceFileFilter
+    license_cache: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    file_index: Optional[SourceFileIndex] = None
+
+def handle_daemon_request(daemon_state: DaemonState, request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    «Atiende una solicitud del servicio residente»: verifica («check_only») o corrige las cabeceras de las rutas indicadas
+    («paths», absolutas) o, si no se indican, de todo el árbol.
+
+    Argumentos:
+        «daemon_state» (DaemonState): Estado en memoria del servicio, que se actualiza.
+        «request» (Dict[str, Any]): Solicitud con las claves «root», «check_only», «fail_fast» y «paths».
+
+    Retorna:
+        «Dict[str, Any]»: Respuesta con los resultados de cada archivo («results»), el resumen («summary») y si el proceso
+            se detuvo en el primer archivo con problemas («stopped_early»), o con la clave «error».
+    """
+    root_directory = daemon_state.root_directory
+    if request["root"] != root_directory:
+        return {"error": f"El servicio atiende «{root_directory}», no «{request['root']}»."}
+
+    if request.get("paths"):
+        source_files = resolve_source_file_paths(request["paths"], root_directory, daemon_state.source_filter)
+    else:
+        if daemon_state.file_index is None or not is_source_file_index_current(daemon_state.file_index):
+            daemon_state.file_index = build_source_file_index(root_directory, daemon_state.source_filter)
+        source_files = daemon_state.file_index.source_files
+
+    summary = create_summary()
+    results = []
+    stopped_early = False
+    check_only = bool(request.get("check_only"))
+    for result in process_source_files(source_files, root_directory, 1, daemon_state.license_cache, check_only, max_file_size=daemon_state.source_filter.max_file_size):
+        accumulate_result(summary, result)
+        cache_key = result.file_key or get_cache_key(result.file_path, root_directory)
+        if result.cache_entry is not None:
+            daemon_state.license_cache[cache_key] = result.cache_entry
+        else:
+            daemon_state.license_cache.pop(cache_key, None)
+        results.append({
+            "path": result.relative_file_path,
+            "file_path": result.file_path,
+            "status": result.status,
+            "file_updated": result.file_updated,
+            "written_state": result.written_state,
+            "messages": result.messages,
+            "bytes_read": result.bytes_read,
+            "bytes_written": result.bytes_written
+        })
+        if request.get("fail_fast") and result.status not in (STATUS_CURRENT, STATUS_SKIPPED):
+            stopped_early = True
+            break
+
+    return {"results": results, "summary": summary, "stopped_early": stopped_early}
+
+class LicenseHeaderRequestHandler(socketserver.StreamRequestHandler):
+    """
+    «Manejador de las conexiones del servicio residente»: cada conexión envía una solicitud JSON en una línea
+    y recibe la respuesta JSON en otra.
+    """
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+            response = handle_daemon_request(self.server.daemon_state, request)
+        except (ValueError, KeyError, TypeError) as request_error:
+            response = {"error": f"Solicitud no válida: {request_error}"}
+        except OSError as request_error:
+            response = {"error": f"No se pudo atender la solicitud: {request_error}"}
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+def verify_socket_peer(client_socket: socket.socket, socket_path: str) -> None:
+    """
+    «Verifica que el servicio residente pertenezca al usuario actual» antes de confiar en sus respuestas: el socket debe
+    pertenecer al usuario y, donde el sistema lo admite («SO_PEERCRED»), también el proceso que lo atiende.
+    Así, otro usuario que haya creado el socket no puede responder, por ejemplo, que todas las cabeceras están actualizadas.
+
+    Argumentos:
+        «client_socket» (socket.socket): Socket conectado al servicio.
+        «socket_path» (str): Ruta del socket del servicio.
+
+    Excepciones:
+        «RuntimeError»: Si el socket o el proceso del servicio pertenecen a otro usuario.
+        «OSError»: Si no se pudo consultar el propietario del socket.
+    """
+    socket_stat = os.lstat(socket_path)
+    if not stat.S_ISSOCK(socket_stat.st_mode) or socket_stat.st_uid != os.getuid():
+        raise RuntimeError(f"El socket «{socket_path}» no pertenece al usuario actual.")
+    if hasattr(socket, "SO_PEERCRED"):
+        _, peer_user_id, _ = struct.unpack("3i", client_socket.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")))
+        if peer_user_id != os.getuid():
+            raise RuntimeError(f"El servicio de «{socket_path}» pertenece a otro usuario.")
+
+def send_daemon_request(socket_path: str, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    «Envía una solicitud al servicio residente» y espera su respuesta, tras verificar que el servicio pertenezca
+    al usuario actual (ver «verify_socket_peer»).
+
+    Argumentos:
+        «socket_path» (str): Ruta del socket del servicio.
+        «request» (Dict[str, Any]): Solicitud (ver «handle_daemon_request»).
+
+    Retorna:
+        «Optional[Dict[str, Any]]»: Respuesta del servicio, o None si no hay un servicio escuchando en «socket_path».
+
+    Excepciones:
+        «RuntimeError»: Si el socket o el proceso del servicio pertenecen a otro usuario.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_socket:
+            client_socket.settimeout(DAEMON_CONNECT_TIMEOUT)
+            client_socket.connect(socket_path)
+            verify_socket_peer(client_socket, socket_path)
+            client_socket.settimeout(None)
+            client_socket.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+            with client_socket.makefile("rb") as response_file:
+                response_line = response_file.readline()
+    except OSError:
+        return None
+    return json.loads(response_line) if response_line else None
+
+def serve_license_headers(root_directory: str, socket_path: str, source_filter: Optional[SourceFileFilter] = None) -> None:
+    """
+    «Inicia el servicio residente» («--serve»): mantiene en memoria las cabeceras, el índice de archivos y el estado de
+    cada archivo, y atiende solicitudes de verificación o corrección en el socket Unix «socket_path» hasta que se
+    interrumpa con «Ctrl+C». Al iniciar, verifica todo el árbol (sin modificarlo) para precargar el estado.
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz atendido.
+        «socket_path» (str): Ruta del socket Unix.
+        «source_filter» (Optional[SourceFileFilter]): Filtros previos; si es None, los de «root_directory».
+
+    Excepciones:
+        «RuntimeError»: Si el sistema no admite sockets Unix, ya hay un servicio escuchando en «socket_path»
+            o el socket existente pertenece a otro usuario.
+        «OSError»: Si no se pudo crear el socket.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("Este sistema no admite sockets Unix; «--serve» no está disponible.")
+    if os.path.exists(socket_path):
+        if send_daemon_request(socket_path, {"root": root_directory, "paths": [os.devnull]}) is not None:
+            raise RuntimeError(f"Ya hay un servicio escuchando en «{socket_path}».")
+        os.remove(socket_path)  # Socket abandonado por un servicio anterior.
+
+    daemon_state = DaemonState(root_directory, source_filter or create_source_file_filter(root_directory))
+    handle_daemon_request(daemon_state, {"root": root_directory, "check_only": True})
+    print(f"📚 {len(daemon_state.file_index.source_files)} archivos indexados, {len(daemon_state.license_cache)} con la «License Header» actualizada.")
+
+    # El socket se crea con permisos 0600 desde el principio: solo el usuario actual puede enviar solicitudes.
+    previous_umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(socket_path, LicenseHeaderRequestHandler)
+    finally:
+        os.umask(previous_umask)
+    server.daemon_state = daemon_state
+    try:
+        print(f"🛰️  Servicio escuchando en «{socket_path}» (Ctrl+C para terminar)...")
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("⏹️  Servicio finalizado.")
+    finally:
+        server.server_close()
+        try:
+            os.remove(socket_path)
+        except OSError:
+            pass
+
+def regenerate_license_headers_via_daemon(
+    socket_path: str,
+    root_directory: str,
+    check_only: bool = False,
+    fail_fast: bool = False,
+    file_paths: Optional[List[str]] = None,
+    written_states: Optional[Dict[str, Tuple[int, int]]] = None
+) -> Optional[Dict[str, int]]:
+    """
+    «Cliente del servicio residente»: delega la verificación o corrección al servicio e imprime sus resultados y el
+    resumen igual que «regenerate_license_headers».
+
+    Argumentos:
+        «socket_path» (str): Ruta del socket del servicio.
+        «root_directory» (str): Directorio raíz.
+        «check_only» (bool): True para solo verificar las cabeceras.
+        «fail_fast» (bool): True para detenerse en el primer archivo con problemas.
+        «file_paths» (Optional[List[str]]): Archivos o directorios a procesar en lugar del árbol completo.
+        «written_states» (Optional[Dict[str, Tuple[int, int]]]): Diccionario donde se registra el estado de cada archivo
+            reescrito por el servicio (ver «regenerate_license_headers»), o None para no registrarlo.
+
+    Retorna:
+        «Optional[Dict[str, int]]»: Contadores del proceso, o None si no hay un servicio disponible
+            (en cuyo caso quien lo invoca debe procesar los archivos en el mismo proceso).
+    """
+    request = {
+        "root": root_directory,
+        "check_only": check_only,
+        "fail_fast": fail_fast,
+        "paths": [os.path.abspath(path) for path in file_paths or []]
+    }
+    try:
+        response = send_daemon_request(socket_path, request)
+    except RuntimeError as peer_error:
+        print(f"⚠️  {peer_error} Se procesará sin el servicio.")
+        return None
+    if response is None:
+        return None
+    if "error" in response:
+        print(f"⚠️  {response['error']} Se procesará sin el servicio.")
+        return None
+
+    for result in response["results"]:
+        for message in result["messages"]:
+            print(message)
+        if written_states is not None and result.get("written_state") is not None:
+            written_states[result["file_path"]] = tuple(result["written_state"])
+    if response["stopped_early"]:
+        print("⏹️  Verificación detenida en el primer archivo con problemas («--fail-fast»).")
+    print_summary(response["summary"])
+    return response["summary"]
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    «Interpreta el argumento de «--shard»» con la forma «K/N».
+
+    Argumentos:
+        «value» (str): Valor del argumento.
+
+    Retorna:
+        «Tuple[int, int]»: Número de la partición (desde 1) y cantidad total de particiones.
+
+    Excepciones:
+        «argparse.ArgumentTypeError»: Si el valor no tiene la forma «K/N» con 1 ≤ K ≤ N.
+    """
+    try:
+        shard_number, shard_count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"«{value}» no tiene la forma K/N.")
+    if not 1 <= shard_number <= shard_count:
+        raise argparse.ArgumentTypeError(f"«{value}»: K debe estar entre 1 y N.")
+    return shard_number, shard_count
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    «Interpreta los argumentos de línea de comando».
+
+    Retorna:
+        «argparse.Namespace»: Argumentos interpretados.
+    """
+    parser = argparse.ArgumentParser(description="Inserta o regenera la cabecera de licencia en los archivos fuente «.cs» y «.py».")
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help=(
+            "Número máximo de procesos para procesar archivos en paralelo (1 = secuencial, 0 = todos los núcleos). Nunca se "
+            "utilizan más procesos que núcleos disponibles, y las verificaciones de pocos archivos se hacen secuencialmente."
+        )
+    )
+    parser.add_argument(
+        "--in-flight",
+        type=int,
+        default=0,
+        metavar="N",
+        help=(
+            "Utiliza la canalización asíncrona con a lo sumo N operaciones de E/S en curso. Solo para NFS y otros sistemas de archivos "
+            "de red, donde superpone la latencia de cada lectura: en un disco local es varias veces más lenta que la ejecución secuencial."
+        )
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"Omite, sin abrirlos, los archivos que no han cambiado desde la última ejecución (manifiesto «{LICENSE_CACHE_FILE_NAME}» en el directorio raíz)."
+    )
+    parser.add_argument(
+        "--cache-file",
+        metavar="RUTA",
+        help="Ruta alternativa del manifiesto incremental (implica «--incremental»)."
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Solo verifica las cabeceras, sin modificar ningún archivo. Termina con código 1 si alguna falta, está desactualizada o no se pudo leer."
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Con «--check», se detiene en el primer archivo con problemas."
+    )
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="Como «--check», e imprime el diff unificado de la región de la cabecera de cada archivo que debe reescribirse."
+    )
+    parser.add_argument(
+        "--patch-out",
+        metavar="RUTA",
+        help="Como «--check», y guarda el diff de la región de la cabecera de cada archivo en RUTA (aplicable con «git apply»)."
+    )
+    parser.add_argument(
+        "--ignore",
+        action="append",
+        default=[],
+        metavar="REGLA",
+        help=(
+            f"Agrega una regla de exclusión, como «*.Generated.cs», «obj/» o «re:expresión» (se puede repetir; ver también "
+            f"«{LICENSE_IGNORE_FILE_NAME}»). Siempre se aplican las reglas por defecto: {', '.join(DEFAULT_IGNORE_RULES)}."
+        )
+    )
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=DEFAULT_MAX_FILE_SIZE,
+        metavar="BYTES",
+        help=f"Omite los archivos de más de BYTES bytes (por defecto, {DEFAULT_MAX_FILE_SIZE}, es decir, {format_byte_count(DEFAULT_MAX_FILE_SIZE)}; 0 = sin límite)."
+    )
+    git_discovery_group = parser.add_mutually_exclusive_group()
+    git_discovery_group.add_argument(
+        "--tracked",
+        action="store_true",
+        help="Procesa solo los archivos rastreados por git (si no hay repositorio, recorre el directorio completo)."
+    )
+    git_discovery_group.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="Procesa solo los archivos cambiados respecto de la referencia de git REF, más los archivos nuevos no ignorados."
+    )
+    parser.add_argument(
+        "--batch-writes",
+        action="store_true",
+        help="Analiza primero todos los archivos y aplica después todas las reescrituras en una sola fase medida."
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Informa el tiempo dedicado a cada fase (descubrimiento, lectura, análisis, comparación y escritura) y los bytes leídos y escritos."
+    )
+    parser.add_argument(
+        "--profile",
+        type=int,
+        nargs="?",
+        const=DEFAULT_PROFILE_FILE_COUNT,
+        metavar="N",
+        help=f"Como «--stats», e informa además los N archivos más lentos (por defecto, {DEFAULT_PROFILE_FILE_COUNT})."
+    )
+    parser.add_argument(
+        "--stats-json",
+        metavar="RUTA",
+        help="Guarda las estadísticas en formato JSON en RUTA (implica «--stats»)."
+    )
+    parser.add_argument(
+        "--record-history",
+        action="store_true",
+        help=f"Agrega un registro de la ejecución (contadores, tiempos por fase y archivos por segundo) al historial «{LICENSE_HISTORY_FILE_NAME}» del directorio raíz."
+    )
+    parser.add_argument(
+        "--history-file",
+        metavar="RUTA",
+        help="Ruta alternativa del historial de ejecuciones (implica «--record-history», salvo junto con «--history»)."
+    )
+    parser.add_argument(
+        "--history",
+        type=int,
+        nargs="?",
+        const=DEFAULT_HISTORY_RUN_COUNT,
+        metavar="N",
+        help=f"No procesa archivos: informa la tendencia de las últimas N ejecuciones del historial (por defecto, {DEFAULT_HISTORY_RUN_COUNT}) y marca las lentas."
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Tras el procesamiento inicial, sigue observando el árbol y actualiza la cabecera de los archivos que se crean o modifican."
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=DEFAULT_WATCH_DEBOUNCE,
+        metavar="SEGUNDOS",
+        help=f"Con «--watch», segundos sin cambios que se esperan antes de procesar una ráfaga (por defecto, {DEFAULT_WATCH_DEBOUNCE})."
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        metavar="SEGUNDOS",
+        help="Con «--watch», sondea el árbol cada SEGUNDOS en lugar de utilizar las notificaciones del sistema de archivos."
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        metavar="K/N",
+        help="Procesa solo la partición K de N del conjunto de archivos (repartido de forma determinista según la ruta) y guarda un reporte parcial."
+    )
+    parser.add_argument(
+        "--report-file",
+        metavar="RUTA",
+        help=f"Ruta del reporte parcial de «--shard» (por defecto, «{SHARD_REPORT_FILE_NAME.format(shard_number='K', shard_count='N')}» en el directorio actual)."
+    )
+    parser.add_argument(
+        "--merge-reports",
+        nargs="+",
+        metavar="RUTA",
+        help="No procesa archivos: combina los reportes parciales de todas las particiones e imprime el resumen total."
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Inicia el servicio residente, que atiende solicitudes de verificación o corrección en un socket Unix."
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Delega el procesamiento al servicio residente o, si no hay uno escuchando, procesa los archivos en el mismo proceso."
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="RUTA",
+        help="Ruta del socket del servicio residente (por defecto, un archivo propio de cada árbol en «$XDG_RUNTIME_DIR» o en un directorio privado del usuario)."
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        metavar="RUTA",
+        help="Archivos o directorios a procesar (por defecto, todo el árbol)."
+    )
+    arguments = parser.parse_args()
+    if (arguments.diff or arguments.patch_out is not None) and (
+        arguments.watch or arguments.batch_writes or arguments.serve or arguments.daemon or arguments.merge_reports is not None
+    ):
+        parser.error("«--diff» y «--patch-out» no pueden utilizarse junto con «--watch», «--batch-writes», «--serve», «--daemon» ni «--merge-reports».")
+    # «--diff» y «--patch-out» no modifican ningún archivo: implican el modo de verificación.
+    arguments.check = arguments.check or arguments.diff or arguments.patch_out is not None
+    if arguments.serve and arguments.daemon:
+        parser.error("«--serve» no puede utilizarse junto con «--daemon».")
+    if arguments.serve and (arguments.check or arguments.paths):
+        parser.error("«--serve» no admite «--check» ni rutas: cada solicitud indica la acción y los archivos.")
+    if (arguments.serve or arguments.daemon) and (
+        arguments.jobs != 1 or arguments.in_flight or arguments.incremental or arguments.cache_file is not None
+        or arguments.tracked or arguments.changed_since is not None or arguments.batch_writes
+        or arguments.stats or arguments.profile is not None or arguments.stats_json is not None
+        or arguments.watch or arguments.shard is not None or arguments.merge_reports is not None
+        or arguments.record_history or arguments.history_file is not None or arguments.history is not None
+    ):
+        parser.error("«--serve» y «--daemon» no pueden utilizarse junto con las opciones de paralelismo, manifiesto, git, escritura por lotes, estadísticas, historial, observación ni particiones.")
+    if arguments.daemon and (arguments.ignore or arguments.max_size != DEFAULT_MAX_FILE_SIZE):
+        parser.error("«--ignore» y «--max-size» no pueden utilizarse junto con «--daemon»: se indican al iniciar el servicio con «--serve».")
+    if arguments.max_size < 0:
+        parser.error("«--max-size» debe ser mayor o igual a 0.")
+    if arguments.socket is not None and not (arguments.serve or arguments.daemon):
+        parser.error("«--socket» solo puede utilizarse junto con «--serve» o «--daemon».")
+    if arguments.paths and (arguments.tracked or arguments.changed_since is not None or arguments.shard is not None or arguments.merge_reports is not None):
+        parser.error("Las rutas no pueden utilizarse junto con «--tracked», «--changed-since», «--shard» ni «--merge-reports».")
+    if arguments.history is not None and (
+        arguments.record_history or arguments.check or arguments.paths or arguments.watch
+        or arguments.shard is not None or arguments.merge_reports is not None
+    ):
+        parser.error("«--history» no puede utilizarse junto con «--record-history», «--check», rutas, «--watch», «--shard» ni «--merge-reports».")
+    if arguments.history is not None and arguments.history < 1:
+        parser.error("«--history» debe ser mayor o igual a 1.")
+    if arguments.merge_reports is not None and (arguments.record_history or arguments.history_file is not None):
+        parser.error("«--merge-reports» no puede utilizarse junto con «--record-history» ni «--history-file».")
+    if arguments.merge_reports is not None and (arguments.shard is not None or arguments.watch):
+        parser.error("«--merge-reports» no puede utilizarse junto con «--shard» ni «--watch».")
+    if arguments.report_file is not None and arguments.shard is None:
+        parser.error("«--report-file» solo puede utilizarse junto con «--shard».")
+    if arguments.shard is not None and arguments.watch:
+        parser.error("«--shard» no puede utilizarse junto con «--watch».")
+    if arguments.watch and arguments.check:
+        parser.error("«--watch» no puede utilizarse junto con «--check».")
+    if not arguments.watch and (arguments.poll_interval is not None or arguments.debounce != DEFAULT_WATCH_DEBOUNCE):
+        parser.error("«--debounce» y «--poll-interval» solo pueden utilizarse junto con «--watch».")
+    if arguments.debounce < 0 or (arguments.poll_interval is not None and arguments.poll_interval <= 0):
+        parser.error("«--debounce» no puede ser negativo y «--poll-interval» debe ser mayor que 0.")
+    if arguments.profile is not None and arguments.profile < 1:
+        parser.error("«--profile» debe ser mayor o igual a 1.")
+    if arguments.in_flight < 0:
+        parser.error("«--in-flight» debe ser mayor o igual a 0.")
+    if arguments.in_flight > 0 and arguments.jobs != 1:
+        parser.error("«--in-flight» no puede utilizarse junto con «--jobs».")
+    if arguments.jobs < 0:
+        parser.error("«--jobs» debe ser mayor o igual a 0.")
+    if arguments.fail_fast and not arguments.check:
+        parser.error("«--fail-fast» solo puede utilizarse junto con «--check».")
+    if arguments.batch_writes and arguments.check:
+        parser.error("«--batch-writes» no puede utilizarse junto con «--check».")
+    return arguments
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    # Carga y valida la configuración de lenguajes antes de procesar cualquier archivo.
+    try:
+        get_license_fingerprint()
+    except LicenseConfigError as config_error:
+        print(f"❌ {config_error}")
+        sys.exit(2)
+
+    # Las advertencias de la herramienta se imprimen en la consola, todas las veces que se emiten.
+    warnings.showwarning = show_license_header_warning
+    warnings.simplefilter("always", LicenseHeaderWarning)
+
+    # Obtiene el directorio del script actual.
+    script_directory = os.path.dirname(os.path.abspath(__file__))
+
+    # Define el directorio raíz como la carpeta padre del script actual.
+    root_dir = os.path.abspath(os.path.join(script_directory, os.pardir))
+
+    # Define la ruta del manifiesto incremental, si corresponde.
+    cache_file_path = arguments.cache_file
+    if cache_file_path is None and arguments.incremental:
+        cache_file_path = os.path.join(root_dir, LICENSE_CACHE_FILE_NAME)
+    
+    # Define la ruta del historial de ejecuciones, si corresponde.
+    history_file_path = arguments.history_file or os.path.join(root_dir, LICENSE_HISTORY_FILE_NAME)
+    record_history = arguments.record_history or (arguments.history_file is not None and arguments.history is None)
+
+    # Prepara las estadísticas del proceso, si se solicitaron o se registrará la ejecución en el historial.
+    statistics = None
+    show_statistics = arguments.stats or arguments.profile is not None or arguments.stats_json is not None
+    if show_statistics or record_history:
+        statistics = create_statistics(arguments.profile or 0)
+
+    # Define la ruta del socket del servicio residente, si corresponde, y los archivos a procesar, si se indicaron.
+    socket_path = arguments.socket
+    if socket_path is None and (arguments.serve or arguments.daemon):
+        try:
+            socket_path = get_default_socket_path(root_dir)
+        except (RuntimeError, OSError) as socket_error:
+            print(f"❌ No se pudo preparar el directorio del socket: {socket_error}")
+            sys.exit(2)
+    file_paths = arguments.paths or None
+
+    # Compila una sola vez las reglas de exclusión y define el tamaño máximo de los archivos.
+    try:
+        source_filter = create_source_file_filter(root_dir, arguments.ignore, arguments.max_size)
+    except ValueError as filter_error:
+        print(f"❌ {filter_error}")
+        sys.exit(2)
+    except OSError as filter_error:
+        print(f"❌ No se pudo leer «{LICENSE_IGNORE_FILE_NAME}»: {filter_error}")
+        sys.exit(2)
+
+    # Imprime un salto de línea para separar el mensaje de inicio.
+    print()
+
+    if arguments.serve:
+        # Atiende solicitudes hasta que se interrumpa el servicio.
+        print(describe_source_file_filter(source_filter))
+        try:
+            serve_license_headers(root_dir, socket_path, source_filter)
+        except (RuntimeError, OSError) as serve_error:
+            print(f"❌ {serve_error}")
+            sys.exit(2)
+        sys.exit(0)
+
+    if arguments.history is not None:
+        # Informa la tendencia de las ejecuciones registradas en el historial.
+        try:
+            history_records = load_history_records(history_file_path)
+        except OSError as history_error:
+            print(f"❌ No se pudo leer el historial «{history_file_path}»: {history_error}")
+            sys.exit(2)
+        if not history_records:
+            print(f"ℹ️  El historial «{history_file_path}» no tiene ejecuciones registradas («--record-history»).")
+            sys.exit(0)
+        print_history_report(history_records, arguments.history)
+        sys.exit(0)
+    if arguments.merge_reports is not None:
+        # Combina los reportes parciales de las particiones en el resumen total.
+        try:
+            summary, merged_check_only = merge_shard_reports(arguments.merge_reports)
+        except ValueError as report_error:
+            print(f"❌ {report_error}")
+            sys.exit(2)
+        print_summary(summary)
+        print()
+        files_with_problems = summary["files_with_outdated_license"] + summary["files_without_license"] + summary["files_with_errors"]
+        if merged_check_only and files_with_problems > 0:
+            print(f"❌ Se encontraron {files_with_problems} archivos con la «License Header» faltante, desactualizada o ilegible.")
+            sys.exit(1)
+        print(f"✅ Se combinaron {len(arguments.merge_reports)} reportes parciales.")
+        sys.exit(0)
+
+    # Con «--watch», la observación comienza antes del procesamiento inicial, para no perder los cambios hechos durante él.
+    tree_watch = start_watching_source_files(root_dir, arguments.poll_interval, source_filter) if arguments.watch else None
+    written_states = {} if arguments.watch else None
+
+    # Ejecuta la verificación o la regeneración/inserción de cabeceras de licencia.
+    try:
+        summary = None
+        if arguments.daemon:
+            summary = regenerate_license_headers_via_daemon(socket_path, root_dir, arguments.check, arguments.fail_fast, file_paths, written_states)
+        if summary is None:
+            # Informa una sola vez las exclusiones vigentes, para que ningún archivo se omita sin aviso.
+            print(describe_source_file_filter(source_filter))
+            print()
+            summary = regenerate_license_headers(
+                root_dir,
+                jobs=arguments.jobs,
+                cache_file_path=cache_file_path,
+                check_only=arguments.check,
+                fail_fast=arguments.fail_fast,
+                git_tracked=arguments.tracked,
+                changed_since=arguments.changed_since,
+                batch_writes=arguments.batch_writes,
+                statistics=statistics,
+                shard=arguments.shard,
+                in_flight=arguments.in_flight,
+                file_paths=file_paths,
+                show_diff=arguments.diff,
+                patch_file_path=arguments.patch_out,
+                source_filter=source_filter,
+                written_states=written_states
+            )
+    except RuntimeError as run_error:
+        # Falló la consulta a git o la escritura del parche.
+        print(f"❌ {run_error}")
+        sys.exit(2)
+
+    if arguments.shard is not None:
+        # Guarda el reporte parcial de la partición, para combinarlo con «--merge-reports».
+        shard_number, shard_count = arguments.shard
+        report_file_path = arguments.report_file or SHARD_REPORT_FILE_NAME.format(shard_number=shard_number, shard_count=shard_count)
+        try:
+            save_shard_report(report_file_path, arguments.shard, summary, arguments.check)
+            print(f"🧩 Reporte de la partición {shard_number} de {shard_count} guardado en «{report_file_path}».")
+        except OSError as report_error:
+            # Sin su reporte, la partición no puede combinarse: el nodo de CI debe fallar aunque sus archivos estén al día.
+            print(f"❌ No se pudo guardar el reporte de la partición en «{report_file_path}»: {report_error}")
+            sys.exit(2)
+
+    if show_statistics:
+        print_statistics(statistics)
+        if arguments.stats_json is not None:
+            try:
+                save_statistics(arguments.stats_json, statistics)
+            except OSError as statistics_error:
+                print(f"❌ No se pudieron guardar las estadísticas en «{arguments.stats_json}»: {statistics_error}")
+    if record_history:
+        # Registra la ejecución en el historial y la compara con la mediana de las ejecuciones previas del mismo árbol y modo.
+        history_record = create_history_record(root_dir, summary, statistics, arguments.check, cache_file_path is not None)
+        try:
+            baseline_seconds = get_history_baseline(load_history_records(history_file_path), history_record)
+            append_history_record(history_file_path, history_record)
+            if is_slow_run(history_record, baseline_seconds):
+                print()
+                print(
+                    f"🐢 Esta ejecución ({history_record['wall_seconds']:.3f} s) fue {history_record['wall_seconds'] / baseline_seconds:.2f}× "
+                    f"más lenta que la mediana de las ejecuciones previas del mismo árbol y modo ({baseline_seconds:.3f} s)."
+                )
+        except OSError as history_error:
+            print(f"❌ No se pudo actualizar el historial «{history_file_path}»: {history_error}")
+    
+    # Imprime un salto de línea para separar el mensaje de finalización.
+    print()
+
+    if arguments.check:
+        # En modo de verificación, el código de salida indica si todas las cabeceras están actualizadas.
+        files_with_problems = summary["files_with_outdated_license"] + summary["files_without_license"] + summary["files_with_errors"]
+        if files_with_problems > 0:
+            print(f"❌ Se encontraron {files_with_problems} archivos con la «License Header» faltante, desactualizada o ilegible.")
+            sys.exit(1)
+        print("✅ Todas las «License Header's» de los archivos del código fuente están actualizadas.")
+    else:
+        # Mensaje de confirmación de finalización.
+        print("✅ La regeneración de las «License Header's» en los archivos del código fuente ha finalizado correctamente.")
+
+    if arguments.watch:
+        # Las reescrituras del procesamiento inicial se registran con su estado final, para no volver a procesarlas.
+        tree_watch.known_states.update(written_states)
+        print()
+        watch_source_files(root_dir, arguments.debounce, arguments.poll_interval, source_filter, tree_watch)
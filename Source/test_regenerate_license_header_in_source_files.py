@@ -0,0 +1,1196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# region GPL v3 License Header
+#
+# Clean Architecture - .NET 8
+# Copyright (C) 2025 Cristian Rojas Arredondo
+# 
+# Author / Contact:
+#   Cristian Rojas Arredondo «cristian.rojas.software.engineer@gmail.com»
+# 
+# A full copy of the GNU GPL v3 is provided in the root of this project in the "LICENSE" file.
+# Additionally, you can view the license at <https://www.gnu.org/licenses/gpl-3.0.html>.
+#
+
+# region «English version» GPL v3 License Information 
+#
+# This file is part of Clean Architecture - .NET 8.
+# 
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License or
+# (at your option) any later version.
+# 
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/gpl-3.0.html>.
+# 
+# Note: In the event of any discrepancy between translations, this version (English) shall prevail.
+#
+# endregion
+
+# region «Spanish version» GPL v3 License Information
+#
+# Este archivo es parte de Clean Architecture - .NET 8.
+# 
+# Este programa es software libre: puede redistribuirlo y/o modificarlo
+# bajo los términos de la Licencia Pública General de GNU publicada por
+# la Free Software Foundation, ya sea la versión 3 de la Licencia o
+# (a su elección) cualquier versión posterior.
+# 
+# Este programa se distribuye con la esperanza de que sea útil,
+# pero SIN NINGUNA GARANTÍA, incluso sin la garantía implícita de
+# COMERCIABILIDAD o IDONEIDAD PARA UN PROPÓSITO PARTICULAR.
+# Consulte la Licencia Pública General de GNU para más detalles.
+# 
+# Usted debería haber recibido una copia de la Licencia Pública General de GNU
+# junto con este programa. De no ser así, véase <https://www.gnu.org/licenses/gpl-3.0.html>.
+# 
+# Nota: En caso de cualquier discrepancia entre las traducciones, la versión en inglés prevalecerá.
+#
+# endregion
+
+# endregion
+
+"""
+«test_regenerate_license_header_in_source_files.py»
+────────────────────────────────────────────────────────────
+Pruebas de «regenerate_license_header_in_source_files.py». Verifican que:
+- las vías rápidas de clasificación de las cabeceras (sobre bytes y por lotes) den el mismo resultado que el análisis
+  normal por líneas y que la lectura completa en modo texto de la versión original;
+- las reescrituras conserven la marca BOM, los saltos de línea y el cuerpo de los archivos, aunque la copia dentro del
+  núcleo deje de admitirse a mitad de camino, y no dejen archivos temporales;
+- un lenguaje registrado (con «register_language» o en «license_languages.json») no altere el análisis de los demás
+  y descarte el manifiesto incremental;
+- el modo incremental solo pode los subárboles que no cambiaron;
+- los reportes de las particiones («--shard») sumen lo mismo que una ejecución completa y que la partición falle si
+  no puede guardar el suyo;
+- el procesamiento en paralelo («--jobs») y la canalización asíncrona («--in-flight») entreguen los mismos resultados
+  que la ejecución secuencial;
+- «--tracked» y «--changed-since» solo consideren los archivos rastreados o cambiados según git;
+- «--check» termine con código 1 ante cualquier problema (y se detenga en el primero con «--fail-fast») sin escribir nada;
+- el parche de «--patch-out» se aplique con «git apply» y deje los mismos archivos que la corrección;
+- «--watch» no pierda los cambios hechos durante el procesamiento inicial y advierta (sin imprimir) cuando recurra al
+  sondeo;
+- las estadísticas («--stats» y «--stats-json») sumen los tiempos por fase y los bytes leídos y escritos de cada
+  archivo, y su JSON pueda volver a leerse;
+- el historial compare cada ejecución con la mediana de las previas del mismo árbol y modo, agrupándolas por la
+  cantidad de procesos efectivamente utilizados;
+- el servicio residente («--serve») responda lo mismo que una ejecución local.
+
+Uso desde línea de comando (en la carpeta «Source»):
+    python -m unittest test_regenerate_license_header_in_source_files
+"""
+
+import errno
+import io
+import json
+import os
+import contextlib
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import license_info
+import regenerate_license_header_in_source_files as license_tool
+from license_info import LICENSE_HEADERS
+
+# Semilla de las combinaciones aleatorias, para que las pruebas sean reproducibles.
+RANDOM_SEED = 20240601
+
+# Fragmentos que pueden preceder y seguir a la cabecera en los archivos sintéticos de las pruebas de equivalencia.
+PREFIX_PIECES = (
+    b"", b"\xef\xbb\xbf", b"#!/usr/bin/env python\n", b"  # -*- coding: utf-8 -*-\n", b"# vim: set ts=4:\r\n",
+    b"\r", b"\r# vim: x\n", b"#!x\r", b"#!a\rb\n", b"\n", b"\r\n", b" \t\n", b"\x0c#!y\n", b"code\n", b" "
+)
+SUFFIX_PIECES = (
+    b"", b"\n", b"\r\n", b"\r", b" ", b"\t\n\n", b"x", b"\rx", b" code", b"// c\n", b"# c\n", b"* c\n",
+    b"class A {}\n", b"\xc3\xb1\n", b"~", b"\n*x"
+)
+
+# Línea de comentario que, insertada en la cabecera, la deja desactualizada.
+STALE_COMMENT_LINES = {".cs": b"// Texto obsoleto.\n", ".py": b"# Texto obsoleto.\n"}
+
+def is_current_by_slow_path(data: bytes, license_config: Dict[str, Any]) -> bool:
+    """
+    «Clasifica un archivo con la vía normal»: divide el prefijo en líneas («read_header_prefix») y compara la
+    cabecera existente con la esperada.
+
+    Argumentos:
+        «data» (bytes): Contenido completo del archivo.
+        «license_config» (Dict[str, Any]): Configuración de la licencia de la extensión del archivo («LICENSE_HEADERS»).
+
+    Retorna:
+        «bool»: True si la cabecera está actualizada; False en caso contrario.
+    """
+    source_file = io.BytesIO(data)
+    header_prefix = license_tool.read_header_prefix(source_file, license_config["marker"], license_config["comment_prefixes"], source_file.read(license_tool.HEADER_PREFIX_SIZE))
+    existing_header = header_prefix.existing_header
+    return existing_header is not None and existing_header.strip() == license_config["header"].strip()
+
+def classify_by_full_text(data: bytes, license_config: Dict[str, Any]) -> str:
+    """
+    «Clasifica un archivo como la versión original»: lee el archivo completo en modo texto (los saltos CRLF y CR se
+    convierten en LF) y compara la cabecera existente («extract_existing_header») con la esperada.
+
+    Argumentos:
+        «data» (bytes): Contenido completo del archivo (UTF-8 sin marca BOM).
+        «license_config» (Dict[str, Any]): Configuración de la licencia de la extensión del archivo («LICENSE_HEADERS»).
+
+    Retorna:
+        «str»: «STATUS_CURRENT», «STATUS_MISSING» o «STATUS_STALE».
+    """
+    file_content = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8").read()
+    _, existing_header, _ = license_tool.extract_existing_header(file_content, license_config["marker"], license_config["comment_prefixes"])
+    if existing_header is None:
+        return license_tool.STATUS_MISSING
+    if existing_header.strip() != license_config["header"].strip():
+        return license_tool.STATUS_STALE
+    return license_tool.STATUS_CURRENT
+
+def create_sample_file(random_generator: random.Random, file_extension: str) -> bytes:
+    """
+    «Crea el contenido de un archivo sintético» combinando fragmentos al azar antes y después de la cabecera, que puede
+    estar actualizada (con LF o CRLF), desactualizada o ausente.
+
+    Argumentos:
+        «random_generator» (random.Random): Generador de números aleatorios.
+        «file_extension» (str): Extensión del archivo («.cs» o «.py»).
+
+    Retorna:
+        «bytes»: Contenido del archivo.
+    """
+    license_config = LICENSE_HEADERS[file_extension]
+    prefix = b"".join(random_generator.choice(PREFIX_PIECES) for _ in range(random_generator.randint(0, 3)))
+    suffix = b"".join(random_generator.choice(SUFFIX_PIECES) for _ in range(random_generator.randint(0, 4)))
+    header_kind = random_generator.randrange(4)
+    if header_kind == 0:
+        header_bytes = license_config["header_bytes"]
+    elif header_kind == 1:
+        header_bytes = license_config["header_bytes_crlf"]
+    elif header_kind == 2:
+        header_bytes = license_config["header_bytes"].replace(b"\n", b"\n" + STALE_COMMENT_LINES[file_extension], 1)
+    else:
+        header_bytes = b""
+    return prefix + header_bytes + suffix
+
+def write_source_files(root_directory: str, file_contents: Dict[str, bytes]) -> None:
+    """
+    «Escribe los archivos de un árbol de prueba».
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz del árbol.
+        «file_contents» (Dict[str, bytes]): Contenido de cada archivo, indexado por su ruta relativa (con separador «/»).
+    """
+    for relative_path, data in file_contents.items():
+        full_file_path = os.path.join(root_directory, *relative_path.split("/"))
+        os.makedirs(os.path.dirname(full_file_path), exist_ok=True)
+        with open(full_file_path, "wb") as source_file:
+            source_file.write(data)
+
+def install_license_tool(root_directory: str) -> str:
+    """
+    «Copia la herramienta en la carpeta «Source» de un árbol de prueba», que así pasa a ser su directorio raíz
+    (como en este repositorio) y puede ejecutarse desde la línea de comando.
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz del árbol.
+
+    Retorna:
+        «str»: Ruta de la copia de «regenerate_license_header_in_source_files.py».
+    """
+    source_directory = os.path.join(root_directory, "Source")
+    os.makedirs(source_directory, exist_ok=True)
+    for module_file in (license_tool.__file__, sys.modules["license_info"].__file__):
+        shutil.copy(module_file, source_directory)
+    return os.path.join(source_directory, os.path.basename(license_tool.__file__))
+
+def run_license_tool(root_directory: str, *arguments: str) -> "subprocess.CompletedProcess[str]":
+    """
+    «Ejecuta la herramienta desde la línea de comando» sobre un árbol de prueba (ver «install_license_tool»).
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz del árbol.
+        «arguments» (str): Argumentos de la línea de comando.
+
+    Retorna:
+        «subprocess.CompletedProcess[str]»: Proceso terminado, con su código de salida y su salida estándar.
+    """
+    tool_path = install_license_tool(root_directory)
+    environment = {**os.environ, "PYTHONIOENCODING": "utf-8"}
+    return subprocess.run([sys.executable, tool_path, *arguments], cwd=root_directory, env=environment, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, encoding="utf-8", timeout=120)
+
+class FindCurrentHeaderEndTests(unittest.TestCase):
+    """Pruebas de la vía rápida sobre bytes («find_current_header_end» y «match_current_header»)."""
+
+    def assert_same_classification(self, data: bytes, file_extension: str) -> None:
+        """Verifica que la vía rápida, la expresión de los lotes y la vía normal clasifiquen igual un archivo completo."""
+        license_config = LICENSE_HEADERS[file_extension]
+        code_start = license_tool.find_current_header_end(data, license_config, True)
+        message = f"{file_extension}: {data[:40]!r}...{data[-40:]!r}"
+        self.assertEqual(license_tool.match_current_header(bytearray(data), 0, len(data), license_config, file_extension), code_start, message)
+        if code_start is not None:
+            self.assertTrue(is_current_by_slow_path(data, license_config), message)
+
+    def test_bare_carriage_return_ends_special_lines(self) -> None:
+        for file_extension in (".cs", ".py"):
+            header_bytes = LICENSE_HEADERS[file_extension]["header_bytes"]
+            for prefix in (b"\r#!/usr/bin/env python\n", b"#!x\rcode\n", b"\r\r# -*- coding: utf-8 -*-\n"):
+                with self.subTest(file_extension=file_extension, prefix=prefix):
+                    data = prefix + header_bytes + b"\ncode\n"
+                    self.assertIsNone(license_tool.find_current_header_end(data, LICENSE_HEADERS[file_extension], True))
+                    self.assertFalse(is_current_by_slow_path(data, LICENSE_HEADERS[file_extension]))
+                    self.assert_same_classification(data, file_extension)
+
+    def test_carriage_return_line_ends_in_special_lines(self) -> None:
+        for file_extension in (".cs", ".py"):
+            data = b"#!/usr/bin/env python\r# -*- coding: utf-8 -*-\r\r" + LICENSE_HEADERS[file_extension]["header_bytes"] + b"\ncode\n"
+            with self.subTest(file_extension=file_extension):
+                self.assertIsNotNone(license_tool.find_current_header_end(data, LICENSE_HEADERS[file_extension], True))
+                self.assert_same_classification(data, file_extension)
+
+    def test_fast_path_matches_slow_path(self) -> None:
+        random_generator = random.Random(RANDOM_SEED)
+        for file_extension in (".cs", ".py"):
+            license_config = LICENSE_HEADERS[file_extension]
+            for _ in range(2000):
+                prefix = b"".join(random_generator.choice(PREFIX_PIECES) for _ in range(random_generator.randint(0, 3)))
+                header_bytes = license_config["header_bytes"] if random_generator.random() < 0.5 else license_config["header_bytes_crlf"]
+                suffix = b"".join(random_generator.choice(SUFFIX_PIECES) for _ in range(random_generator.randint(0, 4)))
+                self.assert_same_classification(prefix + header_bytes + suffix, file_extension)
+
+class HeaderClassificationTests(unittest.TestCase):
+    """Pruebas de equivalencia entre la verificación archivo por archivo, por lotes y la lectura completa original."""
+
+    def test_batch_matches_per_file_and_full_text(self) -> None:
+        random_generator = random.Random(RANDOM_SEED)
+        file_contents = {}
+        for index in range(600):
+            file_extension = (".cs", ".py")[index % 2]
+            file_contents[f"dir{index % 7}/file{index}{file_extension}"] = create_sample_file(random_generator, file_extension)
+        file_contents["large.cs"] = LICENSE_HEADERS[".cs"]["header_bytes"] + b"\n" + b"// Comentario.\n" * 2000
+        file_contents["large_code.cs"] = LICENSE_HEADERS[".cs"]["header_bytes"] + b"\n" + b"var x = 1;\n" * 2000
+
+        with tempfile.TemporaryDirectory() as root_directory:
+            write_source_files(root_directory, file_contents)
+            relative_paths = sorted(file_contents)
+            source_files = [os.path.join(root_directory, *relative_path.split("/")) for relative_path in relative_paths]
+            batch_results = license_tool.check_source_file_batch(source_files, root_directory, [None] * len(source_files), with_cache_entries=True)
+            statuses = {license_tool.STATUS_CURRENT: 0, license_tool.STATUS_MISSING: 0, license_tool.STATUS_STALE: 0}
+
+            for relative_path, full_file_path, batch_result in zip(relative_paths, source_files, batch_results):
+                data = file_contents[relative_path]
+                license_config = LICENSE_HEADERS[os.path.splitext(relative_path)[1]]
+                file_result = license_tool.process_source_file(full_file_path, root_directory, check_only=True)
+                with self.subTest(relative_path=relative_path, data=data[:40]):
+                    self.assertEqual(batch_result.status, file_result.status)
+                    self.assertEqual(batch_result.file_key, file_result.file_key)
+                    self.assertEqual(batch_result.cache_entry is None, file_result.cache_entry is None)
+                    # La lectura original no omite la marca BOM y divide las líneas también en «\x0c».
+                    if not data.startswith(license_tool.UTF8_BOM) and b"\x0c" not in data:
+                        self.assertEqual(file_result.status, classify_by_full_text(data, license_config))
+                statuses[file_result.status] = statuses.get(file_result.status, 0) + 1
+
+            # Las combinaciones cubren los tres estados.
+            self.assertTrue(all(statuses[status] > 0 for status in (license_tool.STATUS_CURRENT, license_tool.STATUS_MISSING, license_tool.STATUS_STALE)), statuses)
+
+def read_file_bytes(full_file_path: str) -> bytes:
+    """«Lee el contenido completo de un archivo» en modo binario."""
+    with open(full_file_path, "rb") as source_file:
+        return source_file.read()
+
+class RewriteRoundTripTests(unittest.TestCase):
+    """Pruebas de las reescrituras de archivos con marca BOM y saltos de línea CRLF."""
+
+    # Archivos a reescribir: contenido original, inicio que debe conservarse y cuerpo que debe conservarse byte a byte.
+    REWRITE_CASES = {
+        "bom_crlf_missing.py": (b"\xef\xbb\xbf#!/usr/bin/env python\r\n", b"x = 1\r\n\r\nprint(x)\r\n"),
+        "bom_crlf_stale.cs": (b"\xef\xbb\xbf", b"\r\nnamespace A;\r\n"),
+        "crlf_missing.cs": (b"", b"using System;\r\n\r\nnamespace A;\r\n"),
+        "lf_stale.py": (b"# -*- coding: utf-8 -*-\n", b"\nx = 1\n"),
+        "lf_missing.py": (b"", b"x = 1\n"),
+    }
+
+    def create_original(self, file_name: str) -> bytes:
+        """Retorna el contenido original de un caso: las líneas preservadas, la cabecera desactualizada (si corresponde) y el cuerpo."""
+        preserved, body = self.REWRITE_CASES[file_name]
+        file_extension = os.path.splitext(file_name)[1]
+        if "_stale" not in file_name:
+            return preserved + body
+        key = "header_bytes_crlf" if "crlf" in file_name else "header_bytes"
+        newline = b"\r\n" if "crlf" in file_name else b"\n"
+        stale_line = STALE_COMMENT_LINES[file_extension].replace(b"\n", newline)
+        return preserved + LICENSE_HEADERS[file_extension][key].replace(newline, newline + stale_line, 1) + newline + body
+
+    def test_rewrite_preserves_bom_line_endings_and_body(self) -> None:
+        with tempfile.TemporaryDirectory() as root_directory:
+            for file_name, (preserved, body) in self.REWRITE_CASES.items():
+                full_file_path = os.path.join(root_directory, file_name)
+                write_source_files(root_directory, {file_name: self.create_original(file_name)})
+                with self.subTest(file_name=file_name):
+                    result = license_tool.process_source_file(full_file_path, root_directory)
+                    self.assertEqual(result.status, license_tool.STATUS_STALE if "_stale" in file_name else license_tool.STATUS_MISSING)
+                    self.assertTrue(result.file_updated)
+                    rewritten = read_file_bytes(full_file_path)
+                    self.assertTrue(rewritten.startswith(preserved))
+                    self.assertEqual(rewritten.count(license_tool.UTF8_BOM), preserved.count(license_tool.UTF8_BOM))
+                    self.assertTrue(rewritten.endswith(body))
+                    if b"\r\n" in body:
+                        self.assertEqual(rewritten.count(b"\n"), rewritten.count(b"\r\n"))
+                        self.assertIn(LICENSE_HEADERS[os.path.splitext(file_name)[1]]["header_bytes_crlf"], rewritten)
+                    else:
+                        self.assertNotIn(b"\r", rewritten)
+
+                    # La cabecera reescrita queda actualizada y una nueva pasada no modifica el archivo.
+                    self.assertEqual(license_tool.process_source_file(full_file_path, root_directory, check_only=True).status, license_tool.STATUS_CURRENT)
+                    self.assertFalse(license_tool.process_source_file(full_file_path, root_directory).file_updated)
+                    self.assertEqual(read_file_bytes(full_file_path), rewritten)
+
+    def test_batched_writes_match_immediate_writes(self) -> None:
+        with tempfile.TemporaryDirectory() as immediate_root, tempfile.TemporaryDirectory() as batched_root:
+            file_contents = {file_name: self.create_original(file_name) for file_name in self.REWRITE_CASES}
+            write_source_files(immediate_root, file_contents)
+            write_source_files(batched_root, file_contents)
+            immediate_results = list(license_tool.iter_license_header_results(immediate_root))
+            batched_results = list(license_tool.iter_license_header_results(batched_root, batch_writes=True))
+            self.assertEqual(sum(result.file_updated for result in immediate_results), len(file_contents))
+            self.assertEqual(sum(result.file_updated for result in batched_results), len(file_contents))
+            for file_name in file_contents:
+                with self.subTest(file_name=file_name):
+                    self.assertEqual(read_file_bytes(os.path.join(batched_root, file_name)), read_file_bytes(os.path.join(immediate_root, file_name)))
+
+@unittest.skipIf(shutil.which("git") is None, "git no está instalado")
+def fail_after_first_chunk(copy_function: Any, count_position: int, failure_errno: int = errno.EXDEV) -> Any:
+    """Retorna un reemplazo de «copy_function» que copia un solo bloque de «COPY_BUFFER_SIZE» y luego falla con «failure_errno»."""
+    calls = []
+
+    def copy_chunk(*arguments: Any) -> int:
+        calls.append(arguments)
+        if len(calls) > 1:
+            raise OSError(failure_errno, os.strerror(failure_errno))
+        arguments = list(arguments)
+        arguments[count_position] = min(arguments[count_position], license_tool.COPY_BUFFER_SIZE)
+        return copy_function(*arguments)
+
+    return copy_chunk
+
+@unittest.skipUnless(hasattr(os, "copy_file_range"), "el sistema no admite «copy_file_range»")
+class BodyCopyFallbackTests(unittest.TestCase):
+    """Pruebas de la cadena de copia del cuerpo («copy_file_range», «sendfile» y «shutil.copyfileobj»)."""
+
+    FILE_NAME = "large.py"
+
+    def setUp(self) -> None:
+        # Cuerpo de varios bloques, para que la copia se interrumpa a mitad de camino.
+        self.original = b"".join(b"value_%d = %d\n" % (index, index) for index in range(200000))
+        self.assertGreater(len(self.original), 3 * license_tool.COPY_BUFFER_SIZE)
+        with tempfile.TemporaryDirectory() as reference_root:
+            write_source_files(reference_root, {self.FILE_NAME: self.original})
+            self.assertTrue(license_tool.process_source_file(os.path.join(reference_root, self.FILE_NAME), reference_root).file_updated)
+            self.expected = read_file_bytes(os.path.join(reference_root, self.FILE_NAME))
+
+    def rewrite(self, root_directory: str) -> license_tool.FileProcessingResult:
+        """Reescribe el archivo de prueba del árbol y retorna su resultado."""
+        write_source_files(root_directory, {self.FILE_NAME: self.original})
+        return license_tool.process_source_file(os.path.join(root_directory, self.FILE_NAME), root_directory)
+
+    def test_unsupported_copy_falls_back_without_losing_bytes(self) -> None:
+        fallback_cases = [("sendfile", {"copy_file_range": 2})]
+        if license_tool.sendfile_chunk in license_tool.ZERO_COPY_FUNCTIONS:
+            fallback_cases.append(("copyfileobj", {"copy_file_range": 2, "sendfile": 3}))
+        for expected_fallback, failing_functions in fallback_cases:
+            with self.subTest(expected_fallback=expected_fallback), tempfile.TemporaryDirectory() as root_directory, contextlib.ExitStack() as stack:
+                for function_name, count_position in failing_functions.items():
+                    stack.enter_context(mock.patch.object(os, function_name, fail_after_first_chunk(getattr(os, function_name), count_position)))
+                copyfileobj = stack.enter_context(mock.patch.object(license_tool.shutil, "copyfileobj", wraps=shutil.copyfileobj))
+                result = self.rewrite(root_directory)
+                self.assertTrue(result.file_updated, result.messages)
+                self.assertEqual(read_file_bytes(os.path.join(root_directory, self.FILE_NAME)), self.expected)
+                self.assertEqual(copyfileobj.called, expected_fallback == "copyfileobj")
+                self.assertEqual(os.listdir(root_directory), [self.FILE_NAME])
+
+    def test_failed_copy_keeps_original_and_removes_temporary_file(self) -> None:
+        with tempfile.TemporaryDirectory() as root_directory:
+            with mock.patch.object(os, "copy_file_range", fail_after_first_chunk(os.copy_file_range, 2, errno.EIO)):
+                result = self.rewrite(root_directory)
+            self.assertFalse(result.file_updated)
+            self.assertTrue(any("No se pudo escribir" in message for message in result.messages), result.messages)
+            self.assertEqual(read_file_bytes(os.path.join(root_directory, self.FILE_NAME)), self.original)
+            self.assertEqual(os.listdir(root_directory), [self.FILE_NAME])
+
+class PatchOutputTests(unittest.TestCase):
+    """Pruebas de los diff de las cabeceras («--diff») y del parche aplicable («--patch-out»)."""
+
+    def setUp(self) -> None:
+        round_trip_cases = RewriteRoundTripTests()
+        self.file_contents = {f"Cases/{file_name}": round_trip_cases.create_original(file_name) for file_name in RewriteRoundTripTests.REWRITE_CASES}
+        self.file_contents["Cases/current.cs"] = LICENSE_HEADERS[".cs"]["header_bytes_crlf"] + b"\r\nnamespace A;\r\n"
+        self.file_contents["Cases/no_final_newline.py"] = b"x = 1"
+
+    def test_patch_applies_and_matches_fix_run(self) -> None:
+        with tempfile.TemporaryDirectory() as patched_root, tempfile.TemporaryDirectory() as fixed_root, tempfile.TemporaryDirectory() as patch_directory:
+            write_source_files(patched_root, self.file_contents)
+            write_source_files(fixed_root, self.file_contents)
+            patch_file_path = os.path.join(patch_directory, "license.patch")
+            printed_output = io.StringIO()
+            with contextlib.redirect_stdout(printed_output):
+                check_summary = license_tool.regenerate_license_headers(patched_root, check_only=True, show_diff=True, patch_file_path=patch_file_path)
+                fix_summary = license_tool.regenerate_license_headers(fixed_root)
+
+            # La verificación con «--diff» no modifica ningún archivo.
+            for relative_path, data in self.file_contents.items():
+                self.assertEqual(read_file_bytes(os.path.join(patched_root, *relative_path.split("/"))), data, relative_path)
+            self.assertEqual(check_summary["files_updated"], 0)
+            self.assertEqual(fix_summary["files_updated"], len(self.file_contents) - 1)
+            self.assertEqual(printed_output.getvalue().count("diff --git "), fix_summary["files_updated"])
+
+            # El parche se aplica y deja los mismos archivos que la corrección.
+            for git_arguments in (["apply", "--check"], ["apply"]):
+                git_process = subprocess.run(["git", *git_arguments, patch_file_path], cwd=patched_root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, encoding="utf-8")
+                self.assertEqual(git_process.returncode, 0, git_process.stdout)
+            for relative_path in self.file_contents:
+                full_path = os.path.join(*relative_path.split("/"))
+                self.assertEqual(read_file_bytes(os.path.join(patched_root, full_path)), read_file_bytes(os.path.join(fixed_root, full_path)), relative_path)
+
+# Origen del resultado de un archivo en el modo incremental.
+SOURCE_PRUNED = "podado"  # Subárbol podado: el archivo no se consultó.
+SOURCE_MANIFEST = "manifiesto"  # Entrada vigente del manifiesto: el archivo no se leyó.
+SOURCE_READ = "lectura"  # El archivo se leyó.
+
+def run_incremental_check(root_directory: str, cache_file_path: str) -> Dict[str, Tuple[str, str]]:
+    """
+    «Verifica un árbol en modo incremental» y clasifica el origen de cada resultado.
+
+    Argumentos:
+        «root_directory» (str): Directorio raíz del árbol.
+        «cache_file_path» (str): Ruta del manifiesto incremental.
+
+    Retorna:
+        «Dict[str, Tuple[str, str]]»: Estado y origen («SOURCE_*») del resultado de cada archivo, indexados por su
+            ruta relativa (con separador «/»).
+    """
+    results = {}
+    for result in license_tool.iter_license_header_results(root_directory, cache_file_path=cache_file_path, check_only=True):
+        if not result.phase_seconds:
+            source = SOURCE_PRUNED
+        elif license_tool.PHASE_MANIFEST in result.phase_seconds and result.bytes_read == 0:
+            source = SOURCE_MANIFEST
+        else:
+            source = SOURCE_READ
+        results[os.path.relpath(result.file_path, root_directory).replace(os.sep, "/")] = (result.status, source)
+    return results
+
+@contextlib.contextmanager
+def isolated_language_registry() -> Iterator[None]:
+    """
+    «Aísla el registro de lenguajes de «license_info»» durante una prueba: al terminar se restauran los lenguajes
+    registrados y se avanza la revisión del registro, para que ningún valor derivado calculado durante la prueba se reutilice.
+    """
+    try:
+        with mock.patch.dict(license_info.LANGUAGES), mock.patch.dict(license_info.EXTENSION_LANGUAGES), mock.patch.dict(license_info._generated_license_info):
+            yield
+    finally:
+        license_info._registry_revision += 1
+
+# Estilo de comentarios de un lenguaje adicional cuyo inicio de comentario («--») es código válido en C# y en Python.
+SQL_STYLE = {"line_comment": "-- ", "block_start": "--", "block_line": "-- ", "block_end": "--", "region_start": "-- region", "region_end": "-- endregion"}
+
+class LanguageRegistryTests(unittest.TestCase):
+    """Pruebas del registro extensible de lenguajes de «license_info»."""
+
+    # Archivos con la cabecera actualizada seguida de una línea de código que comienza con «--».
+    FILE_CONTENTS = {
+        "Program.cs": LICENSE_HEADERS[".cs"]["header_bytes"] + b"\n--count;\n",
+        "script.py": LICENSE_HEADERS[".py"]["header_bytes"] + b"\n--x\n",
+    }
+
+    def assert_files_current(self, root_directory: str) -> None:
+        """Verifica que los archivos de «FILE_CONTENTS» se clasifiquen como actualizados por todas las vías."""
+        for file_name, data in self.FILE_CONTENTS.items():
+            license_config = LICENSE_HEADERS[os.path.splitext(file_name)[1]]
+            with self.subTest(file_name=file_name):
+                self.assertIsNotNone(license_tool.find_current_header_end(data, license_config, True))
+                self.assertTrue(is_current_by_slow_path(data, license_config))
+                self.assertEqual(license_tool.process_source_file(os.path.join(root_directory, file_name), root_directory, check_only=True).status, license_tool.STATUS_CURRENT)
+
+    def test_registered_language_does_not_change_other_languages(self) -> None:
+        license_fingerprint = license_info.get_license_fingerprint()
+        comment_prefixes = {extension: LICENSE_HEADERS[extension]["comment_prefixes"] for extension in (".cs", ".py")}
+        with tempfile.TemporaryDirectory() as root_directory:
+            write_source_files(root_directory, self.FILE_CONTENTS)
+            self.assert_files_current(root_directory)
+            with isolated_language_registry():
+                license_info.register_language("sql", [".SQL"], SQL_STYLE)
+                self.assertNotEqual(license_info.get_license_fingerprint(), license_fingerprint)
+                self.assertEqual(LICENSE_HEADERS[".sql"]["comment_prefixes"], ("--",))
+                self.assertTrue(LICENSE_HEADERS[".sql"]["header"].strip().startswith("-- region GPL v3 License Header"))
+                for extension, prefixes in comment_prefixes.items():
+                    self.assertEqual(LICENSE_HEADERS[extension]["comment_prefixes"], prefixes)
+                self.assert_files_current(root_directory)
+            self.assertNotIn(".sql", LICENSE_HEADERS)
+            self.assertEqual(license_info.get_license_fingerprint(), license_fingerprint)
+
+    def test_languages_config_change_invalidates_license_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as root_directory, tempfile.TemporaryDirectory() as config_directory:
+            write_source_files(root_directory, self.FILE_CONTENTS)
+            cache_file_path = os.path.join(config_directory, license_tool.LICENSE_CACHE_FILE_NAME)
+            run_incremental_check(root_directory, cache_file_path)
+            self.assertEqual({source for _, source in run_incremental_check(root_directory, cache_file_path).values()}, {SOURCE_PRUNED})
+
+            # Un lenguaje agregado en «license_languages.json» cambia la huella y descarta el manifiesto.
+            config_file_path = os.path.join(config_directory, "license_languages.json")
+            with open(config_file_path, "w", encoding="utf-8") as config_file:
+                json.dump({"sql": {"extensions": [".sql"], "style": SQL_STYLE}}, config_file)
+            with isolated_language_registry(), mock.patch.object(license_info, "LANGUAGES_CONFIG_FILE", config_file_path), mock.patch.object(license_info, "_configured_languages_loaded", False):
+                results = run_incremental_check(root_directory, cache_file_path)
+                self.assertIn(".sql", LICENSE_HEADERS)
+            self.assertEqual(results, {file_name: (license_tool.STATUS_CURRENT, SOURCE_READ) for file_name in self.FILE_CONTENTS})
+
+    def test_invalid_languages_config_is_reported(self) -> None:
+        with tempfile.TemporaryDirectory() as config_directory:
+            config_file_path = os.path.join(config_directory, "license_languages.json")
+            for config_text in ('{"sql": {"extensions": [".sql"]}}', '{"sql": {"extensions": [".sql"], "style": "--"}}', "{"):
+                with self.subTest(config_text=config_text), isolated_language_registry():
+                    with open(config_file_path, "w", encoding="utf-8") as config_file:
+                        config_file.write(config_text)
+                    with self.assertRaises(license_info.LicenseConfigError):
+                        license_info.load_languages_config(config_file_path)
+
+class IncrementalPruningTests(unittest.TestCase):
+    """Pruebas de la poda de subárboles sin cambios del modo incremental («--incremental»)."""
+
+    def setUp(self) -> None:
+        temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary_directory.cleanup)
+        self.root_directory = temporary_directory.name
+        self.cache_file_path = os.path.join(self.root_directory, license_tool.LICENSE_CACHE_FILE_NAME)
+        self.file_contents = {}
+        for relative_path in ("root.cs", "a/one.cs", "a/two.py", "a/b/three.cs", "a/b/four.py", "c/five.cs", "c/d/six.py"):
+            header_bytes = LICENSE_HEADERS[os.path.splitext(relative_path)[1]]["header_bytes"]
+            self.file_contents[relative_path] = header_bytes + f"\nvalue = \"{relative_path}\"\n".encode("utf-8")
+        write_source_files(self.root_directory, self.file_contents)
+
+        # Los directorios quedan con un «mtime» antiguo, para que su listado se reutilice en los recorridos siguientes.
+        for directory_path, _, _ in os.walk(self.root_directory):
+            os.utime(directory_path, ns=(0, os.stat(directory_path).st_mtime_ns - 60 * 10**9))
+
+        # Primera pasada: se leen todos los archivos; segunda pasada: se poda el árbol completo.
+        first_results = run_incremental_check(self.root_directory, self.cache_file_path)
+        self.assertEqual(first_results, {relative_path: (license_tool.STATUS_CURRENT, SOURCE_READ) for relative_path in self.file_contents})
+
+    def full_path(self, relative_path: str) -> str:
+        """Retorna la ruta completa de un archivo del árbol de prueba."""
+        return os.path.join(self.root_directory, *relative_path.split("/"))
+
+    def edit_file(self, relative_path: str, data: bytes) -> None:
+        """Reescribe un archivo del árbol de prueba con un «mtime» distinto del verificado."""
+        file_stat = os.stat(self.full_path(relative_path))
+        write_source_files(self.root_directory, {relative_path: data})
+        os.utime(self.full_path(relative_path), ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10**9))
+
+    def assert_sources(self, results: Dict[str, Tuple[str, str]], expected_sources: Dict[str, str], default_source: str) -> None:
+        """Verifica el origen del resultado de cada archivo («default_source» para los no indicados)."""
+        self.assertEqual({relative_path: source for relative_path, (_, source) in results.items()}, {relative_path: expected_sources.get(relative_path, default_source) for relative_path in results})
+
+    def test_unchanged_tree_is_pruned(self) -> None:
+        results = run_incremental_check(self.root_directory, self.cache_file_path)
+        self.assertEqual(results, {relative_path: (license_tool.STATUS_CURRENT, SOURCE_PRUNED) for relative_path in self.file_contents})
+
+    def test_file_edit_reprocesses_its_directory_and_ancestors(self) -> None:
+        self.edit_file("a/b/three.cs", self.file_contents["a/b/three.cs"] + b"var x = 1;\n")
+        results = run_incremental_check(self.root_directory, self.cache_file_path)
+        self.assertTrue(all(status == license_tool.STATUS_CURRENT for status, _ in results.values()))
+        self.assert_sources(results, {
+            "root.cs": SOURCE_MANIFEST, "a/one.cs": SOURCE_MANIFEST, "a/two.py": SOURCE_MANIFEST,
+            "a/b/three.cs": SOURCE_READ, "a/b/four.py": SOURCE_MANIFEST
+        }, SOURCE_PRUNED)
+
+        # Una vez verificado el cambio, el árbol completo vuelve a podarse.
+        results = run_incremental_check(self.root_directory, self.cache_file_path)
+        self.assert_sources(results, {}, SOURCE_PRUNED)
+
+    def test_removed_header_is_reported_until_restored(self) -> None:
+        self.edit_file("c/d/six.py", b"x = 1\n")
+        for _ in range(2):
+            results = run_incremental_check(self.root_directory, self.cache_file_path)
+            self.assertEqual(results["c/d/six.py"], (license_tool.STATUS_MISSING, SOURCE_READ))
+            self.assertEqual(results["a/b/three.cs"], (license_tool.STATUS_CURRENT, SOURCE_PRUNED))
+            self.assertEqual(results["c/five.cs"], (license_tool.STATUS_CURRENT, SOURCE_MANIFEST))
+
+        self.edit_file("c/d/six.py", self.file_contents["c/d/six.py"])
+        results = run_incremental_check(self.root_directory, self.cache_file_path)
+        self.assertEqual(results["c/d/six.py"], (license_tool.STATUS_CURRENT, SOURCE_READ))
+
+    def test_new_file_is_processed(self) -> None:
+        write_source_files(self.root_directory, {"c/d/seven.cs": b"namespace A;\n"})
+        results = run_incremental_check(self.root_directory, self.cache_file_path)
+        self.assertEqual(set(results), set(self.file_contents) | {"c/d/seven.cs"})
+        self.assertEqual(results["c/d/seven.cs"], (license_tool.STATUS_MISSING, SOURCE_READ))
+        self.assert_sources(results, {
+            "root.cs": SOURCE_MANIFEST, "c/five.cs": SOURCE_MANIFEST, "c/d/six.py": SOURCE_MANIFEST, "c/d/seven.cs": SOURCE_READ
+        }, SOURCE_PRUNED)
+
+    def test_deleted_file_and_directory_are_dropped(self) -> None:
+        os.remove(self.full_path("a/one.cs"))
+        shutil.rmtree(self.full_path("c/d"))
+        results = run_incremental_check(self.root_directory, self.cache_file_path)
+        self.assertEqual(set(results), set(self.file_contents) - {"a/one.cs", "c/d/six.py"})
+        self.assert_sources(results, {"root.cs": SOURCE_MANIFEST, "a/two.py": SOURCE_MANIFEST, "c/five.cs": SOURCE_MANIFEST}, SOURCE_PRUNED)
+
+        # Los directorios que quedan vuelven a podarse en la pasada siguiente.
+        results = run_incremental_check(self.root_directory, self.cache_file_path)
+        self.assert_sources(results, {}, SOURCE_PRUNED)
+
+    def test_ignored_directory_is_not_scanned(self) -> None:
+        write_source_files(self.root_directory, {"a/obj/generated.cs": b"namespace A;\n"})
+        results = run_incremental_check(self.root_directory, self.cache_file_path)
+        # El listado filtrado de «a» no cambia, por lo que su huella tampoco y el árbol completo sigue podado.
+        self.assertNotIn("a/obj/generated.cs", results)
+        self.assert_sources(results, {}, SOURCE_PRUNED)
+
+class ShardReportTests(unittest.TestCase):
+    """Pruebas de las particiones («--shard K/N») y de la combinación de sus reportes («--merge-reports»)."""
+
+    SHARD_COUNT = 3
+
+    def setUp(self) -> None:
+        random_generator = random.Random(RANDOM_SEED)
+        self.file_contents = {
+            f"dir{index % 5}/file{index}{('.cs', '.py')[index % 2]}": create_sample_file(random_generator, (".cs", ".py")[index % 2])
+            for index in range(90)
+        }
+        self.file_contents["binary.cs"] = b"\x00\x01\x02" * 100
+        self.file_contents["latin1.py"] = b"# Caf\xe9\n"
+
+    def run_shards(self, root_directory: str, reports_directory: str, check_only: bool) -> List[str]:
+        """Ejecuta cada partición sobre el árbol, guarda su reporte y retorna las rutas de los reportes."""
+        report_file_paths = []
+        for shard_number in range(1, self.SHARD_COUNT + 1):
+            shard = (shard_number, self.SHARD_COUNT)
+            with contextlib.redirect_stdout(io.StringIO()):
+                summary = license_tool.regenerate_license_headers(root_directory, check_only=check_only, shard=shard)
+            report_file_path = os.path.join(reports_directory, f"shard-{shard_number}.json")
+            license_tool.save_shard_report(report_file_path, shard, summary, check_only)
+            report_file_paths.append(report_file_path)
+        return report_file_paths
+
+    def test_merged_reports_match_full_run(self) -> None:
+        for check_only in (True, False):
+            with self.subTest(check_only=check_only), tempfile.TemporaryDirectory() as full_root, tempfile.TemporaryDirectory() as sharded_root, tempfile.TemporaryDirectory() as reports_directory:
+                write_source_files(full_root, self.file_contents)
+                write_source_files(sharded_root, self.file_contents)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    full_summary = license_tool.regenerate_license_headers(full_root, check_only=check_only)
+                report_file_paths = self.run_shards(sharded_root, reports_directory, check_only)
+
+                merged_summary, merged_check_only = license_tool.merge_shard_reports(report_file_paths)
+                self.assertEqual(merged_summary, full_summary)
+                self.assertEqual(merged_check_only, check_only)
+                self.assertEqual(sum(count for counter, count in full_summary.items() if counter != "files_updated"), len(self.file_contents))
+                self.assertGreater(full_summary["files_skipped"], 0)
+                for relative_path in self.file_contents:
+                    full_path = os.path.join(*relative_path.split("/"))
+                    self.assertEqual(read_file_bytes(os.path.join(sharded_root, full_path)), read_file_bytes(os.path.join(full_root, full_path)))
+
+    def test_incomplete_or_duplicated_reports_are_rejected(self) -> None:
+        with tempfile.TemporaryDirectory() as root_directory, tempfile.TemporaryDirectory() as reports_directory:
+            write_source_files(root_directory, self.file_contents)
+            report_file_paths = self.run_shards(root_directory, reports_directory, True)
+            with self.assertRaises(ValueError):
+                license_tool.merge_shard_reports(report_file_paths[:-1])
+            with self.assertRaises(ValueError):
+                license_tool.merge_shard_reports(report_file_paths + report_file_paths[:1])
+
+    def test_unsaved_report_fails_the_shard(self) -> None:
+        with tempfile.TemporaryDirectory() as root_directory:
+            # Solo contiene la herramienta instalada, cuyas «License Header's» están al día.
+            install_license_tool(root_directory)
+            report_file_path = os.path.join(root_directory, "missing-directory", "report.json")
+            shard_process = run_license_tool(root_directory, "--check", "--shard", "1/2", "--report-file", report_file_path)
+            self.assertEqual(shard_process.returncode, 2, shard_process.stdout)
+            self.assertIn("No se pudo guardar el reporte", shard_process.stdout)
+
+            # El reporte por defecto se guarda en el directorio actual.
+            shard_process = run_license_tool(root_directory, "--check", "--shard", "1/2")
+            self.assertEqual(shard_process.returncode, 0, shard_process.stdout)
+            self.assertTrue(os.path.isfile(os.path.join(root_directory, "license-report-1-of-2.json")))
+
+class SourceFileFilterTests(unittest.TestCase):
+    """Pruebas de los filtros previos de los archivos fuente."""
+
+    def test_description_lists_every_exclusion(self) -> None:
+        with tempfile.TemporaryDirectory() as root_directory:
+            with open(os.path.join(root_directory, license_tool.LICENSE_IGNORE_FILE_NAME), "w", encoding="utf-8") as ignore_file:
+                ignore_file.write("# Comentario.\nGenerated/\n")
+            source_filter = license_tool.create_source_file_filter(root_directory, ["*.tmp.cs"], 1024)
+            description = license_tool.describe_source_file_filter(source_filter)
+            for rule in (*license_tool.DEFAULT_IGNORE_RULES, "Generated/", "*.tmp.cs"):
+                self.assertIn(f"«{rule}»", description)
+            self.assertIn(license_tool.format_byte_count(1024), description)
+            self.assertNotIn("Comentario", description)
+            self.assertTrue(source_filter.is_ignored("Project/Form.Designer.cs"))
+            self.assertTrue(source_filter.is_ignored("Generated/Model.cs"))
+
+class PipelineEquivalenceTests(unittest.TestCase):
+    """Pruebas de equivalencia entre la ejecución secuencial y las alternativas que la aceleran."""
+
+    def setUp(self) -> None:
+        random_generator = random.Random(RANDOM_SEED)
+        self.file_contents = {
+            f"dir{index % 4}/sub{index % 3}/file{index}{('.cs', '.py')[index % 2]}": create_sample_file(random_generator, (".cs", ".py")[index % 2])
+            for index in range(120)
+        }
+
+    def assert_same_results(self, check_only: bool, **options: Any) -> None:
+        """Verifica que la ejecución con «options» entregue los mismos resultados, en el mismo orden, y deje los mismos archivos que la secuencial."""
+        with tempfile.TemporaryDirectory() as sequential_root, tempfile.TemporaryDirectory() as alternative_root:
+            write_source_files(sequential_root, self.file_contents)
+            write_source_files(alternative_root, self.file_contents)
+            sequential_results = [
+                (os.path.relpath(result.file_path, sequential_root), result.status, result.file_updated, result.messages)
+                for result in license_tool.iter_license_header_results(sequential_root, check_only=check_only)
+            ]
+            alternative_results = [
+                (os.path.relpath(result.file_path, alternative_root), result.status, result.file_updated, result.messages)
+                for result in license_tool.iter_license_header_results(alternative_root, check_only=check_only, **options)
+            ]
+            self.assertEqual(alternative_results, sequential_results)
+            for relative_path in self.file_contents:
+                full_path = os.path.join(*relative_path.split("/"))
+                self.assertEqual(read_file_bytes(os.path.join(alternative_root, full_path)), read_file_bytes(os.path.join(sequential_root, full_path)))
+
+    def test_parallel_matches_sequential(self) -> None:
+        # Se fuerza el uso de varios procesos aunque el equipo tenga un solo núcleo y el árbol sea pequeño.
+        with mock.patch.object(license_tool, "get_available_cpu_count", return_value=4), mock.patch.object(license_tool, "PARALLEL_CHECK_MIN_FILES_PER_JOB", 1):
+            for check_only in (True, False):
+                with self.subTest(check_only=check_only):
+                    self.assert_same_results(check_only, jobs=3)
+
+    def test_small_check_runs_sequentially(self) -> None:
+        with tempfile.TemporaryDirectory() as root_directory:
+            write_source_files(root_directory, self.file_contents)
+            with mock.patch.object(license_tool, "get_available_cpu_count", return_value=4), mock.patch.object(license_tool, "ProcessPoolExecutor", side_effect=AssertionError("se inició un grupo de procesos")):
+                results = list(license_tool.iter_license_header_results(root_directory, jobs=4, check_only=True))
+            self.assertEqual(len(results), len(self.file_contents))
+
+    def test_in_flight_matches_sequential(self) -> None:
+        for check_only in (True, False):
+            with self.subTest(check_only=check_only):
+                self.assert_same_results(check_only, in_flight=4)
+
+class StatisticsTests(unittest.TestCase):
+    """Pruebas de las estadísticas del proceso («--stats» y «--stats-json»)."""
+
+    # Archivos sin cabecera (que se reescriben completos) y un archivo con la cabecera actualizada, todos menores que el prefijo leído.
+    FILE_CONTENTS = {
+        "App/Program.cs": b"namespace App;\n",
+        "App/script.py": b"x = 1\n",
+        "App/Current.cs": LICENSE_HEADERS[".cs"]["header_bytes"] + b"\nnamespace App;\n"
+    }
+    REWRITTEN_FILES = ("App/Program.cs", "App/script.py")
+
+    def collect_statistics(self, root_directory: str, check_only: bool) -> Tuple[Dict[str, Any], List[license_tool.FileProcessingResult]]:
+        """Procesa el árbol registrando las estadísticas y retorna estas junto con el resultado de cada archivo."""
+        results = []
+
+        def accumulate_statistics(statistics: Dict[str, Any], result: license_tool.FileProcessingResult) -> None:
+            results.append(result)
+            original_accumulate_statistics(statistics, result)
+
+        original_accumulate_statistics = license_tool.accumulate_statistics
+        statistics = license_tool.create_statistics(slowest_file_count=2)
+        with mock.patch.object(license_tool, "accumulate_statistics", accumulate_statistics), contextlib.redirect_stdout(io.StringIO()):
+            license_tool.regenerate_license_headers(root_directory, check_only=check_only, statistics=statistics)
+        return statistics, results
+
+    def test_phase_totals_and_bytes_match_the_tree(self) -> None:
+        original_sizes = {relative_path: len(content) for relative_path, content in self.FILE_CONTENTS.items()}
+        for check_only in (True, False):
+            with self.subTest(check_only=check_only), tempfile.TemporaryDirectory() as root_directory:
+                write_source_files(root_directory, self.FILE_CONTENTS)
+                statistics, results = self.collect_statistics(root_directory, check_only)
+
+                self.assertEqual(statistics["files"], len(self.FILE_CONTENTS))
+                self.assertEqual(set(statistics["phase_seconds"]), set(license_tool.PHASE_LABELS))
+                for phase, seconds in statistics["phase_seconds"].items():
+                    if phase != license_tool.PHASE_DISCOVERY:
+                        self.assertAlmostEqual(seconds, sum(result.phase_seconds.get(phase, 0.0) for result in results), places=9)
+                self.assertGreater(statistics["phase_seconds"][license_tool.PHASE_DISCOVERY], 0.0)
+                self.assertLessEqual(sum(statistics["phase_seconds"].values()), statistics["wall_seconds"])
+                self.assertEqual(len(statistics["slowest_files"]), 2)
+
+                # Cada archivo se lee completo; al reescribirse, su cuerpo (aquí, todo el archivo) se vuelve a leer al copiarlo.
+                rewritten_files = () if check_only else self.REWRITTEN_FILES
+                self.assertEqual(statistics["bytes_read"], sum(original_sizes.values()) + sum(original_sizes[relative_path] for relative_path in rewritten_files))
+                self.assertEqual(statistics["bytes_written"], sum(os.path.getsize(os.path.join(root_directory, *relative_path.split("/"))) for relative_path in rewritten_files))
+                if not check_only:
+                    self.assertGreater(statistics["bytes_written"], sum(original_sizes[relative_path] for relative_path in rewritten_files))
+
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    license_tool.print_statistics(statistics)
+                for label in license_tool.PHASE_LABELS.values():
+                    self.assertIn(label, output.getvalue())
+                self.assertIn(license_tool.format_byte_count(statistics["bytes_read"]), output.getvalue())
+
+                statistics_file_path = os.path.join(root_directory, "stats.json")
+                license_tool.save_statistics(statistics_file_path, statistics)
+                with open(statistics_file_path, encoding="utf-8") as statistics_file:
+                    self.assertEqual(json.load(statistics_file), statistics)
+
+    def test_stats_json_option_saves_the_statistics(self) -> None:
+        with tempfile.TemporaryDirectory() as root_directory:
+            tool_path = install_license_tool(root_directory)
+            write_source_files(root_directory, self.FILE_CONTENTS)
+            statistics_file_path = os.path.join(root_directory, "stats.json")
+            tool_process = run_license_tool(root_directory, "--check", "--stats-json", statistics_file_path)
+            self.assertEqual(tool_process.returncode, 1, tool_process.stdout)
+            self.assertIn("Estadísticas del proceso", tool_process.stdout)
+
+            # Además de los archivos del árbol, se verifican las copias de la herramienta.
+            tool_file_paths = [tool_path, os.path.join(os.path.dirname(tool_path), "license_info.py")]
+            with open(statistics_file_path, encoding="utf-8") as statistics_file:
+                statistics = json.load(statistics_file)
+            self.assertEqual(statistics["files"], len(self.FILE_CONTENTS) + len(tool_file_paths))
+            self.assertEqual(statistics["bytes_written"], 0)
+            self.assertEqual(set(statistics["phase_seconds"]), set(license_tool.PHASE_LABELS))
+
+class HistoryTests(unittest.TestCase):
+    """Pruebas del historial de ejecuciones («--record-history») y de la detección de ejecuciones lentas."""
+
+    def create_record(self, wall_seconds: float, root_directory: str = "/arbol", check_only: bool = True, jobs: int = 1) -> Dict[str, Any]:
+        """Crea un registro del historial con el tiempo total y el grupo de comparación indicados."""
+        statistics = license_tool.create_statistics()
+        statistics["files"] = 100
+        statistics["jobs"] = jobs
+        license_tool.finish_statistics(statistics, wall_seconds)
+        return license_tool.create_history_record(root_directory, license_tool.create_summary(), statistics, check_only, False)
+
+    def test_slow_run_is_compared_with_median_of_same_tree_and_mode(self) -> None:
+        with tempfile.TemporaryDirectory() as history_directory:
+            history_file_path = os.path.join(history_directory, license_tool.LICENSE_HISTORY_FILE_NAME)
+            # Ejecuciones de otros árboles, modos o cantidades de procesos, mucho más lentas, que no deben influir.
+            for record in (self.create_record(10.0, root_directory="/otro"), self.create_record(10.0, check_only=False), self.create_record(10.0, jobs=4)):
+                license_tool.append_history_record(history_file_path, record)
+            self.assertIsNone(license_tool.get_history_baseline(license_tool.load_history_records(history_file_path), self.create_record(5.0)))
+
+            for wall_seconds in (1.0, 1.2, 1.1):
+                license_tool.append_history_record(history_file_path, self.create_record(wall_seconds))
+            with open(history_file_path, "a", encoding="utf-8") as history_file:
+                history_file.write('{"version": 1, "wall_seconds": \n')  # Línea de una ejecución interrumpida.
+            previous_records = license_tool.load_history_records(history_file_path)
+            self.assertEqual(len(previous_records), 6)
+
+            slow_record = self.create_record(1.1 * license_tool.HISTORY_SLOW_FACTOR + 0.01)
+            baseline_seconds = license_tool.get_history_baseline(previous_records, slow_record)
+            self.assertAlmostEqual(baseline_seconds, 1.1)
+            self.assertTrue(license_tool.is_slow_run(slow_record, baseline_seconds))
+            normal_record = self.create_record(1.1 * license_tool.HISTORY_SLOW_FACTOR - 0.01)
+            self.assertFalse(license_tool.is_slow_run(normal_record, license_tool.get_history_baseline(previous_records, normal_record)))
+
+            # Solo se consideran las últimas «HISTORY_MEDIAN_WINDOW» ejecuciones del grupo.
+            recent_records = previous_records + [self.create_record(3.0) for _ in range(license_tool.HISTORY_MEDIAN_WINDOW)]
+            self.assertAlmostEqual(license_tool.get_history_baseline(recent_records, slow_record), 3.0)
+
+    def test_jobs_records_effective_worker_count(self) -> None:
+        file_contents = {f"dir{index % 3}/file{index}.cs": b"namespace A;\n" for index in range(12)}
+        for check_only in (True, False):
+            with self.subTest(check_only=check_only), tempfile.TemporaryDirectory() as root_directory:
+                write_source_files(root_directory, file_contents)
+                statistics_by_jobs = {}
+                # Con un solo núcleo, «--jobs 4» se ejecuta secuencialmente y pertenece al mismo grupo que «--jobs 1».
+                with mock.patch.object(license_tool, "get_available_cpu_count", return_value=1):
+                    for jobs in (1, 4, 0):
+                        statistics_by_jobs[jobs] = license_tool.create_statistics()
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            license_tool.regenerate_license_headers(root_directory, jobs=jobs, check_only=check_only, statistics=statistics_by_jobs[jobs])
+                records = [self.create_record(1.0, root_directory, check_only, statistics["jobs"]) for statistics in statistics_by_jobs.values()]
+                self.assertEqual({statistics["jobs"] for statistics in statistics_by_jobs.values()}, {1})
+                self.assertEqual(len({license_tool.get_history_group(record) for record in records}), 1)
+
+                # Con varios núcleos, se registra la cantidad de procesos iniciados (limitada por la cantidad de archivos).
+                statistics = license_tool.create_statistics()
+                with mock.patch.object(license_tool, "get_available_cpu_count", return_value=64), mock.patch.object(license_tool, "PARALLEL_CHECK_MIN_FILES_PER_JOB", 1), contextlib.redirect_stdout(io.StringIO()):
+                    license_tool.regenerate_license_headers(root_directory, jobs=0, check_only=check_only, statistics=statistics)
+                self.assertEqual(statistics["jobs"], len(file_contents))
+
+class WatchTests(unittest.TestCase):
+    """Pruebas de la observación de cambios («--watch») con sondeo periódico."""
+
+    def test_changes_during_initial_pass_are_detected(self) -> None:
+        with tempfile.TemporaryDirectory() as root_directory:
+            write_source_files(root_directory, {"a.cs": b"namespace A;\n", "b.py": b"x = 1\n"})
+            with contextlib.redirect_stdout(io.StringIO()):
+                tree_watch = license_tool.start_watching_source_files(root_directory, poll_interval=0.01)
+
+            # Procesamiento inicial, que reescribe ambos archivos y durante el cual se edita uno de ellos y se crea otro.
+            written_states = {}
+            for result in license_tool.iter_license_header_results(root_directory):
+                self.assertTrue(result.file_updated)
+                written_states[result.file_path] = result.written_state
+                if result.file_path.endswith("b.py"):
+                    write_source_files(root_directory, {"b.py": b"y = 2\n", "c.cs": b"namespace C;\n"})
+            tree_watch.known_states.update(written_states)
+
+            # Solo se informan los cambios ajenos: la reescritura propia de «a.cs» no se vuelve a procesar.
+            changed_files = license_tool.wait_for_polled_changes(root_directory, tree_watch.known_states, tree_watch.poll_interval, 0.01, tree_watch.source_filter)
+            self.assertEqual({os.path.join(root_directory, file_name) for file_name in ("b.py", "c.cs")}, set(changed_files))
+            for full_file_path in changed_files:
+                license_tool.process_source_file(full_file_path, root_directory)
+            for file_name in ("a.cs", "b.py", "c.cs"):
+                with self.subTest(file_name=file_name):
+                    self.assertEqual(license_tool.process_source_file(os.path.join(root_directory, file_name), root_directory, check_only=True).status, license_tool.STATUS_CURRENT)
+
+    def test_polling_fallback_is_warned_not_printed(self) -> None:
+        class FailingObserver:
+            def schedule(self, *arguments: Any, **keyword_arguments: Any) -> None:
+                raise OSError("inotify watch limit reached")
+
+        with tempfile.TemporaryDirectory() as root_directory:
+            write_source_files(root_directory, {"a.cs": b"namespace A;\n"})
+            for observer_class, expected_message in ((None, "no está disponible"), (FailingObserver, "No se pudo observar")):
+                with self.subTest(observer_class=observer_class), mock.patch.object(license_tool, "Observer", observer_class):
+                    with contextlib.redirect_stdout(io.StringIO()) as output, self.assertWarns(license_tool.LicenseHeaderWarning) as warning_context:
+                        tree_watch = license_tool.start_watching_source_files(root_directory)
+                    self.assertEqual(output.getvalue(), "")
+                    self.assertIn(expected_message, "\n".join(str(warning.message) for warning in warning_context.warnings))
+                    self.assertIsNone(tree_watch.observer)
+                    self.assertEqual(tree_watch.poll_interval, license_tool.DEFAULT_WATCH_POLL_INTERVAL)
+                    self.assertIn(os.path.join(root_directory, "a.cs"), tree_watch.known_states)
+
+class CheckModeTests(unittest.TestCase):
+    """Pruebas del código de salida de la verificación («--check» y «--fail-fast»), en el que se basan los CI."""
+
+    # Archivos con la cabecera actualizada y archivos con cada tipo de problema.
+    CURRENT_FILES = {
+        "App/Program.cs": LICENSE_HEADERS[".cs"]["header_bytes"] + b"\nnamespace App;\n",
+        "App/script.py": b"#!/usr/bin/env python\r\n" + LICENSE_HEADERS[".py"]["header_bytes_crlf"] + b"\r\nx = 1\r\n",
+    }
+    PROBLEM_FILES = {
+        "missing": {"App/Missing.cs": b"namespace App;\n"},
+        "stale": {"App/stale.py": LICENSE_HEADERS[".py"]["header_bytes"].replace(b"\n", b"\n" + STALE_COMMENT_LINES[".py"], 1) + b"\nx = 1\n"},
+        "unreadable": {},
+    }
+
+    def create_tree(self, problems: Tuple[str, ...]) -> str:
+        """Crea un árbol temporal con los archivos actualizados y los problemas indicados; el archivo ilegible es un enlace roto."""
+        root_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root_directory)
+        write_source_files(root_directory, self.CURRENT_FILES)
+        for problem in problems:
+            write_source_files(root_directory, self.PROBLEM_FILES[problem])
+        if "unreadable" in problems:
+            os.symlink(os.path.join(root_directory, "missing-target.cs"), os.path.join(root_directory, "App", "Unreadable.cs"))
+        return root_directory
+
+    def run_check(self, problems: Tuple[str, ...], *arguments: str) -> "subprocess.CompletedProcess[str]":
+        """Ejecuta «--check» sobre un árbol con los problemas indicados y verifica que ningún archivo se haya modificado."""
+        root_directory = self.create_tree(problems)
+        app_directory = os.path.join(root_directory, "App")
+        file_states_before = {file_name: os.lstat(os.path.join(app_directory, file_name)) for file_name in os.listdir(app_directory)}
+        file_contents_before = {file_name: read_file_bytes(os.path.join(app_directory, file_name)) for file_name in file_states_before if file_name != "Unreadable.cs"}
+        check_process = run_license_tool(root_directory, "--check", *arguments)
+
+        # La verificación nunca escribe: los archivos conservan su contenido, su fecha de modificación y su inodo.
+        self.assertEqual(sorted(os.listdir(app_directory)), sorted(file_states_before))
+        for file_name, file_stat in file_states_before.items():
+            current_stat = os.lstat(os.path.join(app_directory, file_name))
+            self.assertEqual((current_stat.st_ino, current_stat.st_mtime_ns), (file_stat.st_ino, file_stat.st_mtime_ns), file_name)
+            if file_name in file_contents_before:
+                self.assertEqual(read_file_bytes(os.path.join(app_directory, file_name)), file_contents_before[file_name], file_name)
+        return check_process
+
+    def test_clean_tree_exits_zero(self) -> None:
+        check_process = self.run_check(())
+        self.assertEqual(check_process.returncode, 0, check_process.stdout)
+        self.assertIn("✅ Todas las «License Header's»", check_process.stdout)
+
+    def test_each_problem_exits_one(self) -> None:
+        for problem in self.PROBLEM_FILES:
+            with self.subTest(problem=problem):
+                check_process = self.run_check((problem,))
+                self.assertEqual(check_process.returncode, 1, check_process.stdout)
+                self.assertIn("❌ Se encontraron 1 archivos", check_process.stdout)
+
+    def test_fail_fast_stops_at_first_problem(self) -> None:
+        problems = tuple(self.PROBLEM_FILES)
+        full_process = self.run_check(problems)
+        self.assertEqual(full_process.returncode, 1)
+        self.assertIn(f"❌ Se encontraron {len(problems)} archivos", full_process.stdout)
+
+        fail_fast_process = self.run_check(problems, "--fail-fast")
+        self.assertEqual(fail_fast_process.returncode, 1)
+        self.assertIn("❌ Se encontraron 1 archivos", fail_fast_process.stdout)
+        self.assertIn("«--fail-fast»", fail_fast_process.stdout)
+
+@unittest.skipIf(shutil.which("git") is None, "git no está instalado")
+class GitDiscoveryTests(unittest.TestCase):
+    """Pruebas del descubrimiento de archivos mediante git («--tracked» y «--changed-since»)."""
+
+    def setUp(self) -> None:
+        self.root_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root_directory)
+        write_source_files(self.root_directory, {
+            ".gitignore": b"Generated/\n",
+            "App/Program.cs": b"namespace App;\n",
+            "App/Unchanged.cs": b"namespace App;\n",
+            "tools/script.py": b"x = 1\n",
+            "tools/removed.py": b"y = 2\n",
+        })
+        self.run_git("init", "-q")
+        self.run_git("add", "-A")
+        self.run_git("-c", "user.name=Test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "Inicial")
+
+        # Cambios posteriores: un archivo modificado, uno eliminado, uno nuevo sin rastrear y uno ignorado.
+        write_source_files(self.root_directory, {
+            "App/Program.cs": b"namespace App.Changed;\n",
+            "App/New.cs": b"namespace App;\n",
+            "Generated/Model.cs": b"namespace Generated;\n",
+        })
+        os.remove(os.path.join(self.root_directory, "tools", "removed.py"))
+
+    def run_git(self, *git_arguments: str) -> None:
+        """Ejecuta un comando de git en el repositorio de prueba."""
+        subprocess.run(["git", *git_arguments], cwd=self.root_directory, check=True, stdout=subprocess.DEVNULL)
+
+    def discover(self, **options: Any) -> List[str]:
+        """Descubre los archivos fuente y retorna sus rutas relativas (con separador «/»)."""
+        source_files = license_tool.discover_source_files(self.root_directory, **options)
+        return sorted(os.path.relpath(full_file_path, self.root_directory).replace(os.sep, "/") for full_file_path in source_files)
+
+    def test_tracked_skips_untracked_and_ignored_files(self) -> None:
+        self.assertEqual(self.discover(), ["App/New.cs", "App/Program.cs", "App/Unchanged.cs", "Generated/Model.cs", "tools/script.py"])
+        self.assertEqual(self.discover(git_tracked=True), ["App/Program.cs", "App/Unchanged.cs", "tools/script.py"])
+
+    def test_changed_since_lists_modified_and_untracked_files(self) -> None:
+        self.assertEqual(self.discover(changed_since="HEAD"), ["App/New.cs", "App/Program.cs"])
+
+        # Los cambios preparados («git add») también se consideran.
+        self.run_git("add", "App/New.cs")
+        self.assertEqual(self.discover(changed_since="HEAD"), ["App/New.cs", "App/Program.cs"])
+
+    def test_bad_ref_is_an_error(self) -> None:
+        with self.assertRaises(RuntimeError):
+            self.discover(changed_since="no-such-ref")
+        tool_process = run_license_tool(self.root_directory, "--check", "--changed-since", "no-such-ref")
+        self.assertEqual(tool_process.returncode, 2, tool_process.stdout)
+        self.assertIn("no-such-ref", tool_process.stdout)
+
+class DaemonTests(unittest.TestCase):
+    """Pruebas del servicio residente («--serve») y de su cliente («--daemon»)."""
+
+    def setUp(self) -> None:
+        self.file_contents = {
+            "App/Program.cs": b"namespace App;\n",
+            "App/Stale.cs": LICENSE_HEADERS[".cs"]["header_bytes"].replace(b"\n", b"\n" + STALE_COMMENT_LINES[".cs"], 1) + b"\nnamespace App;\n",
+            "App/Current.py": LICENSE_HEADERS[".py"]["header_bytes"] + b"\nx = 1\n",
+            "tools/script.py": b"#!/usr/bin/env python\r\nprint(1)\r\n",
+        }
+        self.served_root = os.path.realpath(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.served_root)
+        write_source_files(self.served_root, self.file_contents)
+        tool_path = install_license_tool(self.served_root)
+
+        # El socket se crea en un directorio privado, con una ruta corta (los sockets Unix limitan su longitud).
+        socket_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, socket_directory)
+        self.socket_path = os.path.join(socket_directory, "license.sock")
+        self.server_process = subprocess.Popen([sys.executable, tool_path, "--serve", "--socket", self.socket_path], cwd=self.served_root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.addCleanup(self.stop_server)
+        deadline = time.monotonic() + 60
+        while license_tool.send_daemon_request(self.socket_path, {"root": self.served_root, "paths": [os.devnull]}) is None:
+            self.assertIsNone(self.server_process.poll(), "el servicio terminó antes de escuchar")
+            self.assertLess(time.monotonic(), deadline, "el servicio no comenzó a escuchar")
+            time.sleep(0.05)
+
+    def stop_server(self) -> None:
+        """Interrumpe el servicio como lo haría «Ctrl+C» y espera a que termine."""
+        self.server_process.send_signal(signal.SIGINT)
+        self.server_process.wait(timeout=30)
+
+    def run_via_daemon(self, check_only: bool, file_paths: Optional[List[str]] = None) -> Optional[Dict[str, int]]:
+        """Delega una verificación o corrección al servicio, sin imprimir sus resultados."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            return license_tool.regenerate_license_headers_via_daemon(self.socket_path, self.served_root, check_only, file_paths=file_paths)
+
+    def test_socket_is_private(self) -> None:
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+
+    def test_requests_match_local_run(self) -> None:
+        with tempfile.TemporaryDirectory() as local_root:
+            write_source_files(local_root, self.file_contents)
+            install_license_tool(local_root)
+            for check_only in (True, False, True):
+                with self.subTest(check_only=check_only):
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        local_summary = license_tool.regenerate_license_headers(local_root, check_only=check_only)
+                    self.assertEqual(self.run_via_daemon(check_only), local_summary)
+            for relative_path in self.file_contents:
+                full_path = os.path.join(*relative_path.split("/"))
+                self.assertEqual(read_file_bytes(os.path.join(self.served_root, full_path)), read_file_bytes(os.path.join(local_root, full_path)))
+
+    def test_edited_file_is_classified_again(self) -> None:
+        self.assertIsNotNone(self.run_via_daemon(False))
+        self.assertEqual(self.run_via_daemon(True)["files_with_updated_license"], len(self.file_contents) + 2)
+
+        # Se elimina la cabecera de un archivo ya verificado: el servicio no debe responder con el estado que recordaba.
+        write_source_files(self.served_root, {"App/Program.cs": b"namespace App.Edited;\n"})
+        summary = self.run_via_daemon(True)
+        self.assertEqual(summary["files_without_license"], 1)
+        self.assertEqual(self.run_via_daemon(True, [os.path.join(self.served_root, "App", "Program.cs")])["files_without_license"], 1)
+
+        # Un archivo nuevo también se incorpora al índice del servicio.
+        write_source_files(self.served_root, {"App/New/Added.py": b"y = 2\n"})
+        self.assertEqual(self.run_via_daemon(True)["files_without_license"], 2)
+
+    def test_service_of_another_user_is_refused(self) -> None:
+        with mock.patch.object(license_tool.os, "getuid", return_value=os.getuid() + 1):
+            with self.assertRaises(RuntimeError):
+                license_tool.send_daemon_request(self.socket_path, {"root": self.served_root, "paths": [os.devnull]})
+            self.assertIsNone(self.run_via_daemon(True))
+
+class DaemonSocketTests(unittest.TestCase):
+    """Pruebas de la ubicación del socket del servicio residente y de la ejecución sin él."""
+
+    def test_shared_socket_directory_is_refused(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory, mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": temporary_directory}):
+            # Un «$XDG_RUNTIME_DIR» que otros usuarios pueden leer se descarta en favor del directorio propio del usuario.
+            os.chmod(temporary_directory, 0o755)
+            with mock.patch.object(license_tool.tempfile, "gettempdir", return_value=temporary_directory):
+                socket_directory = license_tool.get_socket_directory()
+                self.assertNotEqual(socket_directory, temporary_directory)
+                self.assertEqual(os.stat(socket_directory).st_mode & 0o777, 0o700)
+
+                # Si el directorio propio del usuario no es privado (por ejemplo, otro usuario lo creó antes), se rechaza.
+                os.chmod(socket_directory, 0o777)
+                with self.assertRaises(RuntimeError):
+                    license_tool.get_socket_directory()
+                with self.assertRaises(RuntimeError):
+                    license_tool.get_default_socket_path(temporary_directory)
+
+    def test_unreachable_daemon_falls_back_to_local_run(self) -> None:
+        with tempfile.TemporaryDirectory() as daemon_root, tempfile.TemporaryDirectory() as local_root:
+            for root_directory in (daemon_root, local_root):
+                write_source_files(root_directory, {"App/Program.cs": b"namespace App;\n"})
+            missing_socket_path = os.path.join(daemon_root, "missing.sock")
+            self.assertIsNone(license_tool.regenerate_license_headers_via_daemon(missing_socket_path, daemon_root, True))
+
+            daemon_process = run_license_tool(daemon_root, "--daemon", "--socket", missing_socket_path, "--check")
+            local_process = run_license_tool(local_root, "--check")
+            self.assertEqual(daemon_process.returncode, 1)
+            self.assertEqual(daemon_process.stdout.replace(daemon_root, local_root), local_process.stdout)
+
+if __name__ == "__main__":
+    unittest.main()